@@ -6,4 +6,8 @@ urlpatterns = [
     path('assign-mentor/', admin_views.assign_mentor_to_student, name='admin_assign_mentor'),
     path('bulk-assign-mentor/', admin_views.bulk_assign_mentor, name='admin_bulk_assign'),
     path('auto-assign-mentors/', admin_views.auto_assign_mentors, name='admin_auto_assign'),
+    path('users/export/', admin_views.export_users, name='admin_export_users'),
+    path('assignments/export/', admin_views.export_assignments, name='admin_export_assignments'),
+    path('submissions/export/', admin_views.export_submissions, name='admin_export_submissions'),
+    path('monthly-reports/export/', admin_views.export_monthly_reports, name='admin_export_monthly_reports'),
 ]
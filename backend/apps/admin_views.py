@@ -2,12 +2,36 @@
 Admin API views for user and mentor-student assignment management
 """
 from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 
 from apps.profiles.models import UserProfile
+from apps.profiles.mentor_assignment import apply_assignment, plan_assignment, reassign_students
+from apps.dashboard.report_engine import (
+    COHORT_EXPORT_COLUMNS, SOURCES, iter_cohort_export_rows, parse_cohort_filter, parse_year_month
+)
+from apps.exports import EXPORT_FORMATS, export_response
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+USER_EXPORT_COLUMNS = [
+    'id', 'username', 'email', 'first_name', 'last_name', 'is_staff', 'is_superuser', 'is_active',
+    'date_joined', 'last_login', 'role', 'campus', 'floor', 'assigned_mentor_id', 'assigned_mentor',
+]
+
+ASSIGNMENT_EXPORT_COLUMNS = [
+    'student_id', 'student_username', 'student_email', 'student_name', 'campus', 'floor',
+    'mentor_id', 'mentor_username', 'mentor_email', 'mentor_name',
+]
+
+SUBMISSION_EXPORT_COLUMNS = [
+    'pillar', 'type', 'id', 'user_id', 'username', 'campus', 'floor', 'status',
+    'created_at', 'submitted_at', 'reviewed_at', 'reviewed_by', 'updated_at',
+]
 
 
 def is_admin(user):
@@ -114,74 +138,302 @@ def bulk_assign_mentor(request):
         )
     
     try:
-        mentor = User.objects.get(id=mentor_id)
-        
-        if not mentor.is_staff:
-            return Response(
-                {"error": "Selected user is not a mentor"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        students = User.objects.filter(id__in=student_ids)
-        count = 0
-        
-        for student in students:
-            profile, created = UserProfile.objects.get_or_create(user=student)
-            profile.assigned_mentor = mentor
-            profile.save()
-            count += 1
-        
-        return Response({
-            'message': f'Successfully assigned {count} students to {mentor.username}',
-            'count': count,
-            'mentor': mentor.username
-        })
+        student_ids = {int(student_id) for student_id in student_ids}
+        mentor_id = int(mentor_id)
+    except (TypeError, ValueError):
+        return Response(
+            {"error": "student_ids and mentor_id must be user ids"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     
-    except User.DoesNotExist:
+    # Mentor and students validated with one query
+    users = {
+        user.id: user
+        for user in User.objects.filter(id__in=student_ids | {mentor_id}).select_related('profile')
+    }
+    mentor = users.get(mentor_id)
+    if mentor is None:
         return Response(
             {"error": "Mentor not found"},
             status=status.HTTP_404_NOT_FOUND
         )
+    if not mentor.is_staff:
+        return Response(
+            {"error": "Selected user is not a mentor"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    students = [users[student_id] for student_id in student_ids if student_id in users and student_id != mentor_id]
+    missing_profiles = [student for student in students if not hasattr(student, 'profile')]
+    if missing_profiles:
+        UserProfile.objects.bulk_create(
+            [UserProfile(user=student) for student in missing_profiles], ignore_conflicts=True
+        )
+    
+    current_mentors = {
+        student.id: student.profile.assigned_mentor_id if hasattr(student, 'profile') else None
+        for student in students
+    }
+    reassign_students(current_mentors, mentor, sender=request.user)
+    count = len(students)
+    
+    return Response({
+        'message': f'Successfully assigned {count} students to {mentor.username}',
+        'count': count,
+        'mentor': mentor.username
+    })
 
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def auto_assign_mentors(request):
-    """Automatically assign all students to mentors in round-robin fashion"""
+    """
+    Assign students to mentors on their own campus and floor, balancing mentor load.
+    Body (all optional): campus, floor, rebalance (spread everyone evenly, moving
+    as few students as possible), dry_run (return the plan without saving)
+    """
     if not is_admin(request.user):
         return Response(
             {"error": "You don't have permission to access this resource"},
             status=status.HTTP_403_FORBIDDEN
         )
     
-    # Get all mentors and students
-    mentors = list(User.objects.filter(is_staff=True, is_superuser=False).order_by('id'))
-    students = User.objects.filter(is_staff=False, is_superuser=False).order_by('id')
+    campus = request.data.get('campus') or None
+    floor = request.data.get('floor') or None
+    rebalance = _as_bool(request.data.get('rebalance'))
+    dry_run = _as_bool(request.data.get('dry_run'))
     
-    if not mentors:
-        return Response(
-            {"error": "No mentors available for assignment"},
-            status=status.HTTP_400_BAD_REQUEST
-        )
+    plan = plan_assignment(campus=campus, floor=floor, rebalance=rebalance)
     
-    if not students.exists():
+    if not plan['groups']:
         return Response(
-            {"error": "No students found to assign"},
+            {"error": "No mentors available for assignment" if plan['unassignable'] else "No students found to assign"},
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    # Round-robin assignment
-    count = 0
-    for idx, student in enumerate(students):
-        mentor = mentors[idx % len(mentors)]
-        profile, created = UserProfile.objects.get_or_create(user=student)
-        profile.assigned_mentor = mentor
-        profile.save()
-        count += 1
+    count = len(plan['moves']) if dry_run else apply_assignment(plan['moves'])
+    mentors_count = sum(group['mentors'] for group in plan['groups'])
+    students_count = sum(group['students'] for group in plan['groups'])
     
     return Response({
-        'message': f'Successfully assigned {count} students to {len(mentors)} mentors',
+        'message': (
+            f"{'Would assign' if dry_run else 'Successfully assigned'} {count} students "
+            f"across {len(plan['groups'])} floors with {mentors_count} mentors"
+        ),
+        'dry_run': dry_run,
         'students_assigned': count,
-        'mentors_count': len(mentors),
-        'students_per_mentor': count // len(mentors)
+        'mentors_count': mentors_count,
+        'students_per_mentor': students_count // mentors_count if mentors_count else 0,
+        'groups': plan['groups'],
+        'unassignable_students': plan['unassignable'],
+        'moves': plan['moves'] if dry_run else None
     })
+
+
+def _as_bool(value):
+    if isinstance(value, str):
+        return value.lower() in ('1', 'true', 'yes', 'on')
+    return bool(value)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_monthly_reports(request):
+    """
+    Monthly pillar report for every student, streamed as a file.
+    Query params: month=YYYY-MM (required), campus, floor, export_format=csv|jsonl|xlsx
+    """
+    if not is_admin(request.user):
+        return Response(
+            {"error": "You don't have permission to access this resource"},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    parsed = parse_year_month(request.query_params.get('month'))
+    if parsed is None:
+        return Response(
+            {"error": "month is required in YYYY-MM format"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    export_format, error = _export_format(request)
+    if error:
+        return error
+
+    try:
+        campus, floor = parse_cohort_filter(request.query_params.get('campus'), request.query_params.get('floor'))
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    year, month = parsed
+    filename = '_'.join(str(part) for part in ['monthly_reports', f'{year}-{month:02d}', campus, floor] if part)
+    rows = iter_cohort_export_rows(year, month, campus=campus, floor=floor)
+    return _export(export_format, COHORT_EXPORT_COLUMNS, rows, filename)
+
+
+def _export_format(request):
+    """Validated export_format query param, or an error response"""
+    # Not "format": DRF reserves that query parameter for renderer selection
+    export_format = request.query_params.get('export_format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return None, Response(
+            {"error": f"export_format must be one of: {', '.join(EXPORT_FORMATS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return export_format, None
+
+
+def _export(export_format, columns, rows, filename):
+    try:
+        return export_response(export_format, columns, rows, filename, title=filename)
+    except ImproperlyConfigured as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+def _full_name(first_name, last_name):
+    return f"{first_name or ''} {last_name or ''}".strip()
+
+
+def _iter_user_rows():
+    users = User.objects.select_related('profile', 'profile__assigned_mentor').order_by('id')
+    for user in users.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        profile = getattr(user, 'profile', None)
+        mentor = profile.assigned_mentor if profile else None
+        yield {
+            'id': user.id,
+            'username': user.username,
+            'email': user.email,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'is_staff': user.is_staff,
+            'is_superuser': user.is_superuser,
+            'is_active': user.is_active,
+            'date_joined': user.date_joined.isoformat(),
+            'last_login': user.last_login.isoformat() if user.last_login else None,
+            'role': profile.role if profile else None,
+            'campus': profile.campus if profile else None,
+            'floor': profile.floor if profile else None,
+            'assigned_mentor_id': mentor.id if mentor else None,
+            'assigned_mentor': mentor.username if mentor else None,
+        }
+
+
+def _iter_assignment_rows():
+    profiles = UserProfile.objects.filter(role='STUDENT').values(
+        'user_id', 'user__username', 'user__email', 'user__first_name', 'user__last_name',
+        'campus', 'floor', 'assigned_mentor_id', 'assigned_mentor__username',
+        'assigned_mentor__email', 'assigned_mentor__first_name', 'assigned_mentor__last_name',
+    ).order_by('user_id')
+    for row in profiles.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield {
+            'student_id': row['user_id'],
+            'student_username': row['user__username'],
+            'student_email': row['user__email'],
+            'student_name': _full_name(row['user__first_name'], row['user__last_name']),
+            'campus': row['campus'],
+            'floor': row['floor'],
+            'mentor_id': row['assigned_mentor_id'],
+            'mentor_username': row['assigned_mentor__username'],
+            'mentor_email': row['assigned_mentor__email'],
+            'mentor_name': _full_name(row['assigned_mentor__first_name'], row['assigned_mentor__last_name'])
+            if row['assigned_mentor_id'] else None,
+        }
+
+
+def _iter_submission_rows(pillar=None, campus=None, floor=None):
+    """Every pillar table in turn, each streamed with its user/profile/reviewer joined in"""
+    for source_pillar, source, model in SOURCES:
+        if pillar and source_pillar != pillar:
+            continue
+        fields = [
+            'id', 'user_id', 'user__username', 'user__profile__campus', 'user__profile__floor',
+            'status', 'created_at', 'submitted_at', 'reviewed_at', 'updated_at',
+        ]
+        has_reviewer = any(field.name == 'reviewed_by' for field in model._meta.fields)
+        if has_reviewer:
+            fields.append('reviewed_by__username')
+        queryset = model.objects.all()
+        if campus:
+            queryset = queryset.filter(user__profile__campus=campus)
+        if floor:
+            queryset = queryset.filter(user__profile__floor=floor)
+        for row in queryset.values(*fields).order_by('id').iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield {
+                'pillar': source_pillar,
+                'type': source,
+                'id': row['id'],
+                'user_id': row['user_id'],
+                'username': row['user__username'],
+                'campus': row['user__profile__campus'],
+                'floor': row['user__profile__floor'],
+                'status': row['status'],
+                'created_at': row['created_at'].isoformat(),
+                'submitted_at': row['submitted_at'].isoformat() if row['submitted_at'] else None,
+                'reviewed_at': row['reviewed_at'].isoformat() if row['reviewed_at'] else None,
+                'reviewed_by': row['reviewed_by__username'] if has_reviewer else None,
+                'updated_at': row['updated_at'].isoformat(),
+            }
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_users(request):
+    """Stream every user with profile and mentor fields (export_format=csv|jsonl|xlsx)"""
+    if not is_admin(request.user):
+        return Response(
+            {"error": "You don't have permission to access this resource"},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    export_format, error = _export_format(request)
+    if error:
+        return error
+    return _export(export_format, USER_EXPORT_COLUMNS, _iter_user_rows(), 'users')
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_assignments(request):
+    """Stream one row per student with their assigned mentor (empty when unassigned)"""
+    if not is_admin(request.user):
+        return Response(
+            {"error": "You don't have permission to access this resource"},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    export_format, error = _export_format(request)
+    if error:
+        return error
+    return _export(export_format, ASSIGNMENT_EXPORT_COLUMNS, _iter_assignment_rows(), 'mentor_assignments')
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_submissions(request):
+    """
+    Stream the submission history of all pillars.
+    Query params: pillar, campus, floor, export_format=csv|jsonl|xlsx
+    """
+    if not is_admin(request.user):
+        return Response(
+            {"error": "You don't have permission to access this resource"},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    export_format, error = _export_format(request)
+    if error:
+        return error
+
+    pillar = request.query_params.get('pillar') or None
+    if pillar and pillar not in {source_pillar for source_pillar, _, _ in SOURCES}:
+        return Response(
+            {"error": f"Unknown pillar: {pillar}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        campus, floor = parse_cohort_filter(request.query_params.get('campus'), request.query_params.get('floor'))
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    filename = '_'.join(str(part) for part in ['submissions', pillar, campus, floor] if part)
+    rows = _iter_submission_rows(pillar=pillar, campus=campus, floor=floor)
+    return _export(export_format, SUBMISSION_EXPORT_COLUMNS, rows, filename)
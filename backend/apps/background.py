@@ -0,0 +1,50 @@
+"""
+Minimal background task runner
+
+USE_ASYNC_TASKS=True: tasks run on a small in-process thread pool once the
+current transaction commits, so the request returns immediately. This is the
+stand-in until Celery is wired up (see CELERY CONFIGURATION in settings).
+USE_ASYNC_TASKS=False: tasks run synchronously after commit (development).
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = 2
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='background-task')
+    return _executor
+
+
+def _run(func, args, kwargs):
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception('Background task %s failed', func.__name__)
+    finally:
+        # Worker threads hold their own DB connections; don't leak them
+        connections.close_all()
+
+
+def run_after_commit(func, *args, **kwargs):
+    """Run func(*args, **kwargs) after commit, in the background when USE_ASYNC_TASKS is on"""
+    def dispatch():
+        if settings.USE_ASYNC_TASKS:
+            _get_executor().submit(_run, func, args, kwargs)
+        else:
+            func(*args, **kwargs)
+    transaction.on_commit(dispatch)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Notification, Message, MessageThread
+from .models import Notification, NotificationArchive, Message, MessageThread, UnreadCounter
 
 
 @admin.register(Notification)
@@ -15,6 +15,23 @@ class NotificationAdmin(admin.ModelAdmin):
     message_preview.short_description = 'Message'
 
 
+@admin.register(NotificationArchive)
+class NotificationArchiveAdmin(admin.ModelAdmin):
+    list_display = ['original_id', 'recipient', 'notification_type', 'title', 'created_at', 'archived_at']
+    list_filter = ['notification_type', 'created_at']
+    search_fields = ['title', 'recipient__username']
+    readonly_fields = ['original_id', 'recipient', 'notification_type', 'title', 'message', 'data', 'created_at', 'read_at', 'archived_at']
+    list_per_page = 50
+
+
+@admin.register(UnreadCounter)
+class UnreadCounterAdmin(admin.ModelAdmin):
+    list_display = ['user', 'notifications_unread', 'messages_unread', 'announcements_unread']
+    search_fields = ['user__username']
+    readonly_fields = ['user', 'notifications_unread', 'messages_unread', 'announcements_unread']
+    list_per_page = 50
+
+
 @admin.register(Message)
 class MessageAdmin(admin.ModelAdmin):
     list_display = ['id', 'sender', 'recipient', 'subject', 'message_preview', 'is_read', 'created_at']
@@ -30,7 +47,7 @@ class MessageAdmin(admin.ModelAdmin):
 
 @admin.register(MessageThread)
 class MessageThreadAdmin(admin.ModelAdmin):
-    list_display = ['id', 'participant1', 'participant2', 'last_message_at', 'unread_count_p1', 'unread_count_p2']
+    list_display = ['id', 'participant1', 'participant2', 'last_message_at', 'last_message_preview', 'unread_count_p1', 'unread_count_p2']
     list_filter = ['created_at', 'last_message_at']
     search_fields = ['participant1__username', 'participant2__username']
     readonly_fields = ['created_at', 'updated_at']
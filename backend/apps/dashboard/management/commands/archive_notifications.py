@@ -0,0 +1,145 @@
+"""
+Management Command: archive_notifications
+
+Moves read notifications older than the retention window out of the hot
+Notification table, in batches, either into NotificationArchive or into a
+JSONL file.
+
+Usage:
+    python manage.py archive_notifications
+    python manage.py archive_notifications --days 30 --batch-size 5000
+    python manage.py archive_notifications --output /backups/notifications.jsonl
+    python manage.py archive_notifications --dry-run
+
+This command:
+- Only touches read notifications, so unread counters never change
+- Keeps notifications of floor announcements that are still live, so the
+  fan-out stays idempotent and fan-out-on-read feeds don't show them again
+- Commits each batch on its own, so it can be interrupted and re-run safely
+"""
+
+import json
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from apps.dashboard.models import Notification, NotificationArchive
+from apps.profiles.models import FloorAnnouncement
+
+
+ARCHIVED_FIELDS = [
+    'id', 'recipient_id', 'sender_id', 'notification_type', 'priority', 'title', 'message',
+    'related_pillar', 'related_submission_type', 'related_submission_id', 'announcement_id',
+    'action_url', 'read_at', 'created_at',
+]
+DATA_FIELDS = [
+    'sender_id', 'priority', 'related_pillar', 'related_submission_type',
+    'related_submission_id', 'announcement_id', 'action_url',
+]
+
+
+class Command(BaseCommand):
+    help = 'Archive read notifications older than the retention window'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.NOTIFICATION_RETENTION_DAYS,
+            help='Archive read notifications older than this many days',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows moved per transaction',
+        )
+        parser.add_argument(
+            '--output',
+            help='Append archived rows to this JSONL file instead of NotificationArchive',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many notifications would be archived',
+        )
+
+    def handle(self, *args, **options):
+        if options['days'] < 1:
+            raise CommandError('--days must be at least 1')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        start_time = time.time()
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        candidates = self.archivable(cutoff)
+
+        if options['dry_run']:
+            self.stdout.write(f'{candidates.count()} read notifications older than {cutoff:%Y-%m-%d} would be archived')
+            return
+
+        output = open(options['output'], 'a', encoding='utf-8') if options['output'] else None
+        archived = 0
+        try:
+            while True:
+                ids = list(candidates.order_by('id').values_list('id', flat=True)[:options['batch_size']])
+                if not ids:
+                    break
+                archived += self.archive_batch(ids, output)
+                self.stdout.write(f'  archived {archived} notifications...')
+        finally:
+            if output:
+                output.close()
+
+        elapsed = time.time() - start_time
+        destination = options['output'] or 'NotificationArchive'
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Archived {archived} notifications to {destination} in {elapsed:.2f} seconds'
+        ))
+
+    def archivable(self, cutoff):
+        live_announcement = FloorAnnouncement.objects.filter(
+            pk=OuterRef('announcement_id'), status='published'
+        ).filter(Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now()))
+        return Notification.objects.filter(
+            is_read=True, created_at__lt=cutoff
+        ).exclude(
+            Exists(live_announcement)
+        )
+
+    def archive_batch(self, ids, output):
+        with transaction.atomic():
+            rows = list(
+                Notification.objects.select_for_update()
+                .filter(id__in=ids, is_read=True)
+                .values(*ARCHIVED_FIELDS)
+            )
+            if not rows:
+                return 0
+
+            if output:
+                for row in rows:
+                    output.write(json.dumps(row, default=str) + '\n')
+                output.flush()
+            else:
+                NotificationArchive.objects.bulk_create([
+                    NotificationArchive(
+                        original_id=row['id'],
+                        recipient_id=row['recipient_id'],
+                        notification_type=row['notification_type'],
+                        title=row['title'],
+                        message=row['message'],
+                        data={field: row[field] for field in DATA_FIELDS if row[field] is not None},
+                        created_at=row['created_at'],
+                        read_at=row['read_at'],
+                    )
+                    for row in rows
+                ], ignore_conflicts=True)
+
+            Notification.objects.filter(id__in=[row['id'] for row in rows]).delete()
+        return len(rows)
@@ -0,0 +1,84 @@
+"""
+Management Command: benchmark_hackathon_parsers
+
+Times each hackathon source adapter parsing its saved fixture (no network),
+once per installed HTML parser backend.
+
+Usage:
+    python manage.py benchmark_hackathon_parsers
+    python manage.py benchmark_hackathon_parsers --iterations 200
+    python manage.py benchmark_hackathon_parsers --source devpost --backend lxml
+
+This command:
+- Parses fixtures from apps/hackathons/fixtures/, so results are repeatable
+- Checks every backend yields the same hackathons as the first one
+- Reports min and mean milliseconds per parse
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.hackathons.parsers import BACKENDS, available_backends
+from apps.hackathons.sources import SOURCES
+
+
+class Command(BaseCommand):
+    help = 'Benchmark hackathon source parsing against offline fixtures'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=50,
+            help='Parses timed per source and backend',
+        )
+        parser.add_argument(
+            '--source',
+            action='append',
+            choices=list(SOURCES),
+            help='Only benchmark this source (repeatable; default: all)',
+        )
+        parser.add_argument(
+            '--backend',
+            action='append',
+            choices=BACKENDS,
+            help='Only benchmark this HTML parser backend (repeatable; default: all installed)',
+        )
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1')
+
+        installed = available_backends()
+        backends = options['backend'] or installed
+        missing = [backend for backend in backends if backend not in installed]
+        if missing:
+            raise CommandError(f"Backend not installed: {', '.join(missing)}")
+
+        self.stdout.write(f"Installed backends: {', '.join(installed)}")
+        self.stdout.write(f"{'source':<10} {'backend':<12} {'items':>5} {'min ms':>9} {'mean ms':>9}")
+        for name in options['source'] or SOURCES:
+            source = SOURCES[name]
+            content = source.load_fixture()
+            expected = None
+            for backend in backends if source.format == 'html' else [None]:
+                items, timings = self.time_parse(source, content, backend, options['iterations'])
+                if expected is None:
+                    expected = items
+                elif items != expected:
+                    self.stdout.write(self.style.ERROR(f'  {name}: {backend} output differs from {backends[0]}'))
+                self.stdout.write(
+                    f"{name:<10} {backend or source.format:<12} {len(items):>5} "
+                    f"{min(timings) * 1000:>9.2f} {sum(timings) / len(timings) * 1000:>9.2f}"
+                )
+
+        self.stdout.write(self.style.SUCCESS('✓ Benchmark complete'))
+
+    def time_parse(self, source, content, backend, iterations):
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            items = source.parse(content, backend)
+            timings.append(time.perf_counter() - started)
+        return items, timings
@@ -0,0 +1,42 @@
+"""
+Management Command: refresh_hackathons
+
+Fetches every hackathon source concurrently and stores the snapshot served
+by /api/hackathons/list/ (see apps/hackathons/feed.py).
+
+Usage:
+    python manage.py refresh_hackathons
+
+Run it from cron a little more often than HACKATHON_FEED_TTL so readers
+never see an expired snapshot.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.hackathons.feed import refresh_feed
+
+
+class Command(BaseCommand):
+    help = 'Refresh the stored hackathon discovery feed'
+
+    def handle(self, *args, **options):
+        start_time = time.time()
+        snapshot = refresh_feed()
+        if snapshot is None:
+            self.stdout.write(self.style.WARNING('A refresh is already running, skipping'))
+            return
+
+        for name, health in snapshot['sources'].items():
+            line = f"  {name}: {health['status']}, {health['count']} hackathons in {health['duration_ms']} ms"
+            if health['stale']:
+                line += ' (stale)'
+            if health['error']:
+                line += f" - {health['error']}"
+            self.stdout.write(line)
+
+        elapsed = time.time() - start_time
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ Stored {len(snapshot['hackathons'])} hackathons in {elapsed:.2f} seconds"
+        ))
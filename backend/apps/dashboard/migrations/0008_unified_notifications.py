@@ -0,0 +1,91 @@
+# Generated by Django 4.2.7 on 2026-10-19 06:52
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count
+
+
+BATCH_SIZE = 1000
+
+
+def copy_profile_notifications(apps, schema_editor):
+    """Move profiles.Notification rows into the dashboard table, keeping timestamps"""
+    ProfileNotification = apps.get_model('profiles', 'Notification')
+    Notification = apps.get_model('dashboard', 'Notification')
+    created_at = Notification._meta.get_field('created_at')
+    created_at.auto_now_add = False
+    try:
+        last_id = 0
+        while True:
+            batch = list(
+                ProfileNotification.objects.filter(id__gt=last_id).order_by('id')[:BATCH_SIZE]
+            )
+            if not batch:
+                break
+            Notification.objects.bulk_create([
+                Notification(
+                    recipient_id=old.recipient_id,
+                    notification_type=old.notification_type,
+                    title=old.title,
+                    message=old.message,
+                    is_read=old.is_read,
+                    created_at=old.created_at,
+                    announcement_id=old.announcement_id,
+                )
+                for old in batch
+            ])
+            last_id = batch[-1].id
+    finally:
+        created_at.auto_now_add = True
+
+
+def backfill_unread_counters(apps, schema_editor):
+    """One grouped COUNT to seed the counter rows; runtime code only applies deltas"""
+    Notification = apps.get_model('dashboard', 'Notification')
+    UnreadCounter = apps.get_model('dashboard', 'UnreadCounter')
+    rows = (
+        Notification.objects.filter(is_read=False)
+        .order_by()
+        .values('recipient_id')
+        .annotate(unread=Count('id'))
+    )
+    UnreadCounter.objects.bulk_create(
+        [UnreadCounter(user_id=row['recipient_id'], notifications_unread=row['unread']) for row in rows],
+        batch_size=BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('dashboard', '0007_alter_notification_notification_type'),
+        ('profiles', '0010_alter_userprofile_campus'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UnreadCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='unread_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('notifications_unread', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='announcement_id',
+            field=models.IntegerField(blank=True, help_text='FloorAnnouncement id for floor announcements', null=True),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('submission_approved', 'Submission Approved'), ('submission_rejected', 'Submission Rejected'), ('submission_resubmit', 'Resubmission Requested'), ('submission_review', 'Submission Review'), ('announcement', 'Announcement'), ('floor_announcement', 'Floor Announcement'), ('message', 'New Message'), ('mentor_message', 'Mentor Message'), ('system', 'System Notification'), ('info', 'Info'), ('warning', 'Warning'), ('success', 'Success'), ('error', 'Error'), ('general', 'General')], default='general', max_length=50),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', '-created_at', '-id'], name='notif_feed_cursor_idx'),
+        ),
+        migrations.RunPython(copy_profile_notifications, migrations.RunPython.noop),
+        migrations.RunPython(backfill_unread_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 4.2.7 on 2026-10-19 06:56
+
+from django.db import migrations, models
+from django.db.models import Count, F
+
+
+def backfill_counters(apps, schema_editor):
+    """Seed messages_unread and announcements_unread with a few grouped queries"""
+    Message = apps.get_model('dashboard', 'Message')
+    Announcement = apps.get_model('dashboard', 'Announcement')
+    AnnouncementRead = apps.get_model('dashboard', 'AnnouncementRead')
+    UnreadCounter = apps.get_model('dashboard', 'UnreadCounter')
+    UserProfile = apps.get_model('profiles', 'UserProfile')
+
+    counts = {}
+
+    def row(user_id):
+        return counts.setdefault(user_id, {'messages_unread': 0, 'announcements_unread': 0})
+
+    unread_messages = (
+        Message.objects.filter(is_read=False).order_by()
+        .values('recipient_id').annotate(total=Count('id'))
+    )
+    for entry in unread_messages:
+        row(entry['recipient_id'])['messages_unread'] = entry['total']
+
+    totals = dict(
+        Announcement.objects.order_by().values('mentor_id').annotate(total=Count('id'))
+        .values_list('mentor_id', 'total')
+    )
+    reads = dict(
+        AnnouncementRead.objects.filter(announcement__mentor_id=F('user__profile__assigned_mentor'))
+        .order_by().values('user_id').annotate(total=Count('id')).values_list('user_id', 'total')
+    )
+    students = UserProfile.objects.filter(assigned_mentor__isnull=False).values_list('user_id', 'assigned_mentor_id')
+    for user_id, mentor_id in students:
+        unread = totals.get(mentor_id, 0) - reads.get(user_id, 0)
+        if unread > 0:
+            row(user_id)['announcements_unread'] = unread
+
+    existing = UnreadCounter.objects.in_bulk(list(counts))
+    to_create = []
+    for user_id, values in counts.items():
+        counter = existing.get(user_id)
+        if counter is None:
+            to_create.append(UnreadCounter(user_id=user_id, **values))
+        else:
+            counter.messages_unread = values['messages_unread']
+            counter.announcements_unread = values['announcements_unread']
+    UnreadCounter.objects.bulk_create(to_create, batch_size=1000)
+    UnreadCounter.objects.bulk_update(
+        list(existing.values()), ['messages_unread', 'announcements_unread'], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0008_unified_notifications'),
+        ('profiles', '0011_delete_profile_notification'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='unreadcounter',
+            name='announcements_unread',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='unreadcounter',
+            name='messages_unread',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
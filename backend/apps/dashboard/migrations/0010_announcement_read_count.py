@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-19 06:57
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_read_count(apps, schema_editor):
+    """One UPDATE with a correlated COUNT subquery"""
+    Announcement = apps.get_model('dashboard', 'Announcement')
+    AnnouncementRead = apps.get_model('dashboard', 'AnnouncementRead')
+    reads = (
+        AnnouncementRead.objects.filter(announcement_id=OuterRef('pk')).order_by()
+        .values('announcement_id').annotate(total=Count('id')).values('total')
+    )
+    Announcement.objects.update(read_count=Coalesce(Subquery(reads), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0009_unread_counter_messages_announcements'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='announcement',
+            name='read_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_read_count, migrations.RunPython.noop),
+    ]
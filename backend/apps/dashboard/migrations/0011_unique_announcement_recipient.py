@@ -0,0 +1,64 @@
+# Generated by Django 4.2.7 on 2026-10-19 06:59
+
+from django.db import migrations, models
+from django.db.models import Count, F, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def merge_duplicate_announcement_notifications(apps, schema_editor):
+    """
+    Fold the legacy signal-created rows (type 'announcement' pointing at the
+    FloorAnnouncement through related_submission_id) into the
+    floor_announcement shape, drop duplicates per (announcement, recipient)
+    left by the old double fan-out, then recount the affected unread counters.
+    """
+    Notification = apps.get_model('dashboard', 'Notification')
+    UnreadCounter = apps.get_model('dashboard', 'UnreadCounter')
+
+    Notification.objects.filter(
+        notification_type='announcement',
+        related_submission_id__isnull=False,
+        announcement_id__isnull=True
+    ).update(
+        announcement_id=F('related_submission_id'),
+        related_submission_id=None,
+        notification_type='floor_announcement'
+    )
+
+    duplicates = (
+        Notification.objects.filter(announcement_id__isnull=False).order_by()
+        .values('announcement_id', 'recipient_id')
+        .annotate(total=Count('id'), keep_id=Min('id'))
+        .filter(total__gt=1)
+    )
+    affected_recipients = set()
+    for group in duplicates:
+        Notification.objects.filter(
+            announcement_id=group['announcement_id'],
+            recipient_id=group['recipient_id']
+        ).exclude(id=group['keep_id']).delete()
+        affected_recipients.add(group['recipient_id'])
+
+    if affected_recipients:
+        unread = (
+            Notification.objects.filter(recipient_id=OuterRef('user_id'), is_read=False).order_by()
+            .values('recipient_id').annotate(total=Count('id')).values('total')
+        )
+        UnreadCounter.objects.filter(user_id__in=affected_recipients).update(
+            notifications_unread=Coalesce(Subquery(unread), 0)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0010_announcement_read_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_announcement_notifications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(condition=models.Q(('announcement_id__isnull', False)), fields=('announcement_id', 'recipient'), name='unique_announcement_recipient'),
+        ),
+    ]
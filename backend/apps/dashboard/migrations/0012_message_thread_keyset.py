@@ -0,0 +1,74 @@
+# Generated by Django 4.2.7 on 2026-10-19 07:03
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Q
+import django.db.models.deletion
+
+
+def backfill_message_threads(apps, schema_editor):
+    """
+    Attach every message to its conversation thread (creating missing
+    threads), fill the last-message preview and recount per-participant unread
+    counts, which get_thread_messages now trusts before marking anything read.
+    """
+    Message = apps.get_model('dashboard', 'Message')
+    MessageThread = apps.get_model('dashboard', 'MessageThread')
+
+    pairs = set()
+    for sender_id, recipient_id in Message.objects.order_by().values_list('sender_id', 'recipient_id').distinct():
+        pairs.add((min(sender_id, recipient_id), max(sender_id, recipient_id)))
+
+    for user_a, user_b in pairs:
+        thread = MessageThread.objects.filter(
+            Q(participant1_id=user_a, participant2_id=user_b) |
+            Q(participant1_id=user_b, participant2_id=user_a)
+        ).order_by('id').first()
+        if thread is None:
+            thread = MessageThread.objects.create(participant1_id=user_a, participant2_id=user_b)
+
+        conversation = Message.objects.filter(
+            Q(sender_id=user_a, recipient_id=user_b) | Q(sender_id=user_b, recipient_id=user_a)
+        )
+        conversation.update(thread=thread)
+
+        last = conversation.order_by('-created_at', '-id').first()
+        MessageThread.objects.filter(pk=thread.pk).update(
+            last_message=last,
+            last_message_at=last.created_at,
+            last_message_preview=last.message[:100],
+            last_message_sender_id=last.sender_id,
+            unread_count_p1=conversation.filter(recipient_id=thread.participant1_id, is_read=False).count(),
+            unread_count_p2=conversation.filter(recipient_id=thread.participant2_id, is_read=False).count(),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('dashboard', '0011_unique_announcement_recipient'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='message',
+            name='thread',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='messages', to='dashboard.messagethread'),
+        ),
+        migrations.AddField(
+            model_name='messagethread',
+            name='last_message_preview',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='messagethread',
+            name='last_message_sender',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['thread', '-created_at', '-id'], name='message_thread_keyset_idx'),
+        ),
+        migrations.RunPython(backfill_message_threads, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 4.2.7 on 2026-10-19 07:04
+
+from django.db import migrations, models
+
+
+def canonicalize_message_threads(apps, schema_editor):
+    """
+    Store every thread as (lower user id, higher user id) and merge the
+    duplicate threads left by the old OR-filter lookup into the oldest one,
+    recounting preview and unread counts from the merged messages.
+    """
+    Message = apps.get_model('dashboard', 'Message')
+    MessageThread = apps.get_model('dashboard', 'MessageThread')
+
+    groups = {}
+    for thread in MessageThread.objects.order_by('id'):
+        key = (min(thread.participant1_id, thread.participant2_id), max(thread.participant1_id, thread.participant2_id))
+        groups.setdefault(key, []).append(thread)
+
+    for (user_a, user_b), threads in groups.items():
+        keeper, duplicates = threads[0], threads[1:]
+        if not duplicates and keeper.participant1_id == user_a:
+            continue
+
+        if duplicates:
+            duplicate_ids = [thread.id for thread in duplicates]
+            Message.objects.filter(thread_id__in=duplicate_ids).update(thread=keeper)
+            MessageThread.objects.filter(id__in=duplicate_ids).delete()
+
+        conversation = Message.objects.filter(thread=keeper)
+        last = conversation.order_by('-created_at', '-id').first()
+        updates = {
+            'participant1_id': user_a,
+            'participant2_id': user_b,
+            'unread_count_p1': conversation.filter(recipient_id=user_a, is_read=False).count(),
+            'unread_count_p2': conversation.filter(recipient_id=user_b, is_read=False).count(),
+        }
+        if last is not None:
+            updates.update(
+                last_message=last,
+                last_message_at=last.created_at,
+                last_message_preview=last.message[:100],
+                last_message_sender_id=last.sender_id,
+            )
+        MessageThread.objects.filter(pk=keeper.pk).update(**updates)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0012_message_thread_keyset'),
+    ]
+
+    operations = [
+        migrations.RunPython(canonicalize_message_threads, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='messagethread',
+            constraint=models.UniqueConstraint(fields=('participant1', 'participant2'), name='unique_thread_participants'),
+        ),
+        migrations.AddConstraint(
+            model_name='messagethread',
+            constraint=models.CheckConstraint(check=models.Q(('participant1__lte', models.F('participant2'))), name='thread_participants_ordered'),
+        ),
+    ]
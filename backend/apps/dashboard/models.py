@@ -1,7 +1,15 @@
-from django.db import models
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
 from django.contrib.auth.models import User
 from django.utils import timezone
 
+from . import realtime
+
 
 class Announcement(models.Model):
     """Announcements created by mentors for their students"""
@@ -51,6 +59,9 @@ class Announcement(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Denormalized number of AnnouncementRead rows, maintained with F() updates
+    read_count = models.PositiveIntegerField(default=0)
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -82,6 +93,47 @@ class Announcement(models.Model):
                 ))
             if notifications:
                 Notification.objects.bulk_create(notifications)
+            student_ids = [profile.user_id for profile in students]
+            UnreadCounter.adjust_many('announcements_unread', {user_id: 1 for user_id in student_ids})
+            realtime.publish_announcement(student_ids, 'mentor', self)
+    
+    def delete(self, *args, **kwargs):
+        from apps.profiles.models import UserProfile
+        with transaction.atomic():
+            unread_ids = UserProfile.objects.filter(assigned_mentor_id=self.mentor_id).exclude(
+                user__announcement_reads__announcement=self
+            ).values_list('user_id', flat=True)
+            deltas = {user_id: -1 for user_id in unread_ids}
+            result = super().delete(*args, **kwargs)
+            UnreadCounter.adjust_many('announcements_unread', deltas)
+        return result
+    
+    @classmethod
+    def mark_read_for(cls, user, announcement_ids):
+        """
+        Record read receipts for many announcements in one pass: one insert for
+        the receipts, one F() update for read_count and one counter update.
+        Returns the ids that were newly marked read.
+        """
+        with transaction.atomic():
+            # Lock in id order so concurrent readers of the same announcements don't deadlock
+            ids = list(
+                cls.objects.select_for_update().filter(id__in=announcement_ids)
+                .order_by('id').values_list('id', flat=True)
+            )
+            already_read = set(
+                AnnouncementRead.objects.filter(user=user, announcement_id__in=ids)
+                .values_list('announcement_id', flat=True)
+            )
+            new_ids = [announcement_id for announcement_id in ids if announcement_id not in already_read]
+            if new_ids:
+                AnnouncementRead.objects.bulk_create(
+                    [AnnouncementRead(announcement_id=announcement_id, user=user) for announcement_id in new_ids],
+                    ignore_conflicts=True
+                )
+                cls.objects.filter(id__in=new_ids).update(read_count=F('read_count') + 1)
+                UnreadCounter.adjust_many('announcements_unread', {user.id: -len(new_ids)})
+        return new_ids
 
 
 class AnnouncementRead(models.Model):
@@ -100,17 +152,182 @@ class AnnouncementRead(models.Model):
     
     def __str__(self):
         return f"{self.user.username} read {self.announcement.title}"
+    
+    def save(self, *args, **kwargs):
+        is_new = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if is_new:
+                Announcement.objects.filter(pk=self.announcement_id).update(read_count=F('read_count') + 1)
+                UnreadCounter.adjust_many('announcements_unread', {self.user_id: -1})
+
+
+class UnreadTrackingQuerySet(models.QuerySet):
+    """
+    Queryset for recipient/is_read models that keeps the matching
+    UnreadCounter column in step with bulk creates, reads and deletes.
+    """
+    counter_field = None
+    read_updates = {}
+
+    def bulk_create(self, objs, batch_size=None, ignore_conflicts=False, update_conflicts=False, **kwargs):
+        with transaction.atomic():
+            objs = super().bulk_create(
+                objs, batch_size=batch_size, ignore_conflicts=ignore_conflicts,
+                update_conflicts=update_conflicts, **kwargs
+            )
+            if ignore_conflicts or update_conflicts:
+                # Rows that hit a conflict were skipped or updated, and we can't tell which
+                self.recount_unread({obj.recipient_id for obj in objs})
+            else:
+                unread = Counter(obj.recipient_id for obj in objs if not obj.is_read)
+                UnreadCounter.adjust_many(self.counter_field, unread)
+        return objs
+
+    def recount_unread(self, recipient_ids):
+        """Reset these recipients' counter to their actual number of unread rows"""
+        recipient_ids = list(recipient_ids)
+        if not recipient_ids:
+            return
+        with transaction.atomic():
+            # Lock the counters first so concurrent adjust_many calls queue behind the recount
+            list(UnreadCounter.objects.select_for_update().filter(user_id__in=recipient_ids).values_list('pk'))
+            totals = dict(
+                self.model.objects.filter(recipient_id__in=recipient_ids, is_read=False)
+                .order_by().values('recipient_id').annotate(total=Count('id'))
+                .values_list('recipient_id', 'total')
+            )
+            UnreadCounter.set_many(
+                self.counter_field, {recipient_id: totals.get(recipient_id, 0) for recipient_id in recipient_ids}
+            )
+
+    def _lock_unread(self):
+        """Lock unread rows in this queryset and return {recipient_id: [ids]}"""
+        by_recipient = defaultdict(list)
+        rows = self.filter(is_read=False).select_for_update().values_list('id', 'recipient_id')
+        for row_id, recipient_id in rows:
+            by_recipient[recipient_id].append(row_id)
+        return by_recipient
+
+    def mark_read(self):
+        """Mark every unread row in the queryset as read; returns the number updated"""
+        updated = 0
+        with transaction.atomic():
+            by_recipient = self._lock_unread()
+            now = timezone.now()
+            deltas = {}
+            for recipient_id, ids in by_recipient.items():
+                count = self.model.objects.filter(id__in=ids, is_read=False).update(
+                    is_read=True, read_at=now, **self.read_updates
+                )
+                deltas[recipient_id] = -count
+                updated += count
+            UnreadCounter.adjust_many(self.counter_field, deltas)
+        return updated
+
+    def delete(self):
+        with transaction.atomic():
+            by_recipient = self._lock_unread()
+            result = super().delete()
+            UnreadCounter.adjust_many(
+                self.counter_field,
+                {recipient_id: -len(ids) for recipient_id, ids in by_recipient.items()}
+            )
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+
+class UnreadTrackingMixin:
+    """
+    Model-side half of UnreadTrackingQuerySet: save(), delete() and
+    mark_as_read() apply +1/-1 to the recipient's counter.
+    """
+    counter_field = None
+    read_updates = {}
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_is_read = instance.__dict__.get('is_read')
+        return instance
 
-class Notification(models.Model):
-    """Enhanced notification model for mentor and student updates"""
+    def save(self, *args, **kwargs):
+        is_new = self._state.adding
+        was_read = getattr(self, '_loaded_is_read', None)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if is_new:
+                delta = 0 if self.is_read else 1
+            elif was_read is None or was_read == self.is_read:
+                delta = 0
+            else:
+                delta = -1 if self.is_read else 1
+            UnreadCounter.adjust_many(self.counter_field, {self.recipient_id: delta})
+        self._loaded_is_read = self.is_read
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            was_unread = type(self).objects.filter(pk=self.pk, is_read=False).select_for_update().exists()
+            result = super().delete(*args, **kwargs)
+            if was_unread:
+                UnreadCounter.adjust_many(self.counter_field, {self.recipient_id: -1})
+        return result
+
+    def mark_as_read(self):
+        """Mark as read, decrementing the recipient's counter exactly once"""
+        if self.is_read:
+            return
+        now = timezone.now()
+        with transaction.atomic():
+            # Conditional UPDATE so concurrent requests decrement the counter once
+            updated = type(self).objects.filter(pk=self.pk, is_read=False).update(
+                is_read=True, read_at=now, **self.read_updates
+            )
+            if updated:
+                UnreadCounter.adjust_many(self.counter_field, {self.recipient_id: -1})
+        self.is_read = True
+        self.read_at = now
+        for field, value in self.read_updates.items():
+            setattr(self, field, value)
+        self._loaded_is_read = True
+
+
+class NotificationQuerySet(UnreadTrackingQuerySet):
+    counter_field = 'notifications_unread'
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        realtime.publish_notifications(objs)
+        return objs
+
+
+class MessageQuerySet(UnreadTrackingQuerySet):
+    counter_field = 'messages_unread'
+    read_updates = {'status': 'read'}
+
+
+class Notification(UnreadTrackingMixin, models.Model):
+    """
+    Single notification store for every user-facing event (submission reviews,
+    messages, mentor and floor announcements, system notices).
+
+    Unread totals live in UnreadCounter and are maintained by save(),
+    mark_as_read(), delete() and the queryset helpers, so never bypass them
+    with a raw queryset.update(is_read=...).
+    """
     
     TYPE_CHOICES = [
         ('submission_approved', 'Submission Approved'),
         ('submission_rejected', 'Submission Rejected'),
         ('submission_resubmit', 'Resubmission Requested'),
+        ('submission_review', 'Submission Review'),
         ('announcement', 'Announcement'),  # New type for announcements
+        ('floor_announcement', 'Floor Announcement'),
         ('message', 'New Message'),
+        ('mentor_message', 'Mentor Message'),
+        ('system', 'System Notification'),
         ('info', 'Info'),
         ('warning', 'Warning'),
         ('success', 'Success'),
@@ -137,6 +354,7 @@ class Notification(models.Model):
     related_pillar = models.CharField(max_length=20, blank=True, null=True, help_text="cfc, clt, iipc, scd, sri")
     related_submission_type = models.CharField(max_length=50, blank=True, null=True)
     related_submission_id = models.IntegerField(blank=True, null=True)
+    announcement_id = models.IntegerField(blank=True, null=True, help_text="FloorAnnouncement id for floor announcements")
     
     # URL to redirect user when they click on notification
     action_url = models.CharField(max_length=500, blank=True, null=True)
@@ -147,26 +365,181 @@ class Notification(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = NotificationQuerySet.as_manager()
+    counter_field = 'notifications_unread'
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['recipient', '-created_at']),
             models.Index(fields=['recipient', 'is_read']),
             models.Index(fields=['-created_at']),
+            models.Index(fields=['recipient', '-created_at', '-id'], name='notif_feed_cursor_idx'),
+        ]
+        constraints = [
+            # Announcement fan-out is idempotent: at most one notification per recipient
+            models.UniqueConstraint(
+                fields=['announcement_id', 'recipient'],
+                condition=models.Q(announcement_id__isnull=False),
+                name='unique_announcement_recipient'
+            ),
         ]
     
     def __str__(self):
         return f"{self.recipient.username} - {self.title}"
     
-    def mark_as_read(self):
-        """Mark notification as read"""
-        if not self.is_read:
-            self.is_read = True
-            self.read_at = timezone.now()
-            self.save()
+    def save(self, *args, **kwargs):
+        is_new = self._state.adding
+        super().save(*args, **kwargs)
+        if is_new:
+            realtime.publish_notifications([self])
+
+
+class NotificationArchive(models.Model):
+    """
+    Compact cold storage for read notifications past the retention window
+    (see the archive_notifications command). Keeping them out of Notification
+    keeps the hot (recipient, -created_at) indexes small.
+    """
+    
+    original_id = models.BigIntegerField(unique=True)
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_notifications')
+    notification_type = models.CharField(max_length=50)
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    # sender, priority, related object and action_url of the original row
+    data = models.JSONField(default=dict, blank=True)
+    
+    created_at = models.DateTimeField()
+    read_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['recipient', '-created_at']),
+            models.Index(fields=['created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.recipient_id} - {self.title} (archived)"
+
+
+class UnreadCounter(models.Model):
+    """
+    Per-user unread totals, updated atomically with F() expressions whenever
+    notifications, messages or mentor announcements are created, read or
+    deleted, and mirrored into the cache after commit. Reading badge counts is
+    a cache hit or a single primary-key lookup; a missing row means nothing
+    is unread.
+    """
+    COUNTER_FIELDS = ('notifications_unread', 'messages_unread', 'announcements_unread')
+    CACHE_TIMEOUT = 300
+    
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='unread_counter')
+    notifications_unread = models.PositiveIntegerField(default=0)
+    messages_unread = models.PositiveIntegerField(default=0)
+    announcements_unread = models.PositiveIntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.user_id}: {self.notifications_unread} notifications, {self.messages_unread} messages unread"
+    
+    @staticmethod
+    def cache_key(user_id):
+        return f'unread_counts_{user_id}'
+    
+    @classmethod
+    def adjust_many(cls, field, deltas):
+        """Apply {user_id: delta} to a counter column, creating missing rows"""
+        deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        existing = set(cls.objects.filter(user_id__in=deltas).values_list('user_id', flat=True))
+        missing = [cls(user_id=user_id) for user_id in deltas if user_id not in existing]
+        if missing:
+            cls.objects.bulk_create(missing, ignore_conflicts=True)
+        users_by_delta = defaultdict(list)
+        for user_id, delta in deltas.items():
+            users_by_delta[delta].append(user_id)
+        for delta, user_ids in users_by_delta.items():
+            cls.objects.filter(user_id__in=user_ids).update(**{field: Greatest(F(field) + delta, 0)})
+        cls._refresh_cache_on_commit(list(deltas))
+    
+    @classmethod
+    def set_many(cls, field, values):
+        """Overwrite a counter column with {user_id: value}, creating missing rows"""
+        if not values:
+            return
+        with transaction.atomic():
+            existing = set(cls.objects.filter(user_id__in=values).values_list('user_id', flat=True))
+            missing = [cls(user_id=user_id) for user_id in values if user_id not in existing]
+            if missing:
+                cls.objects.bulk_create(missing, ignore_conflicts=True)
+            # One UPDATE per distinct value rather than per user
+            users_by_value = defaultdict(list)
+            for user_id, value in values.items():
+                users_by_value[max(value, 0)].append(user_id)
+            for value, user_ids in users_by_value.items():
+                cls.objects.filter(user_id__in=user_ids).update(**{field: value})
+        cls._refresh_cache_on_commit(list(values))
+    
+    @classmethod
+    def _refresh_cache_on_commit(cls, user_ids):
+        if settings.USE_NOTIFICATION_CACHE:
+            transaction.on_commit(lambda: cls.refresh_cache(user_ids))
+    
+    @classmethod
+    def refresh_cache(cls, user_ids):
+        """Write the committed counter values for these users into the cache"""
+        counts = {user_id: dict.fromkeys(cls.COUNTER_FIELDS, 0) for user_id in user_ids}
+        for row in cls.objects.filter(user_id__in=user_ids).values('user_id', *cls.COUNTER_FIELDS):
+            counts[row.pop('user_id')] = row
+        cache.set_many(
+            {cls.cache_key(user_id): values for user_id, values in counts.items()},
+            cls.CACHE_TIMEOUT
+        )
+    
+    @classmethod
+    def get_counts(cls, user_id):
+        """Return the user's counters as a dict without touching the source tables"""
+        counts = cache.get(cls.cache_key(user_id)) if settings.USE_NOTIFICATION_CACHE else None
+        if counts is None:
+            counts = cls.objects.filter(pk=user_id).values(*cls.COUNTER_FIELDS).first()
+            counts = counts or dict.fromkeys(cls.COUNTER_FIELDS, 0)
+            if settings.USE_NOTIFICATION_CACHE:
+                cache.set(cls.cache_key(user_id), counts, cls.CACHE_TIMEOUT)
+        return counts
+    
+    @classmethod
+    def recount_announcements(cls, user_ids):
+        """
+        Recompute announcements_unread from scratch, for when a student's
+        mentor changes and the set of announcements they see is replaced.
+        """
+        from apps.profiles.models import UserProfile
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        mentor_by_user = dict(
+            UserProfile.objects.filter(user_id__in=user_ids).values_list('user_id', 'assigned_mentor_id')
+        )
+        totals = dict(
+            Announcement.objects.filter(mentor_id__in=set(mentor_by_user.values()) - {None})
+            .order_by().values('mentor_id').annotate(total=Count('id')).values_list('mentor_id', 'total')
+        )
+        reads = dict(
+            AnnouncementRead.objects.filter(
+                user_id__in=user_ids,
+                announcement__mentor_id=F('user__profile__assigned_mentor')
+            ).order_by().values('user_id').annotate(total=Count('id')).values_list('user_id', 'total')
+        )
+        cls.set_many('announcements_unread', {
+            user_id: totals.get(mentor_by_user.get(user_id), 0) - reads.get(user_id, 0)
+            for user_id in user_ids
+        })
 
 
-class Message(models.Model):
+class Message(UnreadTrackingMixin, models.Model):
     """Direct messages between mentor and student"""
     
     STATUS_CHOICES = [
@@ -192,10 +565,15 @@ class Message(models.Model):
     
     # Parent message for threading
     parent_message = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='replies')
+    thread = models.ForeignKey('MessageThread', on_delete=models.CASCADE, null=True, blank=True, related_name='messages')
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = MessageQuerySet.as_manager()
+    counter_field = 'messages_unread'
+    read_updates = {'status': 'read'}
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -203,29 +581,29 @@ class Message(models.Model):
             models.Index(fields=['sender', '-created_at']),
             models.Index(fields=['recipient', 'is_read']),
             models.Index(fields=['-created_at']),
+            # Keyset pagination of a conversation
+            models.Index(fields=['thread', '-created_at', '-id'], name='message_thread_keyset_idx'),
         ]
     
     def __str__(self):
         return f"{self.sender.username} → {self.recipient.username}: {self.subject or self.message[:50]}"
-    
-    def mark_as_read(self):
-        """Mark message as read"""
-        if not self.is_read:
-            self.is_read = True
-            self.read_at = timezone.now()
-            self.status = 'read'
-            self.save()
 
 
 class MessageThread(models.Model):
     """Conversation thread between mentor and student"""
     
+    PREVIEW_LENGTH = 100
+    
     participant1 = models.ForeignKey(User, on_delete=models.CASCADE, related_name='threads_as_participant1')
     participant2 = models.ForeignKey(User, on_delete=models.CASCADE, related_name='threads_as_participant2')
     
     last_message = models.ForeignKey(Message, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
     last_message_at = models.DateTimeField(auto_now_add=True)
     
+    # Denormalized preview so thread lists never load the last message
+    last_message_preview = models.CharField(max_length=PREVIEW_LENGTH, blank=True, default='')
+    last_message_sender = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    
     # Unread counts for each participant
     unread_count_p1 = models.IntegerField(default=0)
     unread_count_p2 = models.IntegerField(default=0)
@@ -239,34 +617,63 @@ class MessageThread(models.Model):
             models.Index(fields=['participant1', '-last_message_at']),
             models.Index(fields=['participant2', '-last_message_at']),
         ]
+        constraints = [
+            # One thread per pair, stored as (lower user id, higher user id)
+            models.UniqueConstraint(fields=['participant1', 'participant2'], name='unique_thread_participants'),
+            models.CheckConstraint(check=Q(participant1__lte=F('participant2')), name='thread_participants_ordered'),
+        ]
     
     def __str__(self):
         return f"Thread: {self.participant1.username} ↔ {self.participant2.username}"
     
     def get_other_participant(self, user):
         """Get the other participant in the thread"""
-        if user == self.participant1:
+        if user.id == self.participant1_id:
             return self.participant2
         return self.participant1
     
     def get_unread_count(self, user):
         """Get unread count for a specific user"""
-        if user == self.participant1:
+        if user.id == self.participant1_id:
             return self.unread_count_p1
         return self.unread_count_p2
     
-    def increment_unread(self, user):
-        """Increment unread count for a user"""
-        if user == self.participant1:
-            self.unread_count_p1 += 1
-        else:
-            self.unread_count_p2 += 1
-        self.save()
-    
-    def reset_unread(self, user):
-        """Reset unread count for a user"""
-        if user == self.participant1:
-            self.unread_count_p1 = 0
-        else:
-            self.unread_count_p2 = 0
-        self.save()
+    def _unread_field(self, user):
+        return 'unread_count_p1' if user.id == self.participant1_id else 'unread_count_p2'
+    
+    def increment_unread(self, user, extra_fields=()):
+        """Atomically increment unread count for a user (F() update, no read-modify-write)"""
+        field = self._unread_field(user)
+        setattr(self, field, F(field) + 1)
+        self.save(update_fields=[field, 'updated_at', *extra_fields])
+        self.refresh_from_db(fields=[field])
+    
+    @classmethod
+    def get_or_create_between(cls, user, other_user):
+        """Thread between two users, created on first contact (participants stored in id order)"""
+        participant1_id, participant2_id = sorted([user.id, other_user.id])
+        thread, _ = cls.objects.get_or_create(participant1_id=participant1_id, participant2_id=participant2_id)
+        return thread
+    
+    def record_message(self, message):
+        """Point the preview at a newly sent message and bump the recipient's unread count"""
+        self.last_message = message
+        self.last_message_at = message.created_at
+        self.last_message_preview = message.message[:self.PREVIEW_LENGTH]
+        self.last_message_sender_id = message.sender_id
+        self.increment_unread(message.recipient, extra_fields=[
+            'last_message', 'last_message_at', 'last_message_preview', 'last_message_sender'
+        ])
+    
+    def mark_read_by(self, user):
+        """
+        Mark the user's messages in this thread read and zero their unread
+        count, under the thread's row lock: record_message() increments under
+        the same lock, so a message arriving meanwhile is never reset away.
+        """
+        field = self._unread_field(user)
+        with transaction.atomic():
+            list(type(self).objects.select_for_update().filter(pk=self.pk).values_list('pk'))
+            Message.objects.filter(thread=self, recipient=user).mark_read()
+            type(self).objects.filter(pk=self.pk).update(**{field: 0, 'updated_at': timezone.now()})
+        setattr(self, field, 0)
@@ -70,10 +70,10 @@ class MessageSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'sender', 'recipient', 'subject', 'message',
             'related_pillar', 'related_submission_type', 'related_submission_id',
-            'status', 'is_read', 'read_at', 'parent_message',
+            'status', 'is_read', 'read_at', 'parent_message', 'thread',
             'created_at', 'updated_at', 'time_ago'
         ]
-        read_only_fields = ['id', 'status', 'created_at', 'updated_at', 'read_at']
+        read_only_fields = ['id', 'status', 'thread', 'created_at', 'updated_at', 'read_at']
     
     def get_time_ago(self, obj):
         """Calculate time ago string"""
@@ -98,7 +98,7 @@ class MessageSerializer(serializers.ModelSerializer):
 
 
 class MessageThreadSerializer(serializers.ModelSerializer):
-    """Message thread serializer"""
+    """Message thread serializer (last_message is joined in; the preview fields need no join)"""
     participant1 = UserBasicSerializer(read_only=True)
     participant2 = UserBasicSerializer(read_only=True)
     last_message = MessageSerializer(read_only=True)
@@ -109,10 +109,13 @@ class MessageThreadSerializer(serializers.ModelSerializer):
         model = MessageThread
         fields = [
             'id', 'participant1', 'participant2', 'other_participant',
-            'last_message', 'last_message_at', 'unread_count',
-            'created_at', 'updated_at'
+            'last_message', 'last_message_at', 'last_message_preview', 'last_message_sender',
+            'unread_count', 'created_at', 'updated_at'
+        ]
+        read_only_fields = [
+            'id', 'created_at', 'updated_at', 'last_message', 'last_message_at',
+            'last_message_preview', 'last_message_sender'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'last_message_at']
     
     def get_other_participant(self, obj):
         """Get the other participant based on current user"""
@@ -140,22 +143,20 @@ class MessageCreateSerializer(serializers.Serializer):
     related_submission_id = serializers.IntegerField(required=False, allow_null=True)
     parent_message_id = serializers.IntegerField(required=False, allow_null=True)
     
-    def validate_recipient_id(self, value):
-        """Validate recipient exists"""
+    def validate(self, attrs):
+        """Resolve recipient and parent message once; the view reuses them from validated_data"""
         try:
-            User.objects.get(id=value)
+            attrs['recipient'] = User.objects.get(id=attrs['recipient_id'])
         except User.DoesNotExist:
-            raise serializers.ValidationError("Recipient not found")
-        return value
-    
-    def validate_parent_message_id(self, value):
-        """Validate parent message exists if provided"""
-        if value:
+            raise serializers.ValidationError({'recipient_id': "Recipient not found"})
+        
+        attrs['parent_message'] = None
+        if attrs.get('parent_message_id'):
             try:
-                Message.objects.get(id=value)
+                attrs['parent_message'] = Message.objects.only('id').get(id=attrs['parent_message_id'])
             except Message.DoesNotExist:
-                raise serializers.ValidationError("Parent message not found")
-        return value
+                raise serializers.ValidationError({'parent_message_id': "Parent message not found"})
+        return attrs
 
 
 class AnnouncementSerializer(serializers.ModelSerializer):
@@ -168,14 +169,16 @@ class AnnouncementSerializer(serializers.ModelSerializer):
         model = Announcement
         fields = [
             'id', 'mentor', 'title', 'description', 'category', 'priority',
-            'event_date', 'created_at', 'updated_at', 'time_ago', 'is_read',
+            'event_date', 'created_at', 'updated_at', 'time_ago', 'is_read', 'read_count',
             'company_name', 'job_location', 'job_mode', 'job_duration', 
             'job_stipend', 'application_url', 'application_deadline', 'required_skills'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'read_count']
     
     def get_is_read(self, obj):
         """Check if current user has read this announcement"""
+        if hasattr(obj, 'user_has_read'):
+            return obj.user_has_read
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             from apps.dashboard.models import AnnouncementRead
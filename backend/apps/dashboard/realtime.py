@@ -0,0 +1,266 @@
+"""
+Realtime event delivery for notifications, messages and announcements.
+
+Events are published per user to a broker and consumed by the long-poll and
+server-sent-events endpoints in realtime_views.py, so clients no longer poll
+the unread-count endpoints on a timer.
+
+Brokers (settings.REALTIME_BROKER):
+- 'memory': in-process pub/sub. Good for development and single-process
+  deployments; events published in one worker are not seen by others, so
+  settings refuse it when WEB_CONCURRENCY asks gunicorn for more workers.
+- 'redis': Redis pub/sub on REDIS_URL, shared by every worker/process.
+
+Each broker keeps a short per-user history so a client reconnecting with its
+last event id receives whatever it missed in between.
+"""
+import itertools
+import json
+import queue
+import threading
+import time
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+
+
+HISTORY_SIZE = 50
+HISTORY_TTL_SECONDS = 3600
+
+
+class _QueueSubscription:
+    """Subscription handle for the in-process broker"""
+
+    def __init__(self, broker, user_id):
+        self._broker = broker
+        self.user_id = user_id
+        self.queue = queue.Queue()
+
+    def get(self, timeout):
+        """Block up to `timeout` seconds for the next event, or return None"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def drain(self):
+        """Return any events already waiting without blocking"""
+        events = []
+        while True:
+            try:
+                events.append(self.queue.get_nowait())
+            except queue.Empty:
+                return events
+
+    def close(self):
+        self._broker._unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class InProcessBroker:
+    """Thread-safe pub/sub living in the current process"""
+
+    def __init__(self, history_size=HISTORY_SIZE):
+        self._lock = threading.Lock()
+        self._seq = itertools.count(1)
+        self._subscribers = defaultdict(set)
+        self._history = defaultdict(lambda: deque(maxlen=history_size))
+
+    def publish(self, user_ids, event_type, data):
+        with self._lock:
+            event = {'id': next(self._seq), 'type': event_type, 'data': data}
+            for user_id in user_ids:
+                self._history[user_id].append(event)
+                for subscription in self._subscribers.get(user_id, ()):
+                    subscription.queue.put(event)
+        return event['id']
+
+    def subscribe(self, user_id):
+        subscription = _QueueSubscription(self, user_id)
+        with self._lock:
+            self._subscribers[user_id].add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def recent(self, user_id, after_id):
+        """Events for the user with id greater than `after_id`, oldest first"""
+        with self._lock:
+            return [event for event in self._history.get(user_id, ()) if event['id'] > after_id]
+
+    def latest_id(self, user_id):
+        with self._lock:
+            history = self._history.get(user_id)
+            return history[-1]['id'] if history else 0
+
+
+class _RedisSubscription:
+    """Subscription handle for the Redis broker"""
+
+    def __init__(self, pubsub, user_id):
+        self._pubsub = pubsub
+        self.user_id = user_id
+
+    def get(self, timeout):
+        """Block up to `timeout` seconds for the next event, or return None"""
+        # get_message() returns None early for messages it skips (the subscribe
+        # confirmation), so keep waiting until the deadline
+        deadline = time.monotonic() + timeout
+        while True:
+            message = self._pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=max(deadline - time.monotonic(), 0)
+            )
+            if message is not None:
+                return json.loads(message['data'])
+            if time.monotonic() >= deadline:
+                return None
+
+    def drain(self):
+        events = []
+        while True:
+            event = self.get(timeout=0)
+            if event is None:
+                return events
+            events.append(event)
+
+    def close(self):
+        self._pubsub.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class RedisBroker:
+    """Pub/sub shared across processes through Redis"""
+
+    def __init__(self, url, prefix='cohort:realtime', history_size=HISTORY_SIZE):
+        try:
+            import redis
+        except ImportError:
+            raise ImproperlyConfigured(
+                "REALTIME_BROKER='redis' requires the redis package (pip install redis)"
+            )
+        self._redis = redis.Redis.from_url(url)
+        self._prefix = prefix
+        self._history_size = history_size
+
+    def _channel(self, user_id):
+        return f'{self._prefix}:user:{user_id}'
+
+    def _history_key(self, user_id):
+        return f'{self._prefix}:history:{user_id}'
+
+    def publish(self, user_ids, event_type, data):
+        event_id = self._redis.incr(f'{self._prefix}:seq')
+        payload = json.dumps({'id': event_id, 'type': event_type, 'data': data})
+        pipe = self._redis.pipeline(transaction=False)
+        for user_id in user_ids:
+            history_key = self._history_key(user_id)
+            pipe.lpush(history_key, payload)
+            pipe.ltrim(history_key, 0, self._history_size - 1)
+            pipe.expire(history_key, HISTORY_TTL_SECONDS)
+            pipe.publish(self._channel(user_id), payload)
+        pipe.execute()
+        return event_id
+
+    def subscribe(self, user_id):
+        pubsub = self._redis.pubsub()
+        pubsub.subscribe(self._channel(user_id))
+        return _RedisSubscription(pubsub, user_id)
+
+    def recent(self, user_id, after_id):
+        events = [json.loads(raw) for raw in self._redis.lrange(self._history_key(user_id), 0, -1)]
+        return [event for event in reversed(events) if event['id'] > after_id]
+
+    def latest_id(self, user_id):
+        raw = self._redis.lindex(self._history_key(user_id), 0)
+        return json.loads(raw)['id'] if raw else 0
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Return the process-wide broker selected by settings.REALTIME_BROKER"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                backend = getattr(settings, 'REALTIME_BROKER', 'memory')
+                if backend == 'redis':
+                    url = getattr(settings, 'REALTIME_REDIS_URL', None)
+                    if not url:
+                        raise ImproperlyConfigured("REALTIME_BROKER='redis' requires REDIS_URL")
+                    _broker = RedisBroker(url)
+                else:
+                    _broker = InProcessBroker()
+    return _broker
+
+
+def publish(user_ids, event_type, data):
+    """Publish an event to each user once the current transaction commits"""
+    user_ids = list(dict.fromkeys(user_ids))
+    if user_ids:
+        transaction.on_commit(lambda: get_broker().publish(user_ids, event_type, data))
+
+
+def publish_notifications(notifications):
+    """Push one 'notification' event per unread notification, after commit"""
+    events = [
+        (notification.recipient_id, {
+            'id': notification.pk,
+            'title': notification.title,
+            'message': notification.message,
+            'notification_type': notification.notification_type,
+            'priority': notification.priority,
+            'announcement_id': notification.announcement_id,
+            'action_url': notification.action_url,
+            'created_at': notification.created_at.isoformat() if notification.created_at else None,
+        })
+        for notification in notifications
+        if not notification.is_read
+    ]
+    if events:
+        def send():
+            broker = get_broker()
+            for recipient_id, data in events:
+                broker.publish([recipient_id], 'notification', data)
+        transaction.on_commit(send)
+
+
+def publish_message(message):
+    """Push a 'message' event to the recipient of a direct message"""
+    publish([message.recipient_id], 'message', {
+        'id': message.id,
+        'sender_id': message.sender_id,
+        'subject': message.subject,
+        'preview': message.message[:100],
+        'created_at': message.created_at.isoformat(),
+    })
+
+
+def publish_announcement(user_ids, source, announcement):
+    """Push an 'announcement' event; source is 'mentor' or 'floor'"""
+    publish(user_ids, 'announcement', {
+        'source': source,
+        'id': announcement.id,
+        'title': announcement.title,
+        'priority': announcement.priority,
+    })
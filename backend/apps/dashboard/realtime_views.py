@@ -0,0 +1,275 @@
+"""
+Push endpoints for notifications, messages and announcements.
+
+- GET /api/dashboard/events/poll/    long-poll; returns as soon as an event arrives
+- POST /api/dashboard/events/ticket/ one-time ticket for opening the stream
+- GET /api/dashboard/events/stream/  server-sent events (EventSource)
+
+Both start with the user's unread counters (one primary-key lookup) and then
+only wait on the realtime broker, so an idle client costs no database queries.
+
+A waiting client still holds a worker thread, so each process lets at most
+REALTIME_MAX_WAITERS streams and long-polls wait at once. The stream is opt-in
+(REALTIME_SSE_ENABLED); browsers long-poll when it is refused.
+
+The browser EventSource API cannot send an Authorization header, and a JWT in
+the query string would end up in proxy and access logs. The stream therefore
+takes ?ticket=, a signed value that only opens the stream, expires after
+REALTIME_STREAM_TICKET_SECONDS and is accepted once.
+"""
+import json
+import secrets
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.http import StreamingHttpResponse
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.decorators import api_view, permission_classes, authentication_classes, renderer_classes
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .models import UnreadCounter
+from .realtime import get_broker
+from .stats_cache import get_cache
+
+User = get_user_model()
+
+
+HEARTBEAT_SECONDS = 15
+STREAM_TICKET_SALT = 'apps.dashboard.realtime_views.stream_ticket'
+
+
+class WaitSlots:
+    """Per-process count of requests parked on the broker, capped at REALTIME_MAX_WAITERS"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_use = 0
+
+    def claim(self):
+        with self._lock:
+            if self.in_use >= settings.REALTIME_MAX_WAITERS:
+                return False
+            self.in_use += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.in_use -= 1
+
+
+wait_slots = WaitSlots()
+
+
+def _used_ticket_key(nonce):
+    return f'realtime_stream_ticket_used_{nonce}'
+
+
+class StreamTicketAuthentication(BaseAuthentication):
+    """Authenticates ?ticket=<ticket from stream_ticket>; each ticket works once"""
+
+    def authenticate(self, request):
+        ticket = request.query_params.get('ticket')
+        if not ticket:
+            return None
+        try:
+            payload = signing.loads(
+                ticket, salt=STREAM_TICKET_SALT, max_age=settings.REALTIME_STREAM_TICKET_SECONDS
+            )
+        except signing.BadSignature:
+            raise AuthenticationFailed('Invalid or expired stream ticket')
+        # Kept past the ticket's own expiry, so the marker outlives every valid use
+        if not get_cache().add(_used_ticket_key(payload['nonce']), True, settings.REALTIME_STREAM_TICKET_SECONDS * 2):
+            raise AuthenticationFailed('Stream ticket already used')
+
+        user = User.objects.filter(pk=payload['user_id'], is_active=True).first()
+        if user is None:
+            raise AuthenticationFailed('User not found or inactive')
+        return user, None
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets EventSource's Accept: text/event-stream pass content negotiation"""
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Only reached for error responses; the stream itself bypasses renderers
+        return _format_sse('error', data)
+
+
+def _parse_event_id(value):
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def poll_events(request):
+    """
+    Long-poll for realtime events
+    Query params:
+        - last_event_id: id of the last event the client has seen. Omit on the
+          first call to get the current counters and cursor immediately.
+        - timeout: seconds to wait (capped at REALTIME_POLL_TIMEOUT)
+    When this process already has REALTIME_MAX_WAITERS requests waiting, answers
+    at once with any pending events and retry_after (seconds before polling again).
+    """
+    user_id = request.user.id
+    broker = get_broker()
+    last_event_id = _parse_event_id(request.GET.get('last_event_id'))
+
+    if last_event_id is None:
+        return Response({
+            'events': [],
+            'last_event_id': broker.latest_id(user_id),
+            'counts': UnreadCounter.get_counts(user_id),
+        })
+
+    try:
+        timeout = min(float(request.GET.get('timeout', settings.REALTIME_POLL_TIMEOUT)), settings.REALTIME_POLL_TIMEOUT)
+    except ValueError:
+        timeout = settings.REALTIME_POLL_TIMEOUT
+
+    waiting = wait_slots.claim()
+    try:
+        # Subscribe before reading history so nothing published in between is lost
+        with broker.subscribe(user_id) as subscription:
+            events = broker.recent(user_id, after_id=last_event_id)
+            if not events and waiting:
+                event = subscription.get(timeout=max(timeout, 0))
+                if event is not None:
+                    events = [event] + subscription.drain()
+            else:
+                events += subscription.drain()
+    finally:
+        if waiting:
+            wait_slots.release()
+
+    seen = set()
+    unique_events = []
+    for event in events:
+        if event['id'] > last_event_id and event['id'] not in seen:
+            seen.add(event['id'])
+            unique_events.append(event)
+
+    response = {
+        'events': unique_events,
+        'last_event_id': max(seen, default=last_event_id),
+    }
+    if unique_events:
+        response['counts'] = UnreadCounter.get_counts(user_id)
+    if not waiting:
+        response['retry_after'] = settings.REALTIME_POLL_TIMEOUT
+    return Response(response)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def stream_ticket(request):
+    """
+    One-time ticket for GET events/stream/?ticket=...
+    Request a new one for every connection, reconnects included.
+    Returns 503 when the stream is disabled; clients should long-poll instead.
+    """
+    if not settings.REALTIME_SSE_ENABLED:
+        return Response({'error': 'Event stream is disabled, use events/poll/'}, status=503)
+    ticket = signing.dumps(
+        {'user_id': request.user.id, 'nonce': secrets.token_urlsafe(16)}, salt=STREAM_TICKET_SALT
+    )
+    return Response({'ticket': ticket, 'expires_in': settings.REALTIME_STREAM_TICKET_SECONDS})
+
+
+def _format_sse(event_type, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event_type}')
+    lines.append(f'data: {json.dumps(data)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def _event_stream(user_id, last_event_id, counts):
+    broker = get_broker()
+    subscription = broker.subscribe(user_id)
+    try:
+        yield 'retry: 3000\n\n'
+        yield _format_sse('counts', counts)
+
+        sent = set()
+        if last_event_id is not None:
+            for event in broker.recent(user_id, after_id=last_event_id):
+                sent.add(event['id'])
+                yield _format_sse(event['type'], event['data'], event['id'])
+
+        deadline = time.monotonic() + settings.REALTIME_STREAM_MAX_SECONDS
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            event = subscription.get(timeout=min(HEARTBEAT_SECONDS, remaining))
+            if event is None:
+                yield ': keepalive\n\n'
+            elif event['id'] not in sent:
+                yield _format_sse(event['type'], event['data'], event['id'])
+    finally:
+        subscription.close()
+
+
+class _SlotStream:
+    """Iterates an event stream and frees its wait slot when closed, even if never started"""
+
+    def __init__(self, events):
+        self.events = events
+        self.released = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.events)
+
+    def close(self):
+        self.events.close()
+        if not self.released:
+            self.released = True
+            wait_slots.release()
+
+
+@api_view(['GET'])
+@authentication_classes([StreamTicketAuthentication, JWTAuthentication])
+@renderer_classes([EventStreamRenderer, JSONRenderer])
+@permission_classes([IsAuthenticated])
+def stream_events(request):
+    """
+    Server-sent events stream of notification, message and announcement events.
+    Sends a 'counts' event first. Browsers authenticate with ?ticket= (see
+    stream_ticket) and, since a ticket works once, reconnect with a new one and
+    ?last_event_id= instead of relying on EventSource's own retry.
+    Returns 503 when the stream is disabled or this process has no free wait slot.
+    """
+    if not settings.REALTIME_SSE_ENABLED:
+        return Response({'error': 'Event stream is disabled, use events/poll/'}, status=503)
+    last_event_id = _parse_event_id(
+        request.META.get('HTTP_LAST_EVENT_ID') or request.GET.get('last_event_id')
+    )
+    counts = UnreadCounter.get_counts(request.user.id)
+    if not wait_slots.claim():
+        return Response({'error': 'Too many open streams, use events/poll/'}, status=503)
+
+    response = StreamingHttpResponse(
+        _SlotStream(_event_stream(request.user.id, last_event_id, counts)),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # disable proxy buffering (nginx)
+    return response
@@ -0,0 +1,396 @@
+"""
+Pillar statistics engine shared by the dashboard and monthly reports.
+
+Every pillar table is read with a single grouped query (status counts, plus
+qualifying profiles and problems solved for LeetCode), optionally bucketed by
+TruncMonth('created_at'). A whole range of months therefore costs one query
+per table, whatever its length.
+
+Monthly reports are cached in the 'dashboard' cache under the per-user
+stats_cache version, which submission and review signals bump. Closed months
+are kept for MONTHLY_REPORT_CLOSED_TIMEOUT (a week by default) instead of the
+stats TTL, so trend charts over past months are nearly free after the first
+load, while the months left behind under a bumped version still expire.
+
+iter_cohort_month_reports() does the same for a whole campus/floor: one
+student query plus one grouped query per pillar table, all ordered by user id
+and merged as they stream, so memory stays constant however many students
+there are.
+"""
+from collections import Counter
+from itertools import groupby
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from apps.clt.models import CLTSubmission
+try:
+    from apps.sri.models import SocialActivitySubmission
+    HAS_SRI_MODELS = True
+except ImportError:
+    HAS_SRI_MODELS = False
+from apps.cfc.models import HackathonSubmission, BMCVideoSubmission, InternshipSubmission, GenAIProjectSubmission
+from apps.iipc.models import LinkedInPostVerification, LinkedInConnectionVerification
+from apps.scd.models import LeetCodeProfile
+from apps.profiles.models import UserProfile
+from . import stats_cache
+
+
+# Monthly task requirements
+MONTHLY_REQUIREMENTS = {
+    'clt': 1,      # 1 certificate upload per month
+    'sri': 0,      # Not specified
+    'cfc': 3,      # 3 tasks: hackathon, BMC, GenAI project (internship is optional)
+    'iipc': 2,     # 2 tasks: LinkedIn post and connection
+    'scd': 1,      # 1 profile with minimum 10 problems
+}
+
+PENDING_STATUSES = ['draft', 'submitted', 'under_review']
+SCD_PENDING_STATUSES = ['draft', 'pending']
+SCD_MIN_PROBLEMS = 10
+
+# (pillar, source key, model) for every table that feeds the statistics
+SOURCES = [
+    ('clt', 'clt', CLTSubmission),
+    ('cfc', 'hackathons', HackathonSubmission),
+    ('cfc', 'bmc_videos', BMCVideoSubmission),
+    ('cfc', 'internships', InternshipSubmission),
+    ('cfc', 'genai_projects', GenAIProjectSubmission),
+    ('iipc', 'posts', LinkedInPostVerification),
+    ('iipc', 'connections', LinkedInConnectionVerification),
+    ('scd', 'leetcode', LeetCodeProfile),
+]
+if HAS_SRI_MODELS:
+    SOURCES.insert(1, ('sri', 'sri', SocialActivitySubmission))
+
+
+COHORT_CHUNK_SIZE = 1000
+
+PILLARS = ['clt', 'sri', 'cfc', 'iipc', 'scd']
+
+COHORT_EXPORT_COLUMNS = [
+    'user_id', 'username', 'name', 'email', 'campus', 'floor', 'mentor',
+    'month', 'year', 'overall_completed', 'overall_target', 'overall_percentage', 'overall_status',
+] + [
+    f'{pillar}_{field}' for pillar in PILLARS
+    for field in ['total', 'completed', 'pending', 'percentage', 'status']
+]
+
+
+def parse_year_month(value):
+    """'YYYY-MM' -> (year, month), or None if malformed"""
+    try:
+        year, month = (int(part) for part in value.split('-'))
+    except (AttributeError, ValueError):
+        return None
+    if not (1 <= month <= 12):
+        return None
+    return year, month
+
+
+def parse_cohort_filter(campus, floor):
+    """
+    (campus, floor) checked against the UserProfile choices, floor as an int;
+    empty values mean no filter. Raises ValueError with a message for the
+    caller to report. Exports stream lazily, so they validate before starting.
+    """
+    campus = campus or None
+    if campus and campus not in dict(UserProfile.CAMPUS_CHOICES):
+        raise ValueError(f"campus must be one of: {', '.join(dict(UserProfile.CAMPUS_CHOICES))}")
+    if floor in (None, ''):
+        return campus, None
+    floors = dict(UserProfile.FLOOR_CHOICES)
+    try:
+        floor = int(floor)
+    except (TypeError, ValueError):
+        floor = None
+    if floor not in floors:
+        raise ValueError(f"floor must be one of: {', '.join(str(number) for number in floors)}")
+    return campus, floor
+
+
+def _empty_bucket():
+    return {'statuses': Counter(), 'qualified': 0, 'solved': 0}
+
+
+def grouped_counts(user, start=None, end=None, by_month=False):
+    """
+    Status counts per source, one query per table.
+    Returns {source: bucket}, or {(year, month): {source: bucket}} with by_month.
+    """
+    result = {}
+    for _, source, model in SOURCES:
+        queryset = model.objects.filter(user=user)
+        if start is not None:
+            queryset = queryset.filter(created_at__gte=start)
+        if end is not None:
+            queryset = queryset.filter(created_at__lt=end)
+
+        group_by = ['status']
+        if by_month:
+            queryset = queryset.annotate(month=TruncMonth('created_at'))
+            group_by = ['month', 'status']
+
+        aggregates = {'total': Count('id')}
+        if model is LeetCodeProfile:
+            aggregates['qualified'] = Count('id', filter=Q(status='approved', total_solved__gte=SCD_MIN_PROBLEMS))
+            aggregates['solved'] = Sum('total_solved')
+
+        for row in queryset.order_by().values(*group_by).annotate(**aggregates):
+            buckets = result
+            if by_month:
+                buckets = result.setdefault((row['month'].year, row['month'].month), {})
+            bucket = buckets.setdefault(source, _empty_bucket())
+            bucket['statuses'][row['status']] += row['total']
+            bucket['qualified'] += row.get('qualified') or 0
+            bucket['solved'] += row.get('solved') or 0
+    return result
+
+
+def _bucket(buckets, source):
+    return buckets.get(source) or _empty_bucket()
+
+
+def _total(bucket):
+    return sum(bucket['statuses'].values())
+
+
+def _percentage(completed, target):
+    return min(100, round((completed / target) * 100)) if target > 0 else 0
+
+
+def _progress_status(completed, target):
+    return 'completed' if completed >= target else 'in-progress' if completed > 0 else 'not-started'
+
+
+def pillar_stats(buckets):
+    """
+    Base statistics per pillar from grouped_counts() buckets:
+    total/completed/pending/monthly_target/percentage plus a per-source breakdown.
+    """
+    stats = {}
+    for pillar in PILLARS:
+        sources = [source for source_pillar, source, _ in SOURCES if source_pillar == pillar]
+        breakdown = {}
+        for source in sources:
+            bucket = _bucket(buckets, source)
+            breakdown[source] = {
+                'total': _total(bucket),
+                'completed': bucket['statuses']['approved'],
+            }
+        total = sum(item['total'] for item in breakdown.values())
+        target = MONTHLY_REQUIREMENTS[pillar]
+
+        if pillar == 'scd':
+            bucket = _bucket(buckets, 'leetcode')
+            completed = bucket['qualified']
+            pending = sum(bucket['statuses'][s] for s in SCD_PENDING_STATUSES)
+        elif pillar in ('cfc', 'iipc'):
+            completed = sum(item['completed'] for item in breakdown.values())
+            pending = total - completed
+        else:
+            completed = sum(item['completed'] for item in breakdown.values())
+            pending = sum(_bucket(buckets, source)['statuses'][s] for source in sources for s in PENDING_STATUSES)
+
+        stats[pillar] = {
+            'total': total,
+            'completed': completed,
+            'pending': pending,
+            'monthly_target': target,
+            'percentage': 0 if pillar == 'sri' else _percentage(completed, target),
+            'breakdown': breakdown,
+        }
+    stats['scd']['total_problems_solved'] = _bucket(buckets, 'leetcode')['solved']
+    return stats
+
+
+def overall_progress(stats):
+    """Completed tasks towards the combined monthly target"""
+    total_monthly_target = sum(MONTHLY_REQUIREMENTS.values())
+    completed = sum(
+        min(stats[pillar]['completed'], target) for pillar, target in MONTHLY_REQUIREMENTS.items()
+    )
+    percentage = round((completed / total_monthly_target * 100)) if total_monthly_target > 0 else 0
+    return completed, total_monthly_target, percentage
+
+
+def month_bounds(year, month):
+    start = timezone.make_aware(datetime(year, month, 1))
+    end = timezone.make_aware(datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1))
+    return start, end
+
+
+def month_range(start, end):
+    """(year, month) pairs from start to end inclusive"""
+    year, month = start
+    while (year, month) <= end:
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def build_month_report(year, month, buckets):
+    """Monthly report payload (MonthlyReportView format) for one month's buckets"""
+    stats = pillar_stats(buckets)
+    for pillar, pillar_data in stats.items():
+        breakdown = pillar_data.pop('breakdown')
+        if pillar == 'sri':
+            pillar_data['status'] = 'not-applicable'
+        else:
+            pillar_data['status'] = _progress_status(pillar_data['completed'], pillar_data['monthly_target'])
+        if pillar in ('cfc', 'iipc'):
+            pillar_data['breakdown'] = breakdown
+    # Keep the historical key order of the response
+    scd = stats['scd']
+    scd['total_problems_solved'] = scd.pop('total_problems_solved')
+
+    completed, target, percentage = overall_progress(stats)
+    return {
+        'month': month,
+        'year': year,
+        'month_name': datetime(year, month, 1).strftime('%B'),
+        'overall': {
+            'completed': completed,
+            'monthly_target': target,
+            'percentage': percentage,
+            'status': _progress_status(completed, target),
+        },
+        'pillars': stats,
+    }
+
+
+def _report_key(user_id, version, year, month):
+    return f'monthly_report_{user_id}_v{version}_{year}_{month}'
+
+
+def monthly_reports(user, start, end):
+    """
+    Reports for every month from start to end inclusive ((year, month) pairs).
+    Cached months are served from the cache; the rest are computed together
+    with one grouped query per pillar table.
+    """
+    months = list(month_range(start, end))
+    cache = stats_cache.get_cache()
+    version = stats_cache.get_version(user.id)
+    keys = {month: _report_key(user.id, version, *month) for month in months}
+    cached = cache.get_many(keys.values())
+
+    missing = [month for month in months if keys[month] not in cached]
+    if missing:
+        range_start, _ = month_bounds(*missing[0])
+        _, range_end = month_bounds(*missing[-1])
+        counts = grouped_counts(user, range_start, range_end, by_month=True)
+
+        now = timezone.now()
+        current = (now.year, now.month)
+        closed, open_months = {}, {}
+        for month in missing:
+            report = build_month_report(month[0], month[1], counts.get(month, {}))
+            cached[keys[month]] = report
+            (closed if month < current else open_months)[keys[month]] = report
+        if closed:
+            cache.set_many(closed, settings.MONTHLY_REPORT_CLOSED_TIMEOUT)
+        if open_months:
+            cache.set_many(open_months, settings.DASHBOARD_STATS_CACHE_TIMEOUT)
+
+    return [cached[keys[month]] for month in months]
+
+
+def available_months(user):
+    """(year, month) pairs with any activity, newest first, in one UNION query"""
+    querysets = [
+        model.objects.filter(user=user).order_by()
+        .annotate(month=TruncMonth('created_at')).values_list('month', flat=True)
+        for _, _, model in SOURCES
+    ]
+    months = querysets[0].union(*querysets[1:])
+    return sorted({(month.year, month.month) for month in months if month}, reverse=True)
+
+
+def _add_row(bucket, row):
+    bucket['statuses'][row['status']] += row['total']
+    bucket['qualified'] += row.get('qualified') or 0
+    bucket['solved'] += row.get('solved') or 0
+
+
+def _cohort_counts(model, start, end, student_filter):
+    """Grouped (user_id, status) counts for every student in the cohort, ordered by user id"""
+    aggregates = {'total': Count('id')}
+    if model is LeetCodeProfile:
+        aggregates['qualified'] = Count('id', filter=Q(status='approved', total_solved__gte=SCD_MIN_PROBLEMS))
+        aggregates['solved'] = Sum('total_solved')
+    return (
+        model.objects.filter(created_at__gte=start, created_at__lt=end)
+        .filter(**{f'user__profile__{field}': value for field, value in student_filter.items()})
+        .values('user_id', 'status').annotate(**aggregates).order_by('user_id')
+        .iterator(chunk_size=COHORT_CHUNK_SIZE)
+    )
+
+
+def iter_cohort_month_reports(year, month, campus=None, floor=None):
+    """
+    Yield (student, report) for every student in the campus/floor, ordered
+    by user id. Each pillar table is read with one grouped query; the
+    streams are merged by user id so nothing is held per cohort.
+    """
+    start, end = month_bounds(year, month)
+    student_filter = {'role': 'STUDENT'}
+    if campus:
+        student_filter['campus'] = campus
+    if floor:
+        student_filter['floor'] = floor
+
+    students = UserProfile.objects.filter(**student_filter).order_by('user_id').values(
+        'user_id', 'user__username', 'user__first_name', 'user__last_name', 'user__email',
+        'campus', 'floor', 'assigned_mentor__username'
+    ).iterator(chunk_size=COHORT_CHUNK_SIZE)
+
+    streams = {
+        source: groupby(_cohort_counts(model, start, end, student_filter), key=lambda row: row['user_id'])
+        for _, source, model in SOURCES
+    }
+    heads = {source: next(stream, None) for source, stream in streams.items()}
+
+    for student in students:
+        user_id = student['user_id']
+        buckets = {}
+        for source, stream in streams.items():
+            # Skip groups of users that are not in the student list (e.g. changed role mid-export)
+            while heads[source] is not None and heads[source][0] < user_id:
+                heads[source] = next(stream, None)
+            if heads[source] is not None and heads[source][0] == user_id:
+                bucket = buckets[source] = _empty_bucket()
+                for row in heads[source][1]:
+                    _add_row(bucket, row)
+                heads[source] = next(stream, None)
+        yield student, build_month_report(year, month, buckets)
+
+
+def flatten_cohort_report(student, report):
+    """One export row (COHORT_EXPORT_COLUMNS) per student"""
+    row = {
+        'user_id': student['user_id'],
+        'username': student['user__username'],
+        'name': f"{student['user__first_name']} {student['user__last_name']}".strip() or student['user__username'],
+        'email': student['user__email'],
+        'campus': student['campus'],
+        'floor': student['floor'],
+        'mentor': student['assigned_mentor__username'],
+        'month': report['month'],
+        'year': report['year'],
+        'overall_completed': report['overall']['completed'],
+        'overall_target': report['overall']['monthly_target'],
+        'overall_percentage': report['overall']['percentage'],
+        'overall_status': report['overall']['status'],
+    }
+    for pillar in PILLARS:
+        for field in ['total', 'completed', 'pending', 'percentage', 'status']:
+            row[f'{pillar}_{field}'] = report['pillars'][pillar][field]
+    return row
+
+
+def iter_cohort_export_rows(year, month, campus=None, floor=None):
+    for student, report in iter_cohort_month_reports(year, month, campus, floor):
+        yield flatten_cohort_report(student, report)
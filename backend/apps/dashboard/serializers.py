@@ -12,7 +12,7 @@ class NotificationSerializer(serializers.ModelSerializer):
         model = Notification
         fields = [
             'id', 'title', 'message', 'notification_type', 'priority',
-            'is_read', 'created_at', 'time_ago'
+            'is_read', 'created_at', 'time_ago', 'announcement_id', 'action_url'
         ]
         read_only_fields = ['id', 'created_at', 'time_ago']
     
@@ -0,0 +1,50 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.cfc.models import HackathonSubmission, BMCVideoSubmission, InternshipSubmission, GenAIProjectSubmission
+from apps.clt.models import CLTSubmission
+from apps.iipc.models import LinkedInPostVerification, LinkedInConnectionVerification
+from apps.scd.models import LeetCodeProfile
+from apps.profiles.models import UserProfile
+from .models import Message, UnreadCounter
+from . import realtime, stats_cache
+
+try:
+    from apps.sri.models import SocialActivitySubmission
+except ImportError:
+    SocialActivitySubmission = None
+
+# Every model DashboardStatsView reads from
+DASHBOARD_STATS_MODELS = [
+    model for model in [
+        CLTSubmission, SocialActivitySubmission,
+        HackathonSubmission, BMCVideoSubmission, InternshipSubmission, GenAIProjectSubmission,
+        LinkedInPostVerification, LinkedInConnectionVerification, LeetCodeProfile,
+    ] if model is not None
+]
+
+
+@receiver(post_save, sender=Message)
+def push_new_message(sender, instance, created, **kwargs):
+    """Push new direct messages to the recipient's realtime stream"""
+    if created:
+        realtime.publish_message(instance)
+
+
+@receiver(post_save, sender=UserProfile)
+def recount_announcements_on_mentor_change(sender, instance, created, **kwargs):
+    """A new mentor means a different announcement feed, so rebuild that counter"""
+    loaded = getattr(instance, '_loaded_assigned_mentor_id', None)
+    if (created and instance.assigned_mentor_id) or (not created and loaded != instance.assigned_mentor_id):
+        UnreadCounter.recount_announcements([instance.user_id])
+        stats_cache.invalidate(instance.user_id)  # mentor name is on the dashboard
+    instance._loaded_assigned_mentor_id = instance.assigned_mentor_id
+
+
+def invalidate_dashboard_stats(sender, instance, **kwargs):
+    """Submissions and reviews change the owner's dashboard stats"""
+    stats_cache.invalidate(instance.user_id)
+
+
+for model in DASHBOARD_STATS_MODELS:
+    post_save.connect(invalidate_dashboard_stats, sender=model, dispatch_uid=f'dashboard_stats_save_{model.__name__}')
+    post_delete.connect(invalidate_dashboard_stats, sender=model, dispatch_uid=f'dashboard_stats_delete_{model.__name__}')
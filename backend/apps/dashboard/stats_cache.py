@@ -0,0 +1,74 @@
+"""
+Per-user cache for DashboardStatsView with event-driven invalidation.
+
+Entries live in the 'dashboard' cache alias, which is a real cache even when
+the default cache is DummyCache (see CACHES in settings). Keys carry a
+per-user version: submission and review signals bump the version after
+commit, so the next dashboard load recomputes immediately while the TTL can
+stay long. The version is read before computing, so a stats payload built
+concurrently with an invalidation is stored under the old, dead key.
+
+Versions are time.time_ns() values rather than counters: a bump is a plain
+set (no read-modify-write, which FileBasedCache cannot do atomically), and a
+version key that was culled or evicted is re-seeded with a value no earlier
+entry was ever stored under, so old payloads can never come back as fresh.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+def get_cache():
+    return caches['dashboard']
+
+
+def _version_key(user_id):
+    return f'dashboard_stats_version_{user_id}'
+
+
+def get_version(user_id):
+    cache = get_cache()
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        seed = time.time_ns()
+        cache.add(_version_key(user_id), seed, None)
+        version = cache.get(_version_key(user_id), seed)
+    return version
+
+
+def get_versions(user_ids):
+    """{user_id: version} for many users in one cache round trip"""
+    cache = get_cache()
+    keys = {_version_key(user_id): user_id for user_id in user_ids}
+    found = cache.get_many(keys.keys())
+    versions = {keys[key]: version for key, version in found.items()}
+    for user_id in user_ids:
+        if user_id not in versions:
+            versions[user_id] = get_version(user_id)
+    return versions
+
+
+def stats_key(user_id, version):
+    return f'dashboard_stats_{user_id}_v{version}'
+
+
+def get_stats(user_id, version):
+    return get_cache().get(stats_key(user_id, version))
+
+
+def set_stats(user_id, version, data):
+    get_cache().set(stats_key(user_id, version), data, settings.DASHBOARD_STATS_CACHE_TIMEOUT)
+
+
+def _bump(user_ids):
+    version = time.time_ns()
+    get_cache().set_many({_version_key(user_id): version for user_id in user_ids}, None)
+
+
+def invalidate(*user_ids):
+    """Drop cached dashboard stats for these users once the transaction commits"""
+    user_ids = {user_id for user_id in user_ids if user_id}
+    if user_ids:
+        transaction.on_commit(lambda: _bump(user_ids))
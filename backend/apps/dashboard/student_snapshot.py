@@ -0,0 +1,145 @@
+"""
+Per-student submission snapshot shared by the admin, floor-wing and mentor
+student views.
+
+One UNION ALL query returns, for every pillar table, each student's count
+per status, latest submission time and (for LeetCode) solved-problem figures,
+so a snapshot costs one query whether it is for one student or a whole floor.
+
+Snapshots are cached briefly in the 'dashboard' cache under the student's
+stats_cache version, so a submission or review shows up on the next load.
+"""
+from django.conf import settings
+from django.db.models import CharField, Count, IntegerField, Max, Q, Sum, Value
+
+from .report_engine import MONTHLY_REQUIREMENTS, PENDING_STATUSES, SCD_MIN_PROBLEMS, SOURCES
+from apps.scd.models import LeetCodeProfile
+from . import stats_cache
+
+
+# Sources counted as "submissions" in the admin totals (LeetCode profiles and SRI are not)
+SUBMISSION_SOURCES = [
+    'clt', 'hackathons', 'bmc_videos', 'internships', 'genai_projects', 'posts', 'connections',
+]
+CFC_SOURCES = ['hackathons', 'bmc_videos', 'internships', 'genai_projects']
+IIPC_SOURCES = ['posts', 'connections']
+
+
+def _snapshot_key(user_id, version):
+    return f'student_snapshot_{user_id}_v{version}'
+
+
+def _empty_snapshot():
+    return {
+        'sources': {},
+        'leetcode': {'qualified': 0, 'solved': 0, 'best_solved': 0, 'monthly_problems': 0, 'last_synced': None},
+    }
+
+
+def _fetch(user_ids):
+    """Snapshots for user_ids straight from the database, one query"""
+    zero = Value(0, output_field=IntegerField())
+    branches = []
+    for _, source, model in SOURCES:
+        if model is LeetCodeProfile:
+            extra = {
+                'solved': Sum('total_solved'),
+                'best_solved': Max('total_solved'),
+                'qualified': Count('id', filter=Q(status='approved', total_solved__gte=SCD_MIN_PROBLEMS)),
+                'monthly_problems': Max('monthly_problems_count'),
+                'latest': Max('last_synced'),
+            }
+        else:
+            extra = {
+                'solved': zero, 'best_solved': zero, 'qualified': zero, 'monthly_problems': zero,
+                'latest': Max('created_at'),
+            }
+        branches.append(
+            model.objects.filter(user_id__in=user_ids).order_by()
+            .annotate(source=Value(source, output_field=CharField()))
+            .values('user_id', 'source', 'status')
+            .annotate(total=Count('id'), **extra)
+        )
+
+    snapshots = {user_id: _empty_snapshot() for user_id in user_ids}
+    for row in branches[0].union(*branches[1:], all=True):
+        snapshot = snapshots[row['user_id']]
+        entry = snapshot['sources'].setdefault(row['source'], {'statuses': {}, 'latest': None})
+        entry['statuses'][row['status']] = entry['statuses'].get(row['status'], 0) + row['total']
+        if row['latest'] and (entry['latest'] is None or row['latest'] > entry['latest']):
+            entry['latest'] = row['latest']
+        if row['source'] == 'leetcode':
+            leetcode = snapshot['leetcode']
+            leetcode['qualified'] += row['qualified'] or 0
+            leetcode['solved'] += row['solved'] or 0
+            leetcode['best_solved'] = max(leetcode['best_solved'], row['best_solved'] or 0)
+            leetcode['monthly_problems'] = max(leetcode['monthly_problems'], row['monthly_problems'] or 0)
+            leetcode['last_synced'] = entry['latest']
+    return snapshots
+
+
+def student_snapshots(user_ids):
+    """{user_id: snapshot} for many students; cache misses are fetched together"""
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return {}
+    cache = stats_cache.get_cache()
+    versions = stats_cache.get_versions(user_ids)
+    keys = {user_id: _snapshot_key(user_id, versions[user_id]) for user_id in user_ids}
+    cached = cache.get_many(keys.values())
+
+    snapshots = {user_id: cached[keys[user_id]] for user_id in user_ids if keys[user_id] in cached}
+    missing = [user_id for user_id in user_ids if user_id not in snapshots]
+    if missing:
+        fetched = _fetch(missing)
+        cache.set_many(
+            {keys[user_id]: snapshot for user_id, snapshot in fetched.items()},
+            settings.STUDENT_SNAPSHOT_CACHE_TIMEOUT
+        )
+        snapshots.update(fetched)
+    return snapshots
+
+
+def student_snapshot(user):
+    return student_snapshots([user.id])[user.id]
+
+
+def source_counts(snapshot, source):
+    """(total, statuses, latest) for one source of a snapshot"""
+    entry = snapshot['sources'].get(source) or {'statuses': {}, 'latest': None}
+    return sum(entry['statuses'].values()), entry['statuses'], entry['latest']
+
+
+def submission_totals(snapshot):
+    """total/approved/pending/rejected across SUBMISSION_SOURCES"""
+    totals = {'total': 0, 'approved': 0, 'pending': 0, 'rejected': 0}
+    for source in SUBMISSION_SOURCES:
+        total, statuses, _ = source_counts(snapshot, source)
+        totals['total'] += total
+        totals['approved'] += statuses.get('approved', 0)
+        totals['pending'] += sum(statuses.get(s, 0) for s in PENDING_STATUSES)
+        totals['rejected'] += statuses.get('rejected', 0)
+    return totals
+
+
+def approved_count(snapshot, sources):
+    return sum(source_counts(snapshot, source)[1].get('approved', 0) for source in sources)
+
+
+def pillar_progress(snapshot):
+    """
+    Completion percentage per pillar and overall:
+    CFC 4 tasks, CLT 1 certificate, IIPC post + connection, SCD a LeetCode
+    profile with SCD_MIN_PROBLEMS solved, SRI not tracked yet.
+    """
+    pillars = {
+        'cfc': min(100, int((approved_count(snapshot, CFC_SOURCES) / len(CFC_SOURCES)) * 100)),
+        'clt': min(100, approved_count(snapshot, ['clt']) * 100),
+        'sri': 0,
+        'iipc': min(100, int((approved_count(snapshot, IIPC_SOURCES) / MONTHLY_REQUIREMENTS['iipc']) * 100)),
+        'scd': 100 if snapshot['leetcode']['best_solved'] >= SCD_MIN_PROBLEMS else 0,
+    }
+    return {
+        'overall': int(sum(pillars.values()) / len(pillars)),
+        'pillars': pillars,
+    }
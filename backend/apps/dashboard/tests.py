@@ -0,0 +1,336 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.cfc.models import HackathonSubmission
+from apps.clt.models import CLTSubmission
+from apps.iipc.models import LinkedInPostVerification
+from apps.scd.models import LeetCodeProfile
+from apps.profiles.models import UserProfile
+from . import report_engine, student_snapshot
+from .models import Announcement, Notification, UnreadCounter
+
+
+class DashboardStatsQueryCountTest(TestCase):
+    """DashboardStatsView reads each pillar table once plus one UNION for recent activity"""
+
+    # 8 grouped status counts + 1 recent-activity UNION + 1 profile lookup
+    EXPECTED_QUERIES = 10
+
+    def setUp(self):
+        caches['dashboard'].clear()
+        self.user = User.objects.create_user(username='student', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        LeetCodeProfile.objects.create(user=self.user, leetcode_username='lc', total_solved=12, status='approved')
+
+    def create_submissions(self, count):
+        for index in range(count):
+            CLTSubmission.objects.create(
+                user=self.user, title=f'Course {index}', description='d', platform='p',
+                completion_date=date.today(), status='approved' if index % 2 else 'submitted'
+            )
+            HackathonSubmission.objects.create(
+                user=self.user, hackathon_name=f'Hack {index}', mode='online',
+                registration_date=date.today(), participation_date=date.today(), status='under_review'
+            )
+            LinkedInPostVerification.objects.create(
+                user=self.user, post_url=f'https://linkedin.com/p/{index}', post_date=date.today(),
+                character_count=1, hashtag_count=1, status='pending'
+            )
+
+    def test_query_count_does_not_grow_with_submissions(self):
+        self.create_submissions(2)
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            response = self.client.get('/api/dashboard/stats/')
+        self.assertEqual(response.status_code, 200)
+
+        caches['dashboard'].clear()
+        self.create_submissions(10)
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            response = self.client.get('/api/dashboard/stats/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_response_shape(self):
+        self.create_submissions(4)
+        data = self.client.get('/api/dashboard/stats/').json()
+
+        clt = data['pillars']['clt']
+        self.assertEqual(clt['total'], 4)
+        self.assertEqual(clt['completed'], 2)
+        self.assertEqual(clt['pending'], 2)
+        self.assertEqual(len(clt['recent_activity']), 3)
+        self.assertEqual(data['pillars']['cfc']['hackathons'], 4)
+        self.assertEqual(data['pillars']['iipc']['posts'], 4)
+        self.assertEqual(data['pillars']['scd']['completed'], 1)
+        self.assertEqual(data['pillars']['scd']['total_problems_solved'], 12)
+        self.assertEqual(len(data['recent_activities']), 5)
+        self.assertEqual(
+            {notification['pillar'] for notification in data['notifications']},
+            {'cfc', 'iipc'}
+        )
+
+    def test_cached_response_needs_no_queries(self):
+        self.client.get('/api/dashboard/stats/')
+        with self.assertNumQueries(0):
+            self.client.get('/api/dashboard/stats/')
+
+
+class CohortMonthlyReportTest(TestCase):
+    """iter_cohort_month_reports matches the per-student report at a fixed query count"""
+
+    # 1 student stream + 8 grouped pillar streams
+    EXPECTED_QUERIES = 9
+
+    def setUp(self):
+        self.students = []
+        for index in range(6):
+            user = User.objects.create_user(username=f'student{index}', password='x')
+            UserProfile.objects.filter(user=user).update(role='STUDENT', campus='TECH', floor=str(index % 2 + 1))
+            for _ in range(index % 3):
+                CLTSubmission.objects.create(
+                    user=user, title='Course', description='d', platform='p',
+                    completion_date=date.today(), status='approved'
+                )
+            self.students.append(user)
+        now = timezone.now()
+        self.year, self.month = now.year, now.month
+
+    def test_matches_single_student_report(self):
+        reports = dict(
+            (student['user_id'], report)
+            for student, report in report_engine.iter_cohort_month_reports(self.year, self.month)
+        )
+        for user in self.students:
+            buckets = report_engine.grouped_counts(user, *report_engine.month_bounds(self.year, self.month))
+            self.assertEqual(reports[user.id], report_engine.build_month_report(self.year, self.month, buckets))
+
+    def test_query_count_and_floor_filter(self):
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            rows = list(report_engine.iter_cohort_export_rows(self.year, self.month, campus='TECH', floor='2'))
+        self.assertEqual([row['username'] for row in rows], ['student1', 'student3', 'student5'])
+        self.assertEqual([row['clt_completed'] for row in rows], [1, 0, 2])
+
+    def test_export_rejects_bad_filters(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser(username='admin', password='x'))
+        month = f'{self.year}-{self.month:02d}'
+        for query in ('floor=abc', 'floor=9', 'campus=MOON'):
+            with self.subTest(query=query):
+                response = client.get(f'/api/admin/monthly-reports/export/?month={month}&{query}')
+                self.assertEqual(response.status_code, 400)
+                response = client.get(f'/api/admin/submissions/export/?{query}')
+                self.assertEqual(response.status_code, 400)
+
+
+class StudentSnapshotTest(TestCase):
+    """student_snapshots reads every pillar table in one query and is cached per submission version"""
+
+    def setUp(self):
+        caches['dashboard'].clear()
+        self.users = [User.objects.create_user(username=f'student{index}', password='x') for index in range(3)]
+        for user in self.users[:2]:
+            CLTSubmission.objects.create(
+                user=user, title='Course', description='d', platform='p',
+                completion_date=date.today(), status='approved'
+            )
+            HackathonSubmission.objects.create(
+                user=user, hackathon_name='Hack', mode='online',
+                registration_date=date.today(), participation_date=date.today(), status='submitted'
+            )
+        LeetCodeProfile.objects.create(user=self.users[0], leetcode_username='lc', total_solved=12, status='approved')
+
+    def test_one_query_then_cached(self):
+        ids = [user.id for user in self.users]
+        with self.assertNumQueries(1):
+            snapshots = student_snapshot.student_snapshots(ids)
+        with self.assertNumQueries(0):
+            self.assertEqual(student_snapshot.student_snapshots(ids), snapshots)
+
+        first = snapshots[self.users[0].id]
+        self.assertEqual(
+            student_snapshot.submission_totals(first),
+            {'total': 2, 'approved': 1, 'pending': 1, 'rejected': 0}
+        )
+        self.assertEqual(student_snapshot.pillar_progress(first)['pillars']['scd'], 100)
+        self.assertEqual(student_snapshot.submission_totals(snapshots[self.users[2].id])['total'], 0)
+
+    def test_new_submission_invalidates(self):
+        user = self.users[2]
+        student_snapshot.student_snapshot(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            CLTSubmission.objects.create(
+                user=user, title='Course', description='d', platform='p',
+                completion_date=date.today(), status='approved'
+            )
+        self.assertEqual(student_snapshot.submission_totals(student_snapshot.student_snapshot(user))['approved'], 1)
+
+
+class UnreadCounterBulkCreateTest(TestCase):
+    """bulk_create keeps the unread counter exact, including rows skipped on conflict"""
+
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f'user{index}', password='x') for index in range(2)]
+
+    def notifications(self):
+        return [
+            Notification(recipient=user, notification_type='system', title='t', message='m', announcement_id=1)
+            for user in self.users
+        ]
+
+    def unread(self, user):
+        return UnreadCounter.get_counts(user.id)['notifications_unread']
+
+    def test_ignored_conflicts_are_not_counted(self):
+        Notification.objects.bulk_create(self.notifications()[:1])
+        self.assertEqual(self.unread(self.users[0]), 1)
+
+        Notification.objects.bulk_create(self.notifications(), ignore_conflicts=True)
+        self.assertEqual([self.unread(user) for user in self.users], [1, 1])
+
+
+@override_settings(REALTIME_SSE_ENABLED=True, REALTIME_MAX_WAITERS=1)
+class StreamTicketTest(TestCase):
+    """The SSE stream authenticates with a one-time ticket instead of a JWT in the URL"""
+
+    def setUp(self):
+        caches['dashboard'].clear()
+        self.user = User.objects.create_user(username='student', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def new_ticket(self):
+        return self.client.post('/api/dashboard/events/ticket/').json()['ticket']
+
+    def open_stream(self, ticket):
+        return APIClient().get(f'/api/dashboard/events/stream/?ticket={ticket}', HTTP_ACCEPT='text/event-stream')
+
+    def test_ticket_opens_stream_once(self):
+        ticket = self.new_ticket()
+
+        response = self.open_stream(ticket)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'event: counts', b''.join([next(response.streaming_content) for _ in range(2)]))
+        response.close()
+
+        self.assertEqual(self.open_stream(ticket).status_code, 403)
+        self.assertEqual(self.open_stream('not-a-ticket').status_code, 403)
+
+    def test_waiters_are_capped_per_process(self):
+        response = self.open_stream(self.new_ticket())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.open_stream(self.new_ticket()).status_code, 503)
+        # Long-polls share the cap: no wait, told when to come back
+        poll = self.client.get('/api/dashboard/events/poll/?last_event_id=0&timeout=5')
+        self.assertEqual((poll.json()['events'], poll.json()['retry_after']), ([], 25))
+
+        # Closing a stream frees its slot, even one that was never read
+        response.close()
+        second = self.open_stream(self.new_ticket())
+        self.assertEqual(second.status_code, 200)
+        second.close()
+
+    @override_settings(REALTIME_SSE_ENABLED=False)
+    def test_disabled_stream_is_refused(self):
+        self.assertEqual(self.client.post('/api/dashboard/events/ticket/').status_code, 503)
+        self.assertEqual(
+            self.client.get('/api/dashboard/events/stream/', HTTP_ACCEPT='text/event-stream').status_code, 503
+        )
+
+
+class AnnouncementReadTest(TestCase):
+    """Students can only mark announcements from their own mentor as read"""
+
+    def setUp(self):
+        caches['dashboard'].clear()
+        self.mentor, other_mentor = (
+            User.objects.create_user(username=username, password='x') for username in ('mentor', 'other')
+        )
+        self.student = User.objects.create_user(username='student', password='x')
+        UserProfile.objects.filter(user=self.student).update(assigned_mentor=self.mentor)
+        self.own = Announcement.objects.create(mentor=self.mentor, title='Own', description='d')
+        self.foreign = Announcement.objects.create(mentor=other_mentor, title='Foreign', description='d')
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def mark_read(self, announcement):
+        return self.client.post(f'/api/dashboard/announcements/{announcement.id}/mark-read/')
+
+    def test_foreign_announcement_is_not_found(self):
+        self.assertEqual(self.mark_read(self.foreign).status_code, 404)
+        self.foreign.refresh_from_db()
+        self.assertEqual(self.foreign.read_count, 0)
+
+        self.assertEqual(self.mark_read(self.own).status_code, 200)
+        self.own.refresh_from_db()
+        self.assertEqual(self.own.read_count, 1)
+        self.assertEqual(UnreadCounter.get_counts(self.student.id)['announcements_unread'], 0)
+
+
+class BulkReviewScopeTest(TestCase):
+    """Bulk review endpoints only touch the caller's own students and report the rest"""
+
+    def setUp(self):
+        caches['dashboard'].clear()
+        self.mentor, self.other_mentor = (
+            User.objects.create_user(username=username, password='x') for username in ('mentor', 'other')
+        )
+        UserProfile.objects.filter(user__in=[self.mentor, self.other_mentor]).update(role='MENTOR', campus='TECH', floor=1)
+        self.student, self.foreign_student = (
+            User.objects.create_user(username=username, password='x') for username in ('student', 'foreign')
+        )
+        UserProfile.objects.filter(user=self.student).update(assigned_mentor=self.mentor)
+        UserProfile.objects.filter(user=self.foreign_student).update(assigned_mentor=self.other_mentor)
+        self.mentor = User.objects.get(pk=self.mentor.pk)  # drop the profile cached with the old role
+        self.client = APIClient()
+        self.client.force_authenticate(self.mentor)
+
+    def submission(self, user):
+        return CLTSubmission.objects.create(
+            user=user, title='Course', description='d', platform='p', completion_date=date.today(), status='submitted'
+        )
+
+    def test_mixed_review_list(self):
+        own, foreign = self.submission(self.student), self.submission(self.foreign_student)
+        reviews = [
+            {'submission_type': 'clt', 'submission_id': own.id, 'action': 'approve'},
+            {'submission_type': 'clt', 'submission_id': foreign.id, 'action': 'approve'},
+            {'submission_type': 'clt', 'submission_id': foreign.id + 100, 'action': 'approve'},
+        ]
+        response = self.client.post('/api/mentor/review/bulk/', {'reviews': reviews}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['submission_id'] for result in response.json()['results']], [own.id])
+        self.assertEqual(
+            [entry['submission_id'] for entry in response.json()['skipped']], [foreign.id, foreign.id + 100]
+        )
+        self.assertEqual(
+            dict(CLTSubmission.objects.values_list('id', 'status')), {own.id: 'approved', foreign.id: 'submitted'}
+        )
+        self.assertFalse(Notification.objects.filter(recipient=self.foreign_student).exists())
+
+    def test_mixed_task_approvals(self):
+        from apps.gamification.models import EpisodeProgress, Season
+        season = Season.objects.create(
+            name='S1', season_number=1, start_date=date.today(), end_date=date.today()
+        )
+        episode = season.episodes.get(episode_number=1)
+        tasks = [
+            {'student_id': student_id, 'episode_id': episode.id, 'task_type': 'clt'}
+            for student_id in (self.student.id, self.foreign_student.id, self.foreign_student.id + 100)
+        ]
+        response = self.client.post('/api/gamification/mentor/approve-tasks/bulk/', {'tasks': tasks}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [task['student_id'] for task in response.json()['skipped']],
+            [self.foreign_student.id, self.foreign_student.id + 100]
+        )
+        self.assertEqual(
+            list(EpisodeProgress.objects.filter(episode=episode, clt_completed=True).values_list('student_id', flat=True)),
+            [self.student.id]
+        )
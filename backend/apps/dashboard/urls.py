@@ -1,14 +1,20 @@
 from django.urls import path
 from .views import DashboardStatsView, NotificationListView, NotificationMarkReadView
-from .monthly_report import MonthlyReportView, AvailableMonthsView
+from .monthly_report import MonthlyReportView, MonthlyReportSeriesView, AvailableMonthsView
+from .realtime_views import poll_events, stream_events, stream_ticket
 from apps import mentor_views
 
 urlpatterns = [
     path('stats/', DashboardStatsView.as_view(), name='dashboard-stats'),
     path('monthly-report/', MonthlyReportView.as_view(), name='monthly-report'),
+    path('monthly-report/series/', MonthlyReportSeriesView.as_view(), name='monthly-report-series'),
     path('available-months/', AvailableMonthsView.as_view(), name='available-months'),
     path('notifications/', NotificationListView.as_view(), name='notifications-list'),
     path('notifications/<int:pk>/mark-read/', NotificationMarkReadView.as_view(), name='notification-mark-read'),
+    path('events/poll/', poll_events, name='events-poll'),
+    path('events/ticket/', stream_ticket, name='events-ticket'),
+    path('events/stream/', stream_events, name='events-stream'),
     path('announcements/', mentor_views.student_announcements, name='student-announcements'),
+    path('announcements/mark-read/', mentor_views.mark_announcements_read, name='mark-announcements-read'),
     path('announcements/<int:announcement_id>/mark-read/', mentor_views.mark_announcement_read, name='mark-announcement-read'),
 ]
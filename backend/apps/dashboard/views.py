@@ -1,13 +1,15 @@
+from collections import Counter
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
-from django.db.models import Count, Q
-from django.core.cache import cache
-from datetime import datetime
+from django.db.models import CharField, F, Value
+from django.db.models.functions import Cast
 import traceback
 from .models import Notification
 from .serializers import NotificationSerializer
+from . import report_engine, stats_cache
 from apps.clt.models import CLTSubmission
 # SRI models not yet implemented, so we'll handle it gracefully
 try:
@@ -15,162 +17,102 @@ try:
     HAS_SRI_MODELS = True
 except ImportError:
     HAS_SRI_MODELS = False
-from apps.cfc.models import HackathonSubmission, BMCVideoSubmission, InternshipSubmission, GenAIProjectSubmission
+from apps.cfc.models import HackathonSubmission, InternshipSubmission
 from apps.iipc.models import LinkedInPostVerification, LinkedInConnectionVerification
 from apps.scd.models import LeetCodeProfile
+from apps.profiles.models import UserProfile
+
+
+# (source, pillar, model, label field, max items) feeding the recent activity feed
+RECENT_ACTIVITY_SOURCES = [
+    ('clt', 'clt', CLTSubmission, 'title', 3),
+    ('cfc-hackathon', 'cfc', HackathonSubmission, 'hackathon_name', 2),
+    ('cfc-internship', 'cfc', InternshipSubmission, 'company', 2),
+    ('iipc-post', 'iipc', LinkedInPostVerification, None, 2),
+    ('iipc-connection', 'iipc', LinkedInConnectionVerification, 'total_connections', 2),
+    ('scd', 'scd', LeetCodeProfile, 'leetcode_username', 3),
+]
+if HAS_SRI_MODELS:
+    RECENT_ACTIVITY_SOURCES.insert(1, ('sri', 'sri', SocialActivitySubmission, 'activity_title', 3))
+
+RECENT_ACTIVITY_TITLES = {
+    'clt': 'CLT: {}',
+    'sri': 'SRI: {}',
+    'cfc-hackathon': 'CFC: Hackathon - {}',
+    'cfc-internship': 'CFC: Internship - {}',
+    'iipc-post': 'IIPC: LinkedIn Post',
+    'iipc-connection': 'IIPC: LinkedIn Connections - {} connections',
+    'scd': 'SCD: LeetCode - {}',
+}
+RECENT_ACTIVITY_PER_PILLAR = 3
 
 
 class DashboardStatsView(APIView):
     """
     Aggregate statistics from all 5 pillars for the dashboard
+    Cached per user until a submission or review changes it (see stats_cache)
     """
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
         try:
             user = request.user
-            cache_key = f'dashboard_stats_{user.id}'
             
-            # Check cache first (5 minutes)
-            cached_data = cache.get(cache_key)
+            # Check cache first (version is read before computing, see stats_cache)
+            cache_version = stats_cache.get_version(user.id)
+            cached_data = stats_cache.get_stats(user.id, cache_version)
             if cached_data:
                 return Response(cached_data)
             
-            # Monthly task requirements
-            MONTHLY_REQUIREMENTS = {
-                'clt': 1,      # 1 certificate upload per month
-                'sri': 0,      # Not specified
-                'cfc': 3,      # 3 tasks: hackathon, BMC, GenAI project (internship is optional)
-                'iipc': 2,     # 2 tasks: LinkedIn post and connection
-                'scd': 1,      # 1 profile with minimum 10 problems
-            }
+            # One grouped status-count query per pillar table
+            counts = report_engine.grouped_counts(user)
+            stats = report_engine.pillar_stats(counts)
+            recent_by_pillar, recent_activities = self.get_recent_activity(user)
             
             # CLT Stats (1 submission per month required)
-            clt_submissions = CLTSubmission.objects.filter(user=user)
-            clt_completed = clt_submissions.filter(status='approved').count()
             clt_stats = {
-                'total': clt_submissions.count(),
-                'completed': clt_completed,
-                'pending': clt_submissions.filter(status__in=['draft', 'submitted', 'under_review']).count(),
-                'monthly_target': MONTHLY_REQUIREMENTS['clt'],
-                'percentage': min(100, round((clt_completed / MONTHLY_REQUIREMENTS['clt']) * 100)) if MONTHLY_REQUIREMENTS['clt'] > 0 else 0,
-                'recent_activity': self.get_clt_recent_activity(user),
+                **self.base_stats(stats['clt']),
+                'recent_activity': recent_by_pillar['clt'],
             }
             
-            # SRI Stats (handle if models not yet implemented)
-            if HAS_SRI_MODELS:
-                sri_submissions = SocialActivitySubmission.objects.filter(user=user)
-                sri_completed = sri_submissions.filter(status='approved').count()
-                sri_stats = {
-                    'total': sri_submissions.count(),
-                    'completed': sri_completed,
-                    'pending': sri_submissions.filter(status__in=['draft', 'submitted', 'under_review']).count(),
-                    'monthly_target': MONTHLY_REQUIREMENTS['sri'],
-                    'percentage': 0,
-                    'recent_activity': self.get_sri_recent_activity(user),
-                }
-            else:
-                # SRI models not implemented yet - return empty stats
-                sri_stats = {
-                    'total': 0,
-                    'completed': 0,
-                    'pending': 0,
-                    'monthly_target': MONTHLY_REQUIREMENTS['sri'],
-                    'percentage': 0,
-                    'recent_activity': [],
-                }
+            # SRI Stats (empty until the SRI models are implemented)
+            sri_stats = {
+                **self.base_stats(stats['sri']),
+                'recent_activity': recent_by_pillar['sri'],
+            }
             
             # CFC Stats (4 tasks per month: hackathon, BMC, internship, GenAI)
-            hackathons = HackathonSubmission.objects.filter(user=user)
-            bmc_videos = BMCVideoSubmission.objects.filter(user=user)
-            internships = InternshipSubmission.objects.filter(user=user)
-            genai_projects = GenAIProjectSubmission.objects.filter(user=user)
-            
-            cfc_total = hackathons.count() + bmc_videos.count() + internships.count() + genai_projects.count()
-            cfc_completed = (
-                hackathons.filter(status='approved').count() +
-                bmc_videos.filter(status='approved').count() +
-                internships.filter(status='approved').count() +
-                genai_projects.filter(status='approved').count()
-            )
-            
+            cfc_breakdown = stats['cfc']['breakdown']
             cfc_stats = {
-                'total': cfc_total,
-                'completed': cfc_completed,
-                'pending': cfc_total - cfc_completed,
-                'monthly_target': MONTHLY_REQUIREMENTS['cfc'],
-                'percentage': min(100, round((cfc_completed / MONTHLY_REQUIREMENTS['cfc']) * 100)) if MONTHLY_REQUIREMENTS['cfc'] > 0 else 0,
-                'hackathons': hackathons.count(),
-                'bmc_videos': bmc_videos.count(),
-                'internships': internships.count(),
-                'genai_projects': genai_projects.count(),
-                'recent_activity': self.get_cfc_recent_activity(user),
+                **self.base_stats(stats['cfc']),
+                'hackathons': cfc_breakdown['hackathons']['total'],
+                'bmc_videos': cfc_breakdown['bmc_videos']['total'],
+                'internships': cfc_breakdown['internships']['total'],
+                'genai_projects': cfc_breakdown['genai_projects']['total'],
+                'recent_activity': recent_by_pillar['cfc'],
             }
             
             # IIPC Stats (2 tasks per month: LinkedIn post and connection)
-            linkedin_posts = LinkedInPostVerification.objects.filter(user=user)
-            linkedin_connections = LinkedInConnectionVerification.objects.filter(user=user)
-            
-            iipc_total = linkedin_posts.count() + linkedin_connections.count()
-            iipc_completed = (
-                linkedin_posts.filter(status='approved').count() +
-                linkedin_connections.filter(status='approved').count()
-            )
-            
+            iipc_breakdown = stats['iipc']['breakdown']
             iipc_stats = {
-                'total': iipc_total,
-                'completed': iipc_completed,
-                'pending': iipc_total - iipc_completed,
-                'monthly_target': MONTHLY_REQUIREMENTS['iipc'],
-                'percentage': min(100, round((iipc_completed / MONTHLY_REQUIREMENTS['iipc']) * 100)) if MONTHLY_REQUIREMENTS['iipc'] > 0 else 0,
-                'posts': linkedin_posts.count(),
-                'connections': linkedin_connections.count(),
-                'recent_activity': self.get_iipc_recent_activity(user),
+                **self.base_stats(stats['iipc']),
+                'posts': iipc_breakdown['posts']['total'],
+                'connections': iipc_breakdown['connections']['total'],
+                'recent_activity': recent_by_pillar['iipc'],
             }
             
             # SCD Stats (1 profile with minimum 10 problems per month)
-            leetcode_profiles = LeetCodeProfile.objects.filter(user=user)
-            # Count profiles with at least 10 problems solved and approved
-            scd_completed = leetcode_profiles.filter(
-                status='approved',
-                total_solved__gte=10
-            ).count()
-            
             scd_stats = {
-                'total': leetcode_profiles.count(),
-                'completed': scd_completed,
-                'pending': leetcode_profiles.filter(status__in=['draft', 'pending']).count(),
-                'monthly_target': MONTHLY_REQUIREMENTS['scd'],
-                'percentage': min(100, round((scd_completed / MONTHLY_REQUIREMENTS['scd']) * 100)) if MONTHLY_REQUIREMENTS['scd'] > 0 else 0,
-                'total_problems_solved': sum(p.total_solved or 0 for p in leetcode_profiles),
-                'recent_activity': self.get_scd_recent_activity(user),
+                **self.base_stats(stats['scd']),
+                'total_problems_solved': stats['scd']['total_problems_solved'],
+                'recent_activity': recent_by_pillar['scd'],
             }
             
             # Calculate overall progress based on monthly targets
-            total_monthly_target = sum(MONTHLY_REQUIREMENTS.values())
-            total_completed_towards_target = sum([
-                min(clt_stats['completed'], MONTHLY_REQUIREMENTS['clt']),
-                min(sri_stats['completed'], MONTHLY_REQUIREMENTS['sri']),
-                min(cfc_stats['completed'], MONTHLY_REQUIREMENTS['cfc']),
-                min(iipc_stats['completed'], MONTHLY_REQUIREMENTS['iipc']),
-                min(scd_stats['completed'], MONTHLY_REQUIREMENTS['scd'])
-            ])
-            overall_percentage = round((total_completed_towards_target / total_monthly_target * 100)) if total_monthly_target > 0 else 0
-            
-            # Aggregate all recent activities
-            all_activities = []
-            all_activities.extend(clt_stats['recent_activity'])
-            all_activities.extend(sri_stats['recent_activity'])
-            all_activities.extend(cfc_stats['recent_activity'])
-            all_activities.extend(iipc_stats['recent_activity'])
-            all_activities.extend(scd_stats['recent_activity'])
-            
-            # Sort by date and get top 5
-            all_activities.sort(key=lambda x: x['date'], reverse=True)
-            recent_activities = all_activities[:5]
+            total_completed_towards_target, total_monthly_target, overall_percentage = report_engine.overall_progress(stats)
             
-            # Get pending notifications
-            notifications = self.get_notifications(user)
+            # Get pending notifications (derived from the status counts above)
+            notifications = self.get_notifications(counts)
             
             # Get student info including mentor
             student_info = self.get_student_info(user)
@@ -193,8 +135,7 @@ class DashboardStatsView(APIView):
                 'notifications': notifications,
             }
             
-            # Cache for 5 minutes
-            cache.set(cache_key, data, 300)
+            stats_cache.set_stats(user.id, cache_version, data)
             
             return Response(data)
             
@@ -212,93 +153,66 @@ class DashboardStatsView(APIView):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
     
-    def get_clt_recent_activity(self, user):
-        submissions = CLTSubmission.objects.filter(user=user).order_by('-updated_at')[:3]
-        return [{
-            'id': f'clt-{s.id}',
-            'title': f'CLT: {s.title}',
-            'status': s.status,
-            'date': s.updated_at.isoformat(),
-            'pillar': 'clt',
-        } for s in submissions]
+    @staticmethod
+    def base_stats(pillar_stats):
+        return {
+            key: pillar_stats[key]
+            for key in ['total', 'completed', 'pending', 'monthly_target', 'percentage']
+        }
     
-    def get_sri_recent_activity(self, user):
-        if not HAS_SRI_MODELS:
-            return []
-        submissions = SocialActivitySubmission.objects.filter(user=user).order_by('-updated_at')[:3]
-        return [{
-            'id': f'sri-{s.id}',
-            'title': f'SRI: {s.activity_title}',
-            'status': s.status,
-            'date': s.updated_at.isoformat(),
-            'pillar': 'sri',
-        } for s in submissions]
-    
-    def get_cfc_recent_activity(self, user):
-        activities = []
-        
-        # Get recent from each CFC module
-        hackathons = HackathonSubmission.objects.filter(user=user).order_by('-updated_at')[:2]
-        for h in hackathons:
-            activities.append({
-                'id': f'cfc-hackathon-{h.id}',
-                'title': f'CFC: Hackathon - {h.hackathon_name}',
-                'status': h.status,
-                'date': h.updated_at.isoformat(),
-                'pillar': 'cfc',
-            })
-        
-        internships = InternshipSubmission.objects.filter(user=user).order_by('-updated_at')[:2]
-        for i in internships:
-            activities.append({
-                'id': f'cfc-internship-{i.id}',
-                'title': f'CFC: Internship - {i.company}',
-                'status': i.status,
-                'date': i.updated_at.isoformat(),
-                'pillar': 'cfc',
-            })
-        
-        return sorted(activities, key=lambda x: x['date'], reverse=True)[:3]
-    
-    def get_iipc_recent_activity(self, user):
-        activities = []
-        
-        posts = LinkedInPostVerification.objects.filter(user=user).order_by('-updated_at')[:2]
-        for p in posts:
-            activities.append({
-                'id': f'iipc-post-{p.id}',
-                'title': f'IIPC: LinkedIn Post',
-                'status': p.status,
-                'date': p.updated_at.isoformat(),
-                'pillar': 'iipc',
-            })
+    def get_recent_activity(self, user):
+        """
+        Recent activity per pillar plus the overall top 5, from one UNION ALL
+        over the pillar tables ordered by updated_at. Rows are streamed newest
+        first and reading stops once every pillar has its items.
+        """
+        branches = []
+        for source, pillar, model, label_field, _ in RECENT_ACTIVITY_SOURCES:
+            label = Cast(label_field, CharField()) if label_field else Value('', output_field=CharField())
+            branches.append(
+                model.objects.filter(user=user).order_by().annotate(
+                    source=Value(source, output_field=CharField()),
+                    item_id=F('id'),
+                    label=label,
+                    item_status=F('status'),
+                    date=F('updated_at'),
+                ).values('source', 'item_id', 'label', 'item_status', 'date')
+            )
+        rows = branches[0].union(*branches[1:], all=True).order_by('-date')
         
-        connections = LinkedInConnectionVerification.objects.filter(user=user).order_by('-updated_at')[:2]
-        for c in connections:
-            activities.append({
-                'id': f'iipc-connection-{c.id}',
-                'title': f'IIPC: LinkedIn Connections - {c.total_connections} connections',
-                'status': c.status,
-                'date': c.updated_at.isoformat(),
-                'pillar': 'iipc',
+        sources = {source: (pillar, limit) for source, pillar, _, _, limit in RECENT_ACTIVITY_SOURCES}
+        by_pillar = {pillar: [] for pillar in ['clt', 'sri', 'cfc', 'iipc', 'scd']}
+        per_source = Counter()
+        open_pillars = {pillar for pillar, _ in sources.values()}
+        for row in rows.iterator():
+            pillar, limit = sources[row['source']]
+            if per_source[row['source']] >= limit or len(by_pillar[pillar]) >= RECENT_ACTIVITY_PER_PILLAR:
+                continue
+            per_source[row['source']] += 1
+            by_pillar[pillar].append({
+                'id': f"{row['source']}-{row['item_id']}",
+                'title': RECENT_ACTIVITY_TITLES[row['source']].format(row['label']),
+                'status': row['item_status'],
+                'date': row['date'].isoformat(),
+                'pillar': pillar,
             })
+            if len(by_pillar[pillar]) >= RECENT_ACTIVITY_PER_PILLAR or all(
+                per_source[source] >= source_limit
+                for source, (source_pillar, source_limit) in sources.items() if source_pillar == pillar
+            ):
+                open_pillars.discard(pillar)
+            if not open_pillars:
+                break
         
-        return sorted(activities, key=lambda x: x['date'], reverse=True)[:3]
-    
-    def get_scd_recent_activity(self, user):
-        profiles = LeetCodeProfile.objects.filter(user=user).order_by('-updated_at')[:3]
-        return [{
-            'id': f'scd-{p.id}',
-            'title': f'SCD: LeetCode - {p.leetcode_username}',
-            'status': p.status,
-            'date': p.updated_at.isoformat(),
-            'pillar': 'scd',
-        } for p in profiles]
+        # Sort by date and get top 5
+        all_activities = [item for items in by_pillar.values() for item in items]
+        all_activities.sort(key=lambda x: x['date'], reverse=True)
+        return by_pillar, all_activities[:5]
     
     def get_student_info(self, user):
         """Get student profile information including mentor details"""
         try:
-            profile = user.profile
+            profile = UserProfile.objects.select_related('assigned_mentor').get(user=user)
             mentor_name = None
             
             if profile.assigned_mentor:
@@ -323,11 +237,16 @@ class DashboardStatsView(APIView):
                 'mentor_name': None,
             }
     
-    def get_notifications(self, user):
+    def get_notifications(self, counts):
+        """Under-review reminders, derived from grouped_counts() (no extra queries)"""
+        def status_count(source, review_status):
+            bucket = counts.get(source)
+            return bucket['statuses'][review_status] if bucket else 0
+        
         notifications = []
         
         # CLT notifications
-        clt_under_review = CLTSubmission.objects.filter(user=user, status='under_review').count()
+        clt_under_review = status_count('clt', 'under_review')
         if clt_under_review > 0:
             notifications.append({
                 'id': 'notif-clt-review',
@@ -338,22 +257,18 @@ class DashboardStatsView(APIView):
             })
         
         # SRI notifications (only if models exist)
-        if HAS_SRI_MODELS:
-            sri_under_review = SocialActivitySubmission.objects.filter(user=user, status='under_review').count()
-            if sri_under_review > 0:
-                notifications.append({
-                    'id': 'notif-sri-review',
-                    'message': f'{sri_under_review} SRI activity(ies) under review',
-                    'time': 'Recently',
-                    'read': False,
-                    'pillar': 'sri',
-                })
+        sri_under_review = status_count('sri', 'under_review')
+        if sri_under_review > 0:
+            notifications.append({
+                'id': 'notif-sri-review',
+                'message': f'{sri_under_review} SRI activity(ies) under review',
+                'time': 'Recently',
+                'read': False,
+                'pillar': 'sri',
+            })
         
         # CFC notifications
-        cfc_under_review = (
-            HackathonSubmission.objects.filter(user=user, status='under_review').count() +
-            InternshipSubmission.objects.filter(user=user, status='under_review').count()
-        )
+        cfc_under_review = status_count('hackathons', 'under_review') + status_count('internships', 'under_review')
         if cfc_under_review > 0:
             notifications.append({
                 'id': 'notif-cfc-review',
@@ -364,10 +279,7 @@ class DashboardStatsView(APIView):
             })
         
         # IIPC notifications
-        iipc_under_review = (
-            LinkedInPostVerification.objects.filter(user=user, status='pending').count() +
-            LinkedInConnectionVerification.objects.filter(user=user, status='pending').count()
-        )
+        iipc_under_review = status_count('posts', 'pending') + status_count('connections', 'pending')
         if iipc_under_review > 0:
             notifications.append({
                 'id': 'notif-iipc-review',
@@ -407,8 +319,7 @@ class NotificationMarkReadView(APIView):
         """Mark a specific notification as read"""
         try:
             notification = Notification.objects.get(pk=pk, recipient=request.user)
-            notification.is_read = True
-            notification.save()
+            notification.mark_as_read()
             return Response({'status': 'marked as read'})
         except Notification.DoesNotExist:
             return Response(
@@ -0,0 +1,88 @@
+"""
+Streaming export helpers (CSV, JSONL, XLSX)
+
+Rows are produced lazily (typically from QuerySet.iterator()) and written out
+one at a time, so exports of the whole cohort run in constant memory and
+start sending bytes immediately instead of timing out the worker.
+
+XLSX needs the optional openpyxl package (`pip install openpyxl`); it is
+written with a write-only workbook into a spooled temporary file.
+"""
+import csv
+import json
+import tempfile
+
+from django.core.exceptions import ImproperlyConfigured
+from django.http import FileResponse, StreamingHttpResponse
+
+
+EXPORT_FORMATS = ['csv', 'jsonl', 'xlsx']
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to the caller"""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(columns, rows):
+    """Yield CSV lines: a header, then one line per row dict"""
+    writer = csv.DictWriter(_Echo(), fieldnames=columns, extrasaction='ignore')
+    yield writer.writerow(dict(zip(columns, columns)))
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def iter_jsonl(rows):
+    """Yield one JSON document per line"""
+    for row in rows:
+        yield json.dumps(row, default=str) + '\n'
+
+
+def write_xlsx(columns, rows, fileobj, title='Export'):
+    """Write rows into fileobj as a single-sheet workbook"""
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ImproperlyConfigured('XLSX export requires openpyxl (pip install openpyxl)')
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=title[:31])
+    sheet.append(columns)
+    for row in rows:
+        sheet.append([row.get(column) for column in columns])
+    workbook.save(fileobj)
+
+
+def write_export(fmt, columns, rows, fileobj, title='Export'):
+    """Write an export to an open file (text mode for csv/jsonl, binary for xlsx)"""
+    if fmt == 'xlsx':
+        write_xlsx(columns, rows, fileobj, title)
+        return
+    lines = iter_csv(columns, rows) if fmt == 'csv' else iter_jsonl(rows)
+    for line in lines:
+        fileobj.write(line)
+
+
+def export_response(fmt, columns, rows, filename, title='Export'):
+    """HTTP response for an export; csv/jsonl stream, xlsx is spooled to a temp file"""
+    if fmt == 'xlsx':
+        spool = tempfile.SpooledTemporaryFile(max_size=10 * 1024 * 1024)
+        write_xlsx(columns, rows, spool, title)
+        spool.seek(0)
+        return FileResponse(
+            spool, as_attachment=True, filename=f'{filename}.xlsx', content_type=CONTENT_TYPES['xlsx']
+        )
+
+    lines = iter_csv(columns, rows) if fmt == 'csv' else iter_jsonl(rows)
+    response = StreamingHttpResponse(lines, content_type=CONTENT_TYPES[fmt])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{fmt}"'
+    response['X-Accel-Buffering'] = 'no'  # disable proxy buffering (nginx)
+    return response
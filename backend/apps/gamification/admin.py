@@ -2,7 +2,7 @@ from django.contrib import admin
 from .models import (
     Season, Episode, EpisodeProgress, SeasonScore, LegacyScore,
     VaultWallet, VaultTransaction, SCDStreak, LeaderboardEntry,
-    Title, UserTitle, PercentileBracket
+    Title, UserTitle, PercentileBracket, SeasonProgressDistribution
 )
 
 
@@ -90,3 +90,9 @@ class PercentileBracketAdmin(admin.ModelAdmin):
     list_display = ['student', 'season', 'percentile', 'season_score']
     list_filter = ['season', 'percentile']
     search_fields = ['student__username']
+
+
+@admin.register(SeasonProgressDistribution)
+class SeasonProgressDistributionAdmin(admin.ModelAdmin):
+    list_display = ['season', 'total_students', 'average_progress', 'median_progress', 'computed_at']
+    readonly_fields = ['computed_at', 'computation_time_ms']
@@ -9,12 +9,17 @@ from rest_framework import status
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
 
+from apps.profiles.models import UserProfile
 from .models import Season, Episode, EpisodeProgress, SeasonScore
 from .services import EpisodeService, SeasonScoringService
+from .progress_notifications import ProgressNotificationService
 from .serializers import EpisodeProgressSerializer, SeasonScoreSerializer
 
 User = get_user_model()
 
+# Upper bound on entries accepted by bulk_approve_tasks
+MAX_BULK_TASKS = 500
+
 
 def is_mentor(user):
     """Check if user is a mentor"""
@@ -74,6 +79,104 @@ def approve_task(request):
     }, status=status.HTTP_200_OK)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_approve_tasks(request):
+    """
+    Mentor approves many task submissions in one call
+    All progress rows are updated in one transaction and season scores are
+    recalculated once per affected student. Tasks for students who don't
+    exist or aren't assigned to the mentor are skipped and listed in 'skipped'.
+    
+    Expected payload:
+    {
+        "tasks": [
+            {"student_id": 123, "episode_id": 1, "task_type": "clt"},
+            ...
+        ]
+    }
+    """
+    if not is_mentor(request.user):
+        return Response(
+            {'error': 'Only mentors can approve tasks'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    tasks = request.data.get('tasks')
+    if not isinstance(tasks, list) or not tasks:
+        return Response(
+            {'error': 'tasks must be a non-empty list'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    if len(tasks) > MAX_BULK_TASKS:
+        return Response(
+            {'error': f'At most {MAX_BULK_TASKS} tasks can be approved per request'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    entries = []
+    for index, task in enumerate(tasks):
+        student_id = task.get('student_id') if isinstance(task, dict) else None
+        episode_id = task.get('episode_id') if isinstance(task, dict) else None
+        task_type = task.get('task_type') if isinstance(task, dict) else None
+        
+        if not all([student_id, episode_id, task_type]):
+            return Response(
+                {'error': f'tasks[{index}]: student_id, episode_id, and task_type are required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if task_type not in EpisodeService.TASK_FIELD_MAP:
+            return Response(
+                {'error': f'tasks[{index}]: invalid task_type "{task_type}"'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        entries.append((student_id, episode_id, task_type))
+    
+    try:
+        entries = [(int(student_id), int(episode_id), task_type) for student_id, episode_id, task_type in entries]
+    except (TypeError, ValueError):
+        return Response(
+            {'error': 'student_id and episode_id must be integers'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    episode_ids = {episode_id for _, episode_id, _ in entries}
+    
+    if Episode.objects.filter(id__in=episode_ids).count() != len(episode_ids):
+        return Response({'error': 'One or more episodes not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    # Only the mentor's own students
+    mentees = set(
+        UserProfile.objects.reviewable_by(request.user)
+        .filter(user_id__in={student_id for student_id, _, _ in entries})
+        .values_list('user_id', flat=True)
+    )
+    skipped = [
+        {'student_id': student_id, 'episode_id': episode_id, 'task_type': task_type}
+        for student_id, episode_id, task_type in entries
+        if student_id not in mentees
+    ]
+    entries = [entry for entry in entries if entry[0] in mentees]
+    student_ids = {student_id for student_id, _, _ in entries}
+    
+    if entries:
+        EpisodeService.mark_tasks_completed_bulk(entries)
+    
+    # Re-read so statuses reflect any episode completions from recomputation
+    progress = EpisodeProgress.objects.filter(
+        student_id__in=student_ids,
+        episode_id__in=episode_ids
+    ).select_related('episode', 'episode__season')
+    serializer = EpisodeProgressSerializer(progress, many=True)
+    
+    return Response({
+        'message': f'{len(entries)} tasks marked complete',
+        'students_updated': len(student_ids),
+        'progress': serializer.data,
+        'skipped': skipped
+    }, status=status.HTTP_200_OK)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def student_progress_detail(request, student_id):
@@ -124,6 +227,52 @@ def student_progress_detail(request, student_id):
     })
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def students_behind(request):
+    """
+    Mentor's assigned students whose episode completion is below a threshold
+    
+    Query params:
+        - threshold: completion percentage cut-off (default: 40)
+        - episode: episode number (default: episode running today)
+    """
+    if not is_mentor(request.user):
+        return Response(
+            {'error': 'Only mentors can view student progress'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    try:
+        threshold = float(request.GET.get('threshold', 40))
+        episode_number = int(request.GET['episode']) if request.GET.get('episode') else None
+    except ValueError:
+        return Response(
+            {'error': 'threshold and episode must be numbers'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    progress = ProgressNotificationService.get_students_behind(
+        threshold=threshold,
+        episode_number=episode_number
+    ).filter(student__profile__assigned_mentor=request.user)
+    
+    return Response({
+        'threshold': threshold,
+        'students': [
+            {
+                'student_id': p.student_id,
+                'username': p.student.username,
+                'name': p.student.get_full_name() or p.student.username,
+                'episode_number': p.episode.episode_number,
+                'status': p.status,
+                'completion_percentage': round(p.completion_percentage, 1),
+            }
+            for p in progress
+        ]
+    })
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def finalize_student_season(request, student_id):
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-19 06:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeasonProgressDistribution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_students', models.PositiveIntegerField(default=0)),
+                ('average_progress', models.FloatField(default=0.0)),
+                ('p25_progress', models.FloatField(default=0.0)),
+                ('median_progress', models.FloatField(default=0.0)),
+                ('p75_progress', models.FloatField(default=0.0)),
+                ('p90_progress', models.FloatField(default=0.0)),
+                ('task_distribution', models.JSONField(default=dict)),
+                ('histogram', models.JSONField(default=list)),
+                ('high_performers', models.PositiveIntegerField(default=0)),
+                ('moderate_performers', models.PositiveIntegerField(default=0)),
+                ('low_performers', models.PositiveIntegerField(default=0)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('computation_time_ms', models.PositiveIntegerField(default=0)),
+                ('season', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='progress_distribution', to='gamification.season')),
+            ],
+            options={
+                'verbose_name': 'Season Progress Distribution',
+                'verbose_name_plural': 'Season Progress Distributions',
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-19 06:48
+
+from django.db import migrations, models
+from django.db.models import IntegerField
+from django.db.models.functions import Cast
+
+
+# Snapshot of EpisodeProgress.REQUIRED_TASKS at the time of this migration
+REQUIRED_TASKS = {
+    1: ['clt_completed', 'scd_streak_active'],
+    2: ['cfc_task1_completed', 'iipc_task1_completed', 'scd_streak_active'],
+    3: ['cfc_task2_completed', 'iipc_task2_completed', 'scd_streak_active'],
+    4: ['cfc_task3_completed', 'sri_completed', 'scd_streak_active'],
+}
+
+
+def backfill_completion_percentage(apps, schema_editor):
+    """One UPDATE per episode number computing the percentage from the task columns"""
+    EpisodeProgress = apps.get_model('gamification', 'EpisodeProgress')
+    for episode_number, fields in REQUIRED_TASKS.items():
+        completed = Cast(fields[0], IntegerField())
+        for field in fields[1:]:
+            completed = completed + Cast(field, IntegerField())
+        EpisodeProgress.objects.filter(episode__episode_number=episode_number).update(
+            completion_percentage=Cast(completed, models.FloatField()) * 100.0 / len(fields)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0002_seasonprogressdistribution'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='episodeprogress',
+            name='completion_percentage',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddIndex(
+            model_name='episodeprogress',
+            index=models.Index(fields=['episode', 'completion_percentage'], name='ep_progress_completion_idx'),
+        ),
+        migrations.RunPython(backfill_completion_percentage, migrations.RunPython.noop),
+    ]
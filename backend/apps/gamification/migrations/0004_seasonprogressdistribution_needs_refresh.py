@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-19 07:38
+
+from django.db import migrations, models
+
+
+def flag_existing_distributions(apps, schema_editor):
+    """Existing rows have no student_tasks yet; recompute them on first read"""
+    SeasonProgressDistribution = apps.get_model('gamification', 'SeasonProgressDistribution')
+    SeasonProgressDistribution.objects.update(needs_refresh=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0003_episodeprogress_completion_percentage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='seasonprogressdistribution',
+            name='needs_refresh',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='seasonprogressdistribution',
+            name='student_tasks',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.RunPython(flag_existing_distributions, migrations.RunPython.noop),
+    ]
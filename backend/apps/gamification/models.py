@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Case, When, Value, IntegerField
+from django.db.models.functions import Cast
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
@@ -81,6 +83,15 @@ class EpisodeProgress(models.Model):
         ('completed', 'Completed'),
     ]
 
+    # Task columns each episode requires for completion
+    REQUIRED_TASKS = {
+        1: ['clt_completed', 'scd_streak_active'],  # Kickoff
+        2: ['cfc_task1_completed', 'iipc_task1_completed', 'scd_streak_active'],  # Build
+        3: ['cfc_task2_completed', 'iipc_task2_completed', 'scd_streak_active'],  # Intensity
+        4: ['cfc_task3_completed', 'sri_completed', 'scd_streak_active'],  # Finale
+    }
+    SEASON_TOTAL_TASKS = sum(len(fields) for fields in REQUIRED_TASKS.values())
+
     student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='episode_progress')
     episode = models.ForeignKey(Episode, on_delete=models.CASCADE, related_name='student_progress')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='locked')
@@ -95,29 +106,61 @@ class EpisodeProgress(models.Model):
     sri_completed = models.BooleanField(default=False)
     scd_streak_active = models.BooleanField(default=False)
     
+    # Stored share of required tasks done (0-100), kept in sync by save()
+    completion_percentage = models.FloatField(default=0.0)
+    
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     
     class Meta:
         unique_together = ['student', 'episode']
         ordering = ['episode__season', 'episode__episode_number']
+        indexes = [
+            models.Index(fields=['episode', 'completion_percentage'], name='ep_progress_completion_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.username} - {self.episode}"
 
+    def save(self, *args, **kwargs):
+        self.completion_percentage = self.calculate_completion_percentage()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'completion_percentage' not in update_fields:
+            kwargs['update_fields'] = list(update_fields) + ['completion_percentage']
+        super().save(*args, **kwargs)
+
+    def calculate_completion_percentage(self):
+        """
+        Percentage of this episode's required tasks that are completed
+        Reads self.episode, so callers that save should have it loaded
+        (select_related('episode') or assigned) to avoid a query per save
+        """
+        required = self.REQUIRED_TASKS.get(self.episode.episode_number)
+        if not required:
+            return 0.0
+        completed = sum(1 for field in required if getattr(self, field))
+        return completed / len(required) * 100
+
+    @classmethod
+    def completed_tasks_expression(cls):
+        """
+        SQL expression counting the required tasks completed on a progress row
+        Lets batch statistics be aggregated in the database
+        """
+        whens = []
+        for episode_number, fields in cls.REQUIRED_TASKS.items():
+            expression = Cast(fields[0], IntegerField())
+            for field in fields[1:]:
+                expression = expression + Cast(field, IntegerField())
+            whens.append(When(episode__episode_number=episode_number, then=expression))
+        return Case(*whens, default=Value(0), output_field=IntegerField())
+
     def check_episode_completion(self):
         """Check if all required tasks for this episode are completed"""
-        episode_num = self.episode.episode_number
-        
-        if episode_num == 1:
-            return self.clt_completed and self.scd_streak_active
-        elif episode_num == 2:
-            return self.cfc_task1_completed and self.iipc_task1_completed and self.scd_streak_active
-        elif episode_num == 3:
-            return self.cfc_task2_completed and self.iipc_task2_completed and self.scd_streak_active
-        elif episode_num == 4:
-            return self.cfc_task3_completed and self.sri_completed and self.scd_streak_active
-        return False
+        required = self.REQUIRED_TASKS.get(self.episode.episode_number)
+        if not required:
+            return False
+        return all(getattr(self, field) for field in required)
 
     def mark_completed(self):
         """Mark episode as completed and unlock next episode"""
@@ -133,11 +176,16 @@ class EpisodeProgress(models.Model):
             ).first()
             
             if next_episode:
-                EpisodeProgress.objects.update_or_create(
-                    student=self.student,
-                    episode=next_episode,
-                    defaults={'status': 'unlocked'}
-                )
+                # Status only, so a plain UPDATE (save() would have to load the row's episode)
+                unlocked = EpisodeProgress.objects.filter(
+                    student_id=self.student_id, episode=next_episode
+                ).update(status='unlocked')
+                if not unlocked:
+                    EpisodeProgress.objects.get_or_create(
+                        student_id=self.student_id,
+                        episode=next_episode,
+                        defaults={'status': 'unlocked'}
+                    )
             
             # Check if season is complete (all 4 episodes done)
             if self.episode.episode_number == 4:
@@ -507,3 +555,43 @@ class PercentileBracket(models.Model):
 
     def __str__(self):
         return f"{self.student.username} - {self.season.name} - {self.percentile}"
+
+
+class SeasonProgressDistribution(models.Model):
+    """
+    Persisted batch-wide progress distribution for a season
+    Student progress = required tasks completed across the season's episodes
+    Approvals only flag it (needs_refresh); ProgressNotificationService
+    recomputes it lazily on read, at most once per debounce interval
+    """
+    season = models.OneToOneField(Season, on_delete=models.CASCADE, related_name='progress_distribution')
+    
+    total_students = models.PositiveIntegerField(default=0)
+    average_progress = models.FloatField(default=0.0)
+    p25_progress = models.FloatField(default=0.0)
+    median_progress = models.FloatField(default=0.0)
+    p75_progress = models.FloatField(default=0.0)
+    p90_progress = models.FloatField(default=0.0)
+    
+    # {completed task count: student count}, used for O(1) percentile ranks
+    task_distribution = models.JSONField(default=dict)
+    # Student counts in 10% completion buckets (0-9, 10-19, ..., 90-100)
+    histogram = models.JSONField(default=list)
+    # {student id: completed task count}, so a student's comparison needs no query of its own
+    student_tasks = models.JSONField(default=dict)
+    
+    high_performers = models.PositiveIntegerField(default=0)  # >= 75%
+    moderate_performers = models.PositiveIntegerField(default=0)  # 40-75%
+    low_performers = models.PositiveIntegerField(default=0)  # < 40%
+    
+    computed_at = models.DateTimeField(auto_now=True)
+    computation_time_ms = models.PositiveIntegerField(default=0)
+    # Set after approvals commit; cleared when a recomputation starts
+    needs_refresh = models.BooleanField(default=False)
+
+    class Meta:
+        verbose_name = 'Season Progress Distribution'
+        verbose_name_plural = 'Season Progress Distributions'
+
+    def __str__(self):
+        return f"{self.season.name} - {self.total_students} students, avg {self.average_progress}%"
@@ -2,10 +2,16 @@
 Progress Notification Service
 Calculates batch averages and generates motivational notifications
 """
+from collections import Counter
 from django.contrib.auth import get_user_model
-from django.db.models import Avg, Count, Q
-from .models import EpisodeProgress, Season
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+from apps.dashboard.stats_cache import get_cache
+from .models import Episode, EpisodeProgress, Season, SeasonProgressDistribution
+import math
 import random
+import time
 
 User = get_user_model()
 
@@ -53,68 +59,195 @@ class ProgressNotificationService:
         ]
     }
     
+    # Cached distribution lifetime when nothing has changed since it was computed
+    BATCH_STATS_CACHE_TIMEOUT = 300
+    # Persisted rows older than this are recomputed on read even if never flagged
+    BATCH_STATS_STALE_SECONDS = 600
+    # A row flagged by approvals is recomputed at most this often (debounce)
+    BATCH_STATS_MIN_INTERVAL = 60
+    # Longer than a recomputation can take; only one reader recomputes a season at a time
+    BATCH_STATS_LOCK_TIMEOUT = 60
+    
+    @staticmethod
+    def _batch_stats_cache_key(season_id):
+        return f'batch_progress_{season_id}'
+    
+    @staticmethod
+    def _batch_stats_lock_key(season_id):
+        return f'batch_progress_refreshing_{season_id}'
+    
+    @staticmethod
+    def _percentile(task_counts, total, fraction):
+        """Nearest-rank percentile over a {completed tasks: students} distribution"""
+        rank = max(1, math.ceil(fraction * total))
+        seen = 0
+        for done in sorted(task_counts):
+            seen += task_counts[done]
+            if seen >= rank:
+                return done
+        return 0
+    
     @classmethod
-    def get_batch_statistics(cls, season=None):
+    def refresh_batch_statistics(cls, season):
         """
-        Calculate batch-wide statistics for current season
-        Returns total students, average progress, and distribution
+        Recompute and persist the batch distribution for a season
+        Per-student task totals are summed in SQL from the task boolean columns
         """
-        if not season:
-            season = Season.objects.filter(is_active=True).first()
+        started = time.time()
+        total_tasks = EpisodeProgress.SEASON_TOTAL_TASKS
+        # Cleared first, so approvals committed while this runs flag the new row again
+        SeasonProgressDistribution.objects.filter(season=season).update(needs_refresh=False)
         
-        if not season:
-            return None
+        per_student = (
+            EpisodeProgress.objects
+            .filter(episode__season=season)
+            .order_by()
+            .values('student')
+            .annotate(done=Sum(EpisodeProgress.completed_tasks_expression()))
+            .values_list('student', 'done')
+        )
+        student_tasks = {str(student_id): done or 0 for student_id, done in per_student}
+        task_counts = Counter(student_tasks.values())
+        total_students = sum(task_counts.values())
         
-        # Get all students who have episode progress
-        students_with_progress = User.objects.filter(
-            episode_progress__episode__season=season
-        ).distinct()
+        def to_percent(done):
+            return round(done / total_tasks * 100, 1)
         
-        total_students = students_with_progress.count()
+        histogram = [0] * 10
+        high = moderate = low = 0
+        completed_sum = 0
+        for done, students in task_counts.items():
+            percent = done / total_tasks * 100
+            histogram[min(int(percent // 10), 9)] += students
+            completed_sum += done * students
+            if percent >= 75:
+                high += students
+            elif percent >= 40:
+                moderate += students
+            else:
+                low += students
         
-        if total_students == 0:
-            return {
-                'total_students': 0,
-                'average_progress': 0,
-                'season_name': season.name if season else None,
+        distribution, _ = SeasonProgressDistribution.objects.update_or_create(
+            season=season,
+            defaults={
+                'total_students': total_students,
+                'average_progress': (
+                    round(completed_sum / (total_students * total_tasks) * 100, 1)
+                    if total_students else 0
+                ),
+                'p25_progress': to_percent(cls._percentile(task_counts, total_students, 0.25)),
+                'median_progress': to_percent(cls._percentile(task_counts, total_students, 0.5)),
+                'p75_progress': to_percent(cls._percentile(task_counts, total_students, 0.75)),
+                'p90_progress': to_percent(cls._percentile(task_counts, total_students, 0.9)),
+                'task_distribution': {str(done): n for done, n in sorted(task_counts.items())},
+                'histogram': histogram,
+                'student_tasks': student_tasks,
+                'high_performers': high,
+                'moderate_performers': moderate,
+                'low_performers': low,
+                'computation_time_ms': int((time.time() - started) * 1000),
             }
+        )
         
-        # TODO: Fix completion_percentage calculation - it's a computed field not a DB field
-        # Calculate average progress across all students
-        # avg_data = EpisodeProgress.objects.filter(
-        #     episode__season=season,
-        #     status__in=['unlocked', 'in_progress', 'completed']
-        # ).aggregate(
-        #     avg_completion=Avg('completion_percentage')
-        # )
-        
-        # Count students in different progress ranges
-        # high_performers = EpisodeProgress.objects.filter(
-        #     episode__season=season,
-        #     completion_percentage__gte=75
-        # ).values('student').distinct().count()
-        
-        # moderate_performers = EpisodeProgress.objects.filter(
-        #     episode__season=season,
-        #     completion_percentage__gte=40,
-        #     completion_percentage__lt=75
-        # ).values('student').distinct().count()
-        
-        # low_performers = EpisodeProgress.objects.filter(
-        #     episode__season=season,
-        #     completion_percentage__lt=40
-        # ).values('student').distinct().count()
-        
+        entry = cls._cache_entry(distribution, season)
+        # update_or_create() leaves needs_refresh alone; set means approvals landed meanwhile
+        timeout = cls.BATCH_STATS_MIN_INTERVAL if distribution.needs_refresh else cls.BATCH_STATS_CACHE_TIMEOUT
+        get_cache().set(cls._batch_stats_cache_key(season.id), entry, timeout)
+        return entry
+    
+    @classmethod
+    def schedule_refresh(cls, season):
+        """
+        Flag the season's distribution for recomputation once the current transaction commits
+        Approvals only pay for this UPDATE and a cache delete; the next reader
+        recomputes (see _load_distribution), at most once per BATCH_STATS_MIN_INTERVAL
+        """
+        if season:
+            def flag():
+                SeasonProgressDistribution.objects.filter(season=season).update(needs_refresh=True)
+                get_cache().delete(cls._batch_stats_cache_key(season.id))
+            transaction.on_commit(flag)
+    
+    @classmethod
+    def _cache_entry(cls, distribution, season):
+        # student_tasks stays out of 'stats', which batch_stats returns to every student
         return {
-            'total_students': total_students,
-            'average_progress': 0,  # round(avg_data['avg_completion'] or 0, 1),
-            'high_performers': 0,  # high_performers,
-            'moderate_performers': 0,  # moderate_performers,
-            'low_performers': 0,  # low_performers,
+            'stats': cls._serialize_distribution(distribution, season),
+            'student_tasks': distribution.student_tasks,
+        }
+    
+    @staticmethod
+    def _serialize_distribution(distribution, season):
+        return {
+            'total_students': distribution.total_students,
+            'average_progress': distribution.average_progress,
+            'high_performers': distribution.high_performers,
+            'moderate_performers': distribution.moderate_performers,
+            'low_performers': distribution.low_performers,
+            'percentiles': {
+                'p25': distribution.p25_progress,
+                'p50': distribution.median_progress,
+                'p75': distribution.p75_progress,
+                'p90': distribution.p90_progress,
+            },
+            'histogram': distribution.histogram,
+            'task_distribution': distribution.task_distribution,
             'season_name': season.name,
             'season_id': season.id,
+            'computed_at': distribution.computed_at.isoformat() if distribution.computed_at else None,
         }
     
+    @classmethod
+    def _load_distribution(cls, season):
+        """
+        {'stats', 'student_tasks'} for a season
+        Served from cache, then the persisted distribution; recomputed only when
+        the stored row is missing, too old, or flagged by approvals more than
+        BATCH_STATS_MIN_INTERVAL after it was computed. One reader recomputes
+        behind a cache lock while the others keep getting the stored row.
+        """
+        cache = get_cache()
+        entry = cache.get(cls._batch_stats_cache_key(season.id))
+        if entry is not None:
+            return entry
+        
+        distribution = SeasonProgressDistribution.objects.filter(season=season).first()
+        if distribution:
+            age = (timezone.now() - distribution.computed_at).total_seconds()
+            if age < cls.BATCH_STATS_STALE_SECONDS and not (
+                distribution.needs_refresh and age >= cls.BATCH_STATS_MIN_INTERVAL
+            ):
+                entry = cls._cache_entry(distribution, season)
+                # A flagged row is only held until its debounce interval is over
+                timeout = (
+                    max(1, int(cls.BATCH_STATS_MIN_INTERVAL - age))
+                    if distribution.needs_refresh else cls.BATCH_STATS_CACHE_TIMEOUT
+                )
+                cache.set(cls._batch_stats_cache_key(season.id), entry, timeout)
+                return entry
+        
+        locked = cache.add(cls._batch_stats_lock_key(season.id), True, cls.BATCH_STATS_LOCK_TIMEOUT)
+        if not locked and distribution:
+            return cls._cache_entry(distribution, season)
+        try:
+            return cls.refresh_batch_statistics(season)
+        finally:
+            if locked:
+                cache.delete(cls._batch_stats_lock_key(season.id))
+    
+    @classmethod
+    def get_batch_statistics(cls, season=None):
+        """
+        Batch-wide statistics for the current season
+        """
+        if not season:
+            season = Season.objects.filter(is_active=True).first()
+        
+        if not season:
+            return None
+        
+        return cls._load_distribution(season)['stats']
+    
     @classmethod
     def get_student_comparison(cls, student, season=None):
         """
@@ -128,24 +261,15 @@ class ProgressNotificationService:
             return None
         
         # Get batch statistics
-        batch_stats = cls.get_batch_statistics(season)
+        distribution = cls._load_distribution(season)
+        batch_stats = distribution['stats']
         
-        if not batch_stats or batch_stats['total_students'] == 0:
+        if batch_stats['total_students'] == 0:
             return None
         
-        # Get student's current episode progress
-        try:
-            current_progress = EpisodeProgress.objects.filter(
-                student=student,
-                episode__season=season,
-                status__in=['unlocked', 'in_progress', 'completed']
-            ).latest('episode__episode_number')
-            
-            # TODO: Calculate completion_percentage properly - it's not a DB field
-            # For now, use a simple calculation based on completed tasks
-            student_progress = 0  # current_progress.completion_percentage
-        except EpisodeProgress.DoesNotExist:
-            student_progress = 0
+        # Student's season progress, from the same snapshot as the batch figures
+        student_done = distribution['student_tasks'].get(str(student.id), 0)
+        student_progress = student_done / EpisodeProgress.SEASON_TOTAL_TASKS * 100
         
         batch_average = batch_stats['average_progress']
         difference = student_progress - batch_average
@@ -167,14 +291,11 @@ class ProgressNotificationService:
         # Get random motivational message
         message = random.choice(cls.MOTIVATIONAL_MESSAGES[category])
         
-        # Calculate percentile rank
-        # TODO: Fix this - completion_percentage is not a DB field
-        # students_below = EpisodeProgress.objects.filter(
-        #     episode__season=season,
-        #     completion_percentage__lt=student_progress
-        # ).values('student').distinct().count()
-        
-        students_below = 0
+        # Percentile rank from the stored distribution
+        students_below = sum(
+            count for done, count in batch_stats['task_distribution'].items()
+            if int(done) < student_done
+        )
         
         percentile = 0
         if batch_stats['total_students'] > 0:
@@ -192,6 +313,37 @@ class ProgressNotificationService:
             'urgency_level': cls._get_urgency_level(category),
         }
     
+    @classmethod
+    def get_students_behind(cls, threshold=40, season=None, episode_number=None):
+        """
+        Progress rows below a completion threshold for one episode
+        Served by the (episode, completion_percentage) index as a range scan
+        Defaults to the episode running today in the active season
+        """
+        if not season:
+            season = Season.objects.filter(is_active=True).first()
+        
+        if not season:
+            return EpisodeProgress.objects.none()
+        
+        episodes = Episode.objects.filter(season=season)
+        if episode_number:
+            episode = episodes.filter(episode_number=episode_number).first()
+        else:
+            today = timezone.now().date()
+            episode = (
+                episodes.filter(start_date__lte=today, end_date__gte=today).first()
+                or episodes.order_by('episode_number').first()
+            )
+        
+        if not episode:
+            return EpisodeProgress.objects.none()
+        
+        return EpisodeProgress.objects.filter(
+            episode=episode,
+            completion_percentage__lt=threshold
+        ).select_related('student', 'episode').order_by('completion_percentage')
+    
     @classmethod
     def _get_urgency_level(cls, category):
         """
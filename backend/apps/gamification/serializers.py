@@ -29,7 +29,6 @@ class EpisodeSerializer(serializers.ModelSerializer):
 
 class EpisodeProgressSerializer(serializers.ModelSerializer):
     episode_details = EpisodeSerializer(source='episode', read_only=True)
-    completion_percentage = serializers.SerializerMethodField()
     
     class Meta:
         model = EpisodeProgress
@@ -38,26 +37,7 @@ class EpisodeProgressSerializer(serializers.ModelSerializer):
                   'cfc_task3_completed', 'iipc_task1_completed', 'iipc_task2_completed',
                   'sri_completed', 'scd_streak_active', 'started_at', 'completed_at',
                   'completion_percentage']
-    
-    def get_completion_percentage(self, obj):
-        episode_num = obj.episode.episode_number
-        completed_tasks = 0
-        total_tasks = 0
-        
-        if episode_num == 1:
-            total_tasks = 2
-            completed_tasks = sum([obj.clt_completed, obj.scd_streak_active])
-        elif episode_num == 2:
-            total_tasks = 3
-            completed_tasks = sum([obj.cfc_task1_completed, obj.iipc_task1_completed, obj.scd_streak_active])
-        elif episode_num == 3:
-            total_tasks = 3
-            completed_tasks = sum([obj.cfc_task2_completed, obj.iipc_task2_completed, obj.scd_streak_active])
-        elif episode_num == 4:
-            total_tasks = 3
-            completed_tasks = sum([obj.cfc_task3_completed, obj.sri_completed, obj.scd_streak_active])
-        
-        return (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+        read_only_fields = ['completion_percentage']
 
 
 class SeasonScoreSerializer(serializers.ModelSerializer):
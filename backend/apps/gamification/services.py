@@ -9,6 +9,7 @@ from .models import (
     Season, Episode, EpisodeProgress, SeasonScore, LegacyScore,
     VaultWallet, SCDStreak, LeaderboardEntry, PercentileBracket
 )
+from .progress_notifications import ProgressNotificationService
 
 User = get_user_model()
 
@@ -16,6 +17,18 @@ User = get_user_model()
 class EpisodeService:
     """Handle episode progression and task completion"""
     
+    # Task type -> EpisodeProgress boolean column
+    TASK_FIELD_MAP = {
+        'clt': 'clt_completed',
+        'cfc_task1': 'cfc_task1_completed',
+        'cfc_task2': 'cfc_task2_completed',
+        'cfc_task3': 'cfc_task3_completed',
+        'iipc_task1': 'iipc_task1_completed',
+        'iipc_task2': 'iipc_task2_completed',
+        'sri': 'sri_completed',
+        'scd_streak': 'scd_streak_active',
+    }
+    
     @staticmethod
     def mark_task_completed(student, episode, task_type):
         """
@@ -26,20 +39,10 @@ class EpisodeService:
             student=student,
             episode=episode
         )
+        progress.episode = episode  # save() reads episode_number; don't re-fetch it
         
         # Update task completion based on type
-        task_field_map = {
-            'clt': 'clt_completed',
-            'cfc_task1': 'cfc_task1_completed',
-            'cfc_task2': 'cfc_task2_completed',
-            'cfc_task3': 'cfc_task3_completed',
-            'iipc_task1': 'iipc_task1_completed',
-            'iipc_task2': 'iipc_task2_completed',
-            'sri': 'sri_completed',
-            'scd_streak': 'scd_streak_active',
-        }
-        
-        field_name = task_field_map.get(task_type)
+        field_name = EpisodeService.TASK_FIELD_MAP.get(task_type)
         if field_name:
             setattr(progress, field_name, True)
             
@@ -52,6 +55,7 @@ class EpisodeService:
             
             # Update season score incrementally
             SeasonScoringService.update_season_score(student, episode.season)
+            ProgressNotificationService.schedule_refresh(episode.season)
             
             # Check if episode is now complete
             if progress.check_episode_completion():
@@ -60,6 +64,107 @@ class EpisodeService:
         
         return False, "Task marked complete"
     
+    @staticmethod
+    @transaction.atomic
+    def mark_tasks_completed_bulk(entries):
+        """
+        Mark many (student_id, episode_id, task_type) tasks completed at once
+        Progress rows are written with one bulk_update and scores are
+        recomputed once per affected student instead of once per task
+        
+        Returns the list of touched EpisodeProgress rows
+        """
+        entries = [
+            (int(student_id), int(episode_id), EpisodeService.TASK_FIELD_MAP[task_type])
+            for student_id, episode_id, task_type in entries
+            if task_type in EpisodeService.TASK_FIELD_MAP
+        ]
+        if not entries:
+            return []
+        
+        student_ids = {student_id for student_id, _, _ in entries}
+        episode_ids = {episode_id for _, episode_id, _ in entries}
+        
+        progress_map = {
+            (p.student_id, p.episode_id): p
+            for p in EpisodeProgress.objects.select_for_update().filter(
+                student_id__in=student_ids,
+                episode_id__in=episode_ids
+            )
+        }
+        
+        missing = {
+            (student_id, episode_id)
+            for student_id, episode_id, _ in entries
+            if (student_id, episode_id) not in progress_map
+        }
+        if missing:
+            EpisodeProgress.objects.bulk_create(
+                [EpisodeProgress(student_id=s, episode_id=e) for s, e in missing],
+                ignore_conflicts=True
+            )
+            for p in EpisodeProgress.objects.filter(
+                student_id__in={s for s, _ in missing},
+                episode_id__in={e for _, e in missing}
+            ):
+                progress_map.setdefault((p.student_id, p.episode_id), p)
+        
+        now = timezone.now()
+        touched = {}
+        for student_id, episode_id, field_name in entries:
+            progress = progress_map.get((student_id, episode_id))
+            if progress is None:
+                continue
+            setattr(progress, field_name, True)
+            if progress.status == 'locked':
+                progress.status = 'in_progress'
+            if not progress.started_at:
+                progress.started_at = now
+            touched[(student_id, episode_id)] = progress
+        
+        # bulk_update bypasses save(), so keep the stored percentage in sync here
+        episodes = Episode.objects.in_bulk(episode_ids)
+        for (_, episode_id), progress in touched.items():
+            progress.episode = episodes[episode_id]
+            progress.completion_percentage = progress.calculate_completion_percentage()
+        
+        EpisodeProgress.objects.bulk_update(
+            touched.values(),
+            list(EpisodeService.TASK_FIELD_MAP.values()) + ['status', 'started_at', 'completion_percentage']
+        )
+        
+        # One recomputation per (student, season)
+        by_season = {}
+        for student_id, episode_id in touched:
+            by_season.setdefault(episodes[episode_id].season_id, set()).add(student_id)
+        for season in Season.objects.filter(id__in=by_season.keys()):
+            EpisodeService.recompute_students(by_season[season.id], season)
+            ProgressNotificationService.schedule_refresh(season)
+        
+        return list(touched.values())
+    
+    @staticmethod
+    def recompute_students(student_ids, season):
+        """
+        Refresh season score and episode completion for a set of students
+        Run once per student after a batch of approvals
+        """
+        if not season or not student_ids:
+            return
+        
+        for student in User.objects.filter(id__in=student_ids):
+            SeasonScoringService.update_season_score(student, season)
+        
+        open_progress = EpisodeProgress.objects.filter(
+            student_id__in=student_ids,
+            episode__season=season,
+            status__in=['unlocked', 'in_progress']
+        ).select_related('episode', 'episode__season', 'student').order_by('episode__episode_number')
+        
+        for progress in open_progress:
+            if progress.check_episode_completion():
+                progress.mark_completed()
+    
     @staticmethod
     def get_current_episode(student, season):
         """Get the current active episode for student"""
@@ -81,6 +186,7 @@ class EpisodeService:
             defaults={'status': 'unlocked'}
         )
         if not created and progress.status == 'locked':
+            progress.episode = episode
             progress.status = 'unlocked'
             progress.save()
 
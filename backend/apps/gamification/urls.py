@@ -28,7 +28,9 @@ urlpatterns = [
     
     # Mentor-only endpoints
     path('mentor/approve-task/', mentor_views.approve_task, name='mentor-approve-task'),
+    path('mentor/approve-tasks/bulk/', mentor_views.bulk_approve_tasks, name='mentor-bulk-approve-tasks'),
     path('mentor/student-progress/<int:student_id>/', mentor_views.student_progress_detail, name='mentor-student-progress'),
+    path('mentor/students-behind/', mentor_views.students_behind, name='mentor-students-behind'),
     path('mentor/finalize-season/<int:student_id>/', mentor_views.finalize_student_season, name='mentor-finalize-season'),
     
     # Floor Wing-only endpoints
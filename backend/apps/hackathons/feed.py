@@ -0,0 +1,155 @@
+"""
+Hackathon discovery feed: a stored snapshot refreshed in the background
+
+refresh_feed() fetches every source in sources.SOURCES concurrently and
+stores the merged, de-duplicated list in the 'dashboard' cache together with
+per-source health (status, item count, last attempt/success, duration, last
+error). A source that fails keeps serving the items of its last successful
+fetch, flagged as stale, until they are HACKATHON_FEED_MAX_AGE old.
+
+get_feed() never fetches inline. When the snapshot is missing or older than
+HACKATHON_FEED_TTL, the first reader starts one refresh on a daemon thread (a
+cache lock stops other readers and workers from piling on) and everyone keeps
+getting the old snapshot - or the sample list, before the first refresh has
+finished - so request latency never depends on the third-party sites and
+anonymous traffic cannot multiply requests to them. Run
+`python manage.py refresh_hackathons` from cron to keep it warm.
+
+The ETag covers only what readers care about - the listings and each
+source's status/stale flag - and Last-Modified is when that last changed, so
+a refresh that finds nothing new keeps conditional requests answering 304.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.dashboard.stats_cache import get_cache
+from .sources import SAMPLE_HACKATHONS, SOURCES, parse_date, remove_duplicates
+
+logger = logging.getLogger(__name__)
+
+FEED_KEY = 'hackathon_feed'
+REFRESH_LOCK_KEY = 'hackathon_feed_refreshing'
+# Longer than a refresh can take (every request has a 10s timeout)
+REFRESH_LOCK_TIMEOUT = 120
+
+
+def _fetch(source):
+    started = time.monotonic()
+    try:
+        return source.fetch(), None, time.monotonic() - started
+    except Exception as e:
+        return None, f'{type(e).__name__}: {e}', time.monotonic() - started
+
+
+def _source_result(name, result, previous):
+    """(items, health) for one source, falling back to its previous items on failure"""
+    items, error, duration = result
+    now = timezone.now()
+    health = {
+        'status': 'ok' if error is None else 'error',
+        'count': 0,
+        'stale': False,
+        'last_attempt': now.isoformat(),
+        'last_success': now.isoformat() if error is None else None,
+        'duration_ms': int(duration * 1000),
+        'error': error,
+    }
+    if error is None:
+        health['count'] = len(items)
+        return items, health
+
+    logger.warning('Error fetching %s hackathons: %s', name, error)
+    old_items = previous['items'].get(name, [])
+    last_success = previous['sources'].get(name, {}).get('last_success')
+    max_age = timedelta(seconds=settings.HACKATHON_FEED_MAX_AGE)
+    if old_items and last_success and now - datetime.fromisoformat(last_success) < max_age:
+        health.update(count=len(old_items), stale=True, last_success=last_success)
+        return old_items, health
+    return [], health
+
+
+def _etag(hackathons, health):
+    content = [
+        hackathons,
+        {name: (source['status'], source['stale']) for name, source in health.items()},
+    ]
+    return hashlib.md5(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _snapshot(items_by_source, health, previous=None):
+    hackathons = []
+    for name in SOURCES:
+        hackathons.extend(items_by_source.get(name, []))
+    if not hackathons:
+        hackathons = list(SAMPLE_HACKATHONS)
+
+    # Remove duplicates based on name similarity, then upcoming first
+    hackathons = remove_duplicates(hackathons)
+    hackathons.sort(key=lambda h: parse_date(h.get('start_date', '')))
+
+    now = timezone.now()
+    etag = _etag(hackathons, health)
+    unchanged = previous is not None and previous.get('etag') == etag
+    return {
+        'hackathons': hackathons,
+        'sources': health,
+        'items': items_by_source,
+        'generated_at': now,
+        'modified_at': previous['modified_at'] if unchanged else now,
+        'expires_at': now + timedelta(seconds=settings.HACKATHON_FEED_TTL),
+        'etag': etag,
+    }
+
+
+def _refresh():
+    cache = get_cache()
+    previous = cache.get(FEED_KEY)
+    known = previous or {'items': {}, 'sources': {}}
+
+    with ThreadPoolExecutor(max_workers=len(SOURCES), thread_name_prefix='hackathon-source') as pool:
+        results = dict(zip(SOURCES, pool.map(_fetch, SOURCES.values())))
+
+    items_by_source, health = {}, {}
+    for name, result in results.items():
+        items_by_source[name], health[name] = _source_result(name, result, known)
+
+    snapshot = _snapshot(items_by_source, health, previous)
+    cache.set(FEED_KEY, snapshot, settings.HACKATHON_FEED_MAX_AGE)
+    return snapshot
+
+
+def _refresh_and_unlock():
+    try:
+        return _refresh()
+    except Exception:
+        logger.exception('Hackathon feed refresh failed')
+    finally:
+        get_cache().delete(REFRESH_LOCK_KEY)
+
+
+def refresh_feed():
+    """Fetch all sources and store the snapshot; None if a refresh is already running"""
+    if not get_cache().add(REFRESH_LOCK_KEY, True, REFRESH_LOCK_TIMEOUT):
+        return None
+    return _refresh_and_unlock()
+
+
+def get_feed():
+    """The stored snapshot (samples until the first refresh lands), refreshing it in the background when due"""
+    snapshot = get_cache().get(FEED_KEY)
+    due = snapshot is None or snapshot['expires_at'] <= timezone.now()
+    if due and get_cache().add(REFRESH_LOCK_KEY, True, REFRESH_LOCK_TIMEOUT):
+        threading.Thread(target=_refresh_and_unlock, name='hackathon-feed-refresh', daemon=True).start()
+    if snapshot is None:
+        # Nothing stored yet: samples, already expired so clients come back for the real list
+        snapshot = _snapshot({}, {})
+        snapshot['expires_at'] = snapshot['generated_at']
+    return snapshot
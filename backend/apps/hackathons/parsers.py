@@ -0,0 +1,85 @@
+"""
+HTML parser backends for the hackathon source adapters
+
+Adapters only use CSS selectors, text and attributes through the small Node
+interface below, so the same parsing code runs on whichever backend is
+installed. parse_html() picks the fastest available one:
+
+- selectolax: lexbor engine (`pip install selectolax`)
+- lxml: BeautifulSoup with the lxml tree builder (`pip install lxml`)
+- html.parser: BeautifulSoup with the standard library parser (always there)
+"""
+from importlib.util import find_spec
+
+from bs4 import BeautifulSoup
+
+
+BACKENDS = ['selectolax', 'lxml', 'html.parser']
+
+
+class SoupNode:
+    """Node interface over a BeautifulSoup tag"""
+
+    def __init__(self, tag):
+        self._tag = tag
+
+    @property
+    def tag(self):
+        return self._tag.name
+
+    def select(self, css):
+        return [SoupNode(tag) for tag in self._tag.select(css)]
+
+    def select_one(self, css):
+        tag = self._tag.select_one(css)
+        return SoupNode(tag) if tag is not None else None
+
+    def text(self):
+        return self._tag.get_text().strip()
+
+    def attr(self, name):
+        return self._tag.get(name)
+
+
+class LexborNode:
+    """Node interface over a selectolax (lexbor) node"""
+
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def tag(self):
+        return self._node.tag
+
+    def select(self, css):
+        return [LexborNode(node) for node in self._node.css(css)]
+
+    def select_one(self, css):
+        node = self._node.css_first(css)
+        return LexborNode(node) if node is not None else None
+
+    def text(self):
+        return self._node.text().strip()
+
+    def attr(self, name):
+        return self._node.attributes.get(name)
+
+
+def available_backends():
+    """Installed backends, fastest first"""
+    return [
+        backend for backend in BACKENDS
+        if backend == 'html.parser' or find_spec(backend) is not None
+    ]
+
+
+def parse_html(markup, backend=None):
+    """Parse markup into a root Node with the given backend (default: fastest installed)"""
+    backend = backend or available_backends()[0]
+    if backend not in BACKENDS:
+        raise ValueError(f'Unknown HTML parser backend: {backend}')
+
+    if backend == 'selectolax':
+        from selectolax.lexbor import LexborHTMLParser
+        return LexborNode(LexborHTMLParser(markup).root)
+    return SoupNode(BeautifulSoup(markup, backend))
@@ -0,0 +1,340 @@
+"""
+Hackathon source adapters (Devpost, MLH, Devfolio)
+
+Each HackathonSource knows where its listing lives (fetch) and how to turn
+the response body into normalized hackathon dicts (parse). parse() never
+touches the network, so it runs against the saved pages in fixtures/ for
+tests and for `python manage.py benchmark_hackathon_parsers`. HTML is parsed
+through parsers.parse_html(), which uses selectolax or lxml when installed.
+
+fetch() raises on network and HTTP errors so the feed can record per-source
+health (see feed.py); a single malformed card is skipped.
+"""
+import hashlib
+import json
+import logging
+import re
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+
+import requests
+
+from .parsers import parse_html
+
+logger = logging.getLogger(__name__)
+
+REQUEST_TIMEOUT = 10
+MAX_PER_SOURCE = 15
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+FIXTURES_DIR = Path(__file__).resolve().parent / 'fixtures'
+
+# Listings of the same event on two sites whose start dates are at most this far apart are merged
+DUPLICATE_WINDOW_DAYS = 3
+# Words that do not tell two events apart ("HackMIT 2026" == "HackMIT Hackathon")
+NAME_STOPWORDS = {'the', 'a', 'an', 'of', 'and', 'hackathon', 'hackathons', 'hack', 'edition'}
+
+
+def parse_date(date_str):
+    """Parse various date formats (and the start of a "Jan 10 - 12, 2027" range) to a naive datetime"""
+    if not date_str or date_str == 'TBA':
+        return datetime.max
+
+    try:
+        return datetime.fromisoformat(date_str).replace(tzinfo=None)
+    except (TypeError, ValueError):
+        pass
+
+    if ' - ' in date_str:
+        start, end = date_str.split(' - ', 1)
+        year = re.search(r'\b\d{4}\b', end)
+        if year and not re.search(r'\b\d{4}\b', start):
+            start = f'{start.strip()}, {year.group()}'
+        date_str = start
+
+    formats = ['%b %d, %Y', '%Y-%m-%d', '%B %d, %Y', '%d %b %Y']
+    for fmt in formats:
+        try:
+            return datetime.strptime(date_str.strip(), fmt)
+        except (TypeError, ValueError):
+            continue
+    return datetime.max
+
+
+def name_key(name):
+    """Hash of the name's words, ignoring case, accents, punctuation, years, order and filler words"""
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode().lower()
+    words = {
+        word for word in re.findall(r'[a-z0-9]+', name)
+        if word not in NAME_STOPWORDS and not re.fullmatch(r'(19|20)\d\d', word)
+    }
+    return hashlib.md5(' '.join(sorted(words)).encode()).hexdigest()
+
+
+def remove_duplicates(hackathons):
+    """
+    Drop listings of an event already seen: same name_key() and start dates
+    within DUPLICATE_WINDOW_DAYS (an unknown date matches any). The first
+    listing wins, so sources earlier in SOURCES take precedence.
+    """
+    seen = {}
+    unique = []
+    for h in hackathons:
+        start = parse_date(h.get('start_date', ''))
+        starts = seen.setdefault(name_key(h['name']), [])
+        if any(
+            start == datetime.max or other == datetime.max or abs((start - other).days) <= DUPLICATE_WINDOW_DAYS
+            for other in starts
+        ):
+            continue
+        starts.append(start)
+        unique.append(h)
+    return unique
+
+
+class HackathonSource:
+    """A hackathon listing site: where to fetch it and how to parse the response"""
+
+    name = None  # key in SOURCES and in the feed's per-source health
+    url = None
+    params = None
+    headers = BROWSER_HEADERS
+    format = 'html'  # 'html' bodies go through parse_html(); 'json' ones don't use a parser backend
+    fixture = None  # saved response under fixtures/, for tests and benchmarks
+
+    def fetch(self):
+        response = requests.get(self.url, params=self.params, timeout=REQUEST_TIMEOUT, headers=self.headers)
+        response.raise_for_status()
+        return self.parse(response.text)
+
+    def parse(self, content, backend=None):
+        """Normalized hackathon dicts from a response body; backend picks the HTML parser"""
+        raise NotImplementedError
+
+    def load_fixture(self):
+        return (FIXTURES_DIR / self.fixture).read_text(encoding='utf-8')
+
+
+class DevpostSource(HackathonSource):
+    """
+    Live hackathons from Devpost
+    """
+    name = 'devpost'
+    url = 'https://devpost.com/hackathons'
+    params = {'status[]': 'open'}
+    fixture = 'devpost.html'
+
+    def parse(self, content, backend=None):
+        hackathons = []
+        for tile in parse_html(content, backend).select('div.hackathon-tile')[:MAX_PER_SOURCE]:
+            try:
+                title_elem = tile.select_one('h3')
+                link_elem = tile.select_one('a.link-to-hackathon')
+                date_elem = tile.select_one('div.submission-period')
+                location_elem = tile.select_one('div.info-with-icon')
+
+                name = title_elem.text() if title_elem else 'Devpost Hackathon'
+                url = (link_elem.attr('href') if link_elem else None) or 'https://devpost.com'
+                date = date_elem.text() if date_elem else 'TBA'
+                location = location_elem.text() if location_elem else 'Online'
+
+                hackathons.append({
+                    'id': f"devpost_{len(hackathons)}",
+                    'name': name,
+                    'start_date': date,
+                    'end_date': '',
+                    'location': location,
+                    'url': url if url.startswith('http') else f"https://devpost.com{url}",
+                    'logo': '',
+                    'source': 'Devpost',
+                    'is_online': 'online' in location.lower() or 'remote' in location.lower(),
+                    'description': f'Join {name} on Devpost and showcase your skills!',
+                })
+            except Exception as e:
+                logger.warning('Error parsing Devpost tile: %s', e)
+                continue
+        return hackathons
+
+
+class MLHSource(HackathonSource):
+    """
+    Hackathons from MLH (Major League Hacking)
+    """
+    name = 'mlh'
+    url = 'https://mlh.io/seasons/2026/events'
+    fixture = 'mlh.html'
+
+    def parse(self, content, backend=None):
+        root = parse_html(content, backend)
+        # MLH uses different structure - look for event cards, else any link to an event
+        events = root.select('div.event') or root.select('a[href*="/events/"]')
+
+        hackathons = []
+        for event in events[:MAX_PER_SOURCE]:
+            try:
+                name_elem = event.select_one('h3') or event.select_one('h2') or event.select_one('strong, b')
+                name = name_elem.text() if name_elem else 'MLH Hackathon'
+
+                date_elem = event.select_one('p.event-date') or event.select_one('time')
+                date = date_elem.text() if date_elem else 'TBA'
+
+                location_elem = event.select_one('p.event-location') or event.select_one('span.location')
+                location = location_elem.text() if location_elem else 'Various Locations'
+
+                link_elem = event if event.tag == 'a' else event.select_one('a')
+                link = (link_elem.attr('href') if link_elem else None) or ''
+                url = link if link.startswith('http') else f"https://mlh.io{link}" if link else 'https://mlh.io'
+
+                hackathons.append({
+                    'id': f"mlh_{len(hackathons)}",
+                    'name': name,
+                    'start_date': date,
+                    'end_date': '',
+                    'location': location,
+                    'url': url,
+                    'logo': '',
+                    'source': 'MLH',
+                    'is_online': 'online' in location.lower() or 'virtual' in location.lower(),
+                    'description': f'MLH Season 2026 event - {name}',
+                })
+            except Exception as e:
+                logger.warning('Error parsing MLH event: %s', e)
+                continue
+        return hackathons
+
+
+class DevfolioSource(HackathonSource):
+    """
+    Indian hackathons from Devfolio's public search API
+    """
+    name = 'devfolio'
+    url = 'https://api.devfolio.co/api/search/hackathons'
+    params = {'status': 'UPCOMING'}
+    headers = {'User-Agent': 'Mozilla/5.0'}
+    format = 'json'
+    fixture = 'devfolio.json'
+
+    def parse(self, content, backend=None):
+        hackathons = []
+        for event in json.loads(content).get('hackathons', [])[:MAX_PER_SOURCE]:
+            hackathons.append({
+                'id': f"devfolio_{event.get('id', len(hackathons))}",
+                'name': event.get('name', 'Unnamed Hackathon'),
+                'start_date': event.get('starts_at', 'TBA'),
+                'end_date': event.get('ends_at', ''),
+                'location': event.get('city', 'India'),
+                'url': f"https://devfolio.co/hackathons/{event.get('slug', '')}",
+                'logo': event.get('logo', ''),
+                'source': 'Devfolio',
+                'is_online': event.get('is_online', False),
+                'description': event.get('tagline', 'Join this exciting hackathon'),
+                'prize_amount': event.get('prizes', ''),
+            })
+        return hackathons
+
+
+# Fetched concurrently by feed.refresh_feed(); earlier sources win when deduplicating
+SOURCES = {source.name: source for source in (DevpostSource(), MLHSource(), DevfolioSource())}
+
+
+# Fallback recent hackathons data (updated with 2025-2026 dates), served when no source has data
+SAMPLE_HACKATHONS = [
+    {
+        'id': 'sample_1',
+        'name': 'Smart India Hackathon 2025',
+        'start_date': 'Dec 20, 2025',
+        'end_date': 'Dec 22, 2025',
+        'location': 'Pan India',
+        'url': 'https://www.sih.gov.in',
+        'logo': '',
+        'source': 'Sample',
+        'is_online': False,
+        'description': 'India\'s biggest hackathon initiative by Govt. of India. Solve real-world problems with innovative solutions.'
+    },
+    {
+        'id': 'sample_2',
+        'name': 'DevPost Winter Hackathon',
+        'start_date': 'Jan 10, 2026',
+        'end_date': 'Jan 17, 2026',
+        'location': 'Online',
+        'url': 'https://devpost.com/hackathons',
+        'logo': '',
+        'source': 'Sample',
+        'is_online': True,
+        'description': 'Week-long online hackathon with prizes. Build anything you want!'
+    },
+    {
+        'id': 'sample_3',
+        'name': 'ETHIndia 2025',
+        'start_date': 'Dec 18, 2025',
+        'end_date': 'Dec 20, 2025',
+        'location': 'Bangalore, India',
+        'url': 'https://ethindia.co',
+        'logo': '',
+        'source': 'Sample',
+        'is_online': False,
+        'description': 'India\'s largest Ethereum hackathon. Build Web3 applications and win crypto prizes.'
+    },
+    {
+        'id': 'sample_4',
+        'name': 'HackMIT 2026',
+        'start_date': 'Feb 14, 2026',
+        'end_date': 'Feb 16, 2026',
+        'location': 'MIT, Cambridge, MA',
+        'url': 'https://hackmit.org',
+        'logo': '',
+        'source': 'Sample',
+        'is_online': False,
+        'description': 'Annual hackathon at MIT with amazing prizes, workshops, and 1000+ hackers.'
+    },
+    {
+        'id': 'sample_5',
+        'name': 'Google Cloud Hackathon',
+        'start_date': 'Jan 25, 2026',
+        'end_date': 'Feb 25, 2026',
+        'location': 'Online',
+        'url': 'https://cloud.google.com',
+        'logo': '',
+        'source': 'Sample',
+        'is_online': True,
+        'description': 'Build with Google Cloud Platform. Monthly online hackathon with $10k in prizes.'
+    },
+    {
+        'id': 'sample_6',
+        'name': 'AWS India Innovate',
+        'start_date': 'Feb 1, 2026',
+        'end_date': 'Feb 28, 2026',
+        'location': 'Online',
+        'url': 'https://aws.amazon.com',
+        'logo': '',
+        'source': 'Sample',
+        'is_online': True,
+        'description': 'Build innovative solutions using AWS services. Open to students and professionals.'
+    },
+    {
+        'id': 'sample_7',
+        'name': 'Microsoft Imagine Cup India',
+        'start_date': 'Jan 15, 2026',
+        'end_date': 'Mar 15, 2026',
+        'location': 'Online + Finals in Delhi',
+        'url': 'https://imaginecup.microsoft.com',
+        'logo': '',
+        'source': 'Sample',
+        'is_online': True,
+        'description': 'Microsoft\'s premier student technology competition. Win up to $100k and mentorship.'
+    },
+    {
+        'id': 'sample_8',
+        'name': 'HackerEarth Sprint',
+        'start_date': 'Dec 23, 2025',
+        'end_date': 'Dec 30, 2025',
+        'location': 'Online',
+        'url': 'https://www.hackerearth.com',
+        'logo': '',
+        'source': 'Sample',
+        'is_online': True,
+        'description': 'Week-long coding sprint with hiring opportunities. Solve challenges and get hired.'
+    },
+]
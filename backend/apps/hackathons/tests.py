@@ -0,0 +1,111 @@
+from unittest import mock
+
+import requests
+from django.core.cache import caches
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from . import feed, parsers, sources
+
+
+class StaticSource(sources.HackathonSource):
+    def __init__(self, name, count):
+        self.name, self.count = name, count
+
+    def fetch(self):
+        return [
+            {'id': f'{self.name}_{index}', 'name': f'{self.name} event {index}', 'start_date': f'Jan {index + 1}, 2027'}
+            for index in range(self.count)
+        ]
+
+
+class FailingSource(sources.HackathonSource):
+    def fetch(self):
+        raise requests.ConnectionError('unreachable')
+
+
+class HackathonFeedTest(TestCase):
+    """HackathonListView serves the stored snapshot with validators and per-source health"""
+
+    def setUp(self):
+        caches['dashboard'].clear()
+        self.client = APIClient()
+
+    def test_cold_start_serves_samples_and_refreshes_in_background(self):
+        with mock.patch.object(feed.threading, 'Thread') as thread:
+            data = self.client.get('/api/hackathons/list/').json()
+            self.client.get('/api/hackathons/list/')
+        self.assertEqual(data['hackathons'][0]['source'], 'Sample')
+        thread.assert_called_once()
+        self.assertIs(thread.call_args.kwargs['target'], feed._refresh_and_unlock)
+
+    def test_conditional_get(self):
+        with mock.patch.dict(feed.SOURCES, {'devpost': StaticSource('devpost', 2), 'mlh': StaticSource('mlh', 1), 'devfolio': StaticSource('devfolio', 1)}):
+            feed.refresh_feed()
+            response = self.client.get('/api/hackathons/list/')
+        self.assertEqual(response.json()['count'], 4)
+        self.assertEqual(response.json()['sources']['mlh']['status'], 'ok')
+
+        with mock.patch.dict(feed.SOURCES, {name: FailingSource() for name in feed.SOURCES}):
+            cached = self.client.get('/api/hackathons/list/', HTTP_IF_NONE_MATCH=response['ETag'])
+            since = self.client.get('/api/hackathons/list/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(since.status_code, 304)
+
+    def test_validators_ignore_refresh_timing(self):
+        sources_ = {'devpost': StaticSource('devpost', 2), 'mlh': StaticSource('mlh', 1), 'devfolio': StaticSource('devfolio', 1)}
+        with mock.patch.dict(feed.SOURCES, sources_):
+            first = feed.refresh_feed()
+            second = feed.refresh_feed()
+        self.assertEqual(second['etag'], first['etag'])
+        self.assertEqual(second['modified_at'], first['modified_at'])
+
+        with mock.patch.dict(feed.SOURCES, dict(sources_, mlh=StaticSource('mlh', 2))):
+            third = feed.refresh_feed()
+        self.assertNotEqual(third['etag'], first['etag'])
+        self.assertGreater(third['modified_at'], first['modified_at'])
+
+    def test_failed_source_keeps_last_items(self):
+        with mock.patch.dict(feed.SOURCES, {'devpost': StaticSource('devpost', 2), 'mlh': StaticSource('mlh', 3), 'devfolio': StaticSource('devfolio', 0)}):
+            feed.refresh_feed()
+        with mock.patch.dict(feed.SOURCES, {'devpost': StaticSource('devpost', 1), 'mlh': FailingSource(), 'devfolio': StaticSource('devfolio', 0)}):
+            with self.assertLogs('apps.hackathons.feed', 'WARNING'):
+                snapshot = feed.refresh_feed()
+
+        mlh = snapshot['sources']['mlh']
+        self.assertEqual((mlh['status'], mlh['count'], mlh['stale']), ('error', 3, True))
+        self.assertIn('ConnectionError', mlh['error'])
+        self.assertEqual(len(snapshot['hackathons']), 4)
+
+
+class HackathonSourceParsingTest(TestCase):
+    """Adapters parse the offline fixtures identically on every installed parser backend"""
+
+    def test_fixtures_parse_on_every_backend(self):
+        for name, source in sources.SOURCES.items():
+            content = source.load_fixture()
+            expected = source.parse(content, 'html.parser')
+            self.assertEqual(len(expected), sources.MAX_PER_SOURCE)
+            for backend in parsers.available_backends():
+                with self.subTest(source=name, backend=backend):
+                    self.assertEqual(source.parse(content, backend), expected)
+
+        mlh = sources.SOURCES['mlh'].parse(sources.SOURCES['mlh'].load_fixture())[0]
+        self.assertEqual(mlh['name'], 'HackMIT')
+        self.assertTrue(mlh['url'].startswith('https://events.mlh.io/events/'))
+
+    def test_fuzzy_duplicates(self):
+        hackathons = [
+            {'name': 'HackMIT 2026', 'start_date': 'Feb 14 - 16, 2027'},
+            {'name': 'hackmit', 'start_date': 'Feb 15, 2027'},
+            {'name': 'ETHIndia', 'start_date': 'Jan 08 - 10, 2027'},
+            {'name': 'ETHIndia 2026', 'start_date': '2027-01-08T09:00:00+05:30'},
+            {'name': 'Winter Build Hackathon', 'start_date': 'Jan 10 - 17, 2027'},
+            {'name': 'Winter Build', 'start_date': '2027-07-10T10:00:00+05:30'},
+            {'name': 'Code Sprint', 'start_date': 'TBA'},
+            {'name': 'The Code Sprint!', 'start_date': 'Mar 01, 2027'},
+        ]
+        self.assertEqual(
+            [h['name'] for h in sources.remove_duplicates(hackathons)],
+            ['HackMIT 2026', 'ETHIndia', 'Winter Build Hackathon', 'Winter Build', 'Code Sprint']
+        )
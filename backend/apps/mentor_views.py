@@ -4,10 +4,12 @@ This file consolidates mentor review APIs for: CFC, CLT, SRI, IIPC, SCD
 """
 
 from django.contrib.auth.models import User
-from django.db.models import Q, Count, Case, When, Value, IntegerField
+from django.db import transaction
+from django.db.models import Q, Count, Case, When, Value, IntegerField, Exists, OuterRef
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.pagination import CursorPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
@@ -24,7 +26,9 @@ from apps.iipc.models import LinkedInPostVerification
 from apps.iipc.serializers import LinkedInPostVerificationSerializer
 from apps.scd.models import LeetCodeProfile
 from apps.scd.serializers import LeetCodeProfileSerializer
-from apps.dashboard.models import Notification, Message, MessageThread
+from apps.profiles.models import UserProfile
+from apps.dashboard.models import Notification, Message, MessageThread, UnreadCounter
+from apps.dashboard import report_engine, stats_cache, student_snapshot
 from apps.dashboard.notifications_serializers import (
     NotificationSerializer, MessageSerializer, MessageThreadSerializer, MessageCreateSerializer
 )
@@ -537,9 +541,11 @@ def review_submission(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
+    # Only submissions of students the reviewer is responsible for
+    reviewable = UserProfile.objects.reviewable_by(request.user).values('user_id')
     try:
-        submission = model_class.objects.get(id=submission_id)
-    except model_class.DoesNotExist:
+        submission = model_class.objects.get(id=submission_id, user_id__in=reviewable)
+    except (model_class.DoesNotExist, ValueError):
         return Response(
             {"error": "Submission not found"},
             status=status.HTTP_404_NOT_FOUND
@@ -622,6 +628,234 @@ def review_submission(request):
     })
 
 
+# Submission type -> (model, pillar) for batched reviews
+REVIEW_SUBMISSION_TYPES = {
+    'hackathon': (HackathonSubmission, 'cfc'),
+    'bmc': (BMCVideoSubmission, 'cfc'),
+    'internship': (InternshipSubmission, 'cfc'),
+    'genai': (GenAIProjectSubmission, 'cfc'),
+    'clt': (CLTSubmission, 'clt'),
+    'linkedin': (LinkedInPostVerification, 'iipc'),
+    'leetcode': (LeetCodeProfile, 'scd'),
+}
+
+# Upper bound on entries accepted by bulk_review_submissions
+MAX_BULK_REVIEWS = 500
+
+
+def _review_field_names(model_class):
+    """Return (comment_field, reviewer_field) used by a submission model"""
+    field_names = {f.name for f in model_class._meta.get_fields()}
+    comment_field = 'reviewer_comments' if 'reviewer_comments' in field_names else 'review_comments'
+    reviewer_field = 'reviewed_by' if 'reviewed_by' in field_names else 'reviewer'
+    return comment_field, reviewer_field
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_review_submissions(request):
+    """
+    Review many submissions (approve/reject/resubmit) in one call
+    
+    All entries are applied in a single transaction: submissions are written
+    with one bulk_update per model, notifications are bulk-inserted, and
+    season score / episode recomputation runs once per affected student.
+    Entries that don't exist or belong to students outside the reviewer's
+    scope (UserProfile.objects.reviewable_by) are skipped and listed in
+    'skipped'.
+    
+    Body:
+        - reviews: list of
+            {
+                "submission_type": hackathon, bmc, internship, genai, clt, linkedin, leetcode,
+                "submission_id": ID of the submission,
+                "action": approve, reject, or resubmit,
+                "comment": reviewer comment (required for reject/resubmit)
+            }
+    """
+    from apps.gamification.models import Season
+    from apps.gamification.services import EpisodeService
+    
+    if not is_mentor(request.user):
+        return Response(
+            {"error": "You don't have permission to access this resource"},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    reviews = request.data.get('reviews')
+    if not isinstance(reviews, list) or not reviews:
+        return Response(
+            {"error": "reviews must be a non-empty list"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    if len(reviews) > MAX_BULK_REVIEWS:
+        return Response(
+            {"error": f"At most {MAX_BULK_REVIEWS} reviews can be submitted per request"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    status_map = {
+        'approve': 'approved',
+        'reject': 'rejected',
+        'resubmit': 'under_review'
+    }
+    
+    # Validate every entry before touching the database
+    entries = []
+    seen = set()
+    for index, review in enumerate(reviews):
+        if not isinstance(review, dict):
+            return Response(
+                {"error": f"reviews[{index}]: must be an object"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        submission_type = review.get('submission_type')
+        action = review.get('action')
+        comment = review.get('comment', '') or ''
+        
+        try:
+            submission_id = int(review.get('submission_id'))
+        except (TypeError, ValueError):
+            return Response(
+                {"error": f"reviews[{index}]: submission_id must be an integer"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if submission_type not in REVIEW_SUBMISSION_TYPES:
+            return Response(
+                {"error": f"reviews[{index}]: invalid submission type"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if action not in status_map:
+            return Response(
+                {"error": f"reviews[{index}]: invalid action"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if action in ['reject', 'resubmit'] and not comment:
+            return Response(
+                {"error": f"reviews[{index}]: comment is required for rejection or resubmission request"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if (submission_type, submission_id) in seen:
+            return Response(
+                {"error": f"reviews[{index}]: duplicate entry for {submission_type} #{submission_id}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        seen.add((submission_type, submission_id))
+        
+        entries.append((submission_type, submission_id, action, comment))
+    
+    notification_type_map = {
+        'approve': 'submission_approved',
+        'reject': 'submission_rejected',
+        'resubmit': 'submission_resubmit'
+    }
+    
+    now = timezone.now()
+    results = []
+    notifications = []
+    approved_student_ids = set()
+    
+    with transaction.atomic():
+        # One locking fetch per submission model
+        ids_by_type = {}
+        for submission_type, submission_id, _, _ in entries:
+            ids_by_type.setdefault(submission_type, []).append(submission_id)
+        
+        reviewable = UserProfile.objects.reviewable_by(request.user).values('user_id')
+        submissions_by_type = {}
+        for submission_type, ids in ids_by_type.items():
+            model_class, _ = REVIEW_SUBMISSION_TYPES[submission_type]
+            submissions_by_type[submission_type] = (
+                model_class.objects.select_for_update(of=('self',))
+                .filter(user_id__in=reviewable).in_bulk(ids)
+            )
+        
+        updated_by_type = {}
+        skipped = []
+        for submission_type, submission_id, action, comment in entries:
+            model_class, pillar = REVIEW_SUBMISSION_TYPES[submission_type]
+            comment_field, reviewer_field = _review_field_names(model_class)
+            submission = submissions_by_type[submission_type].get(submission_id)
+            if submission is None:
+                # Missing and out-of-scope look the same, so ids of other students' work don't leak
+                skipped.append({'submission_type': submission_type, 'submission_id': submission_id})
+                continue
+            
+            submission.status = status_map[action]
+            setattr(submission, comment_field, comment)
+            setattr(submission, reviewer_field, request.user)
+            submission.reviewed_at = now
+            if hasattr(submission, 'updated_at'):
+                submission.updated_at = now
+            updated_by_type.setdefault(submission_type, []).append(submission)
+            
+            if action == 'approve':
+                approved_student_ids.add(submission.user_id)
+            
+            title_map = {
+                'approve': f'✅ Submission Approved - {pillar.upper()}',
+                'reject': f'❌ Submission Rejected - {pillar.upper()}',
+                'resubmit': f'🔄 Resubmission Requested - {pillar.upper()}'
+            }
+            message_map = {
+                'approve': f'Your {submission_type} submission has been approved by your mentor!',
+                'reject': f'Your {submission_type} submission needs revision. Please review the feedback.',
+                'resubmit': f'Your mentor has requested a resubmission for your {submission_type}.'
+            }
+            
+            notifications.append(Notification(
+                recipient_id=submission.user_id,
+                sender=request.user,
+                notification_type=notification_type_map[action],
+                priority='high' if action == 'reject' else 'normal',
+                title=title_map[action],
+                message=f"{message_map[action]} {comment}".strip(),
+                related_pillar=pillar,
+                related_submission_type=submission_type,
+                related_submission_id=submission_id,
+                action_url=f"/{pillar}"
+            ))
+            
+            results.append({
+                'submission_type': submission_type,
+                'submission_id': submission_id,
+                'status': submission.status,
+            })
+        
+        for submission_type, submissions in updated_by_type.items():
+            model_class, _ = REVIEW_SUBMISSION_TYPES[submission_type]
+            comment_field, reviewer_field = _review_field_names(model_class)
+            update_fields = ['status', comment_field, reviewer_field, 'reviewed_at']
+            # bulk_update skips auto_now, so updated_at is written explicitly
+            if hasattr(submissions[0], 'updated_at'):
+                update_fields.append('updated_at')
+            model_class.objects.bulk_update(submissions, update_fields)
+        
+        # bulk_update sends no post_save, so drop the students' dashboard stats here
+        stats_cache.invalidate(*(notification.recipient_id for notification in notifications))
+        
+        Notification.objects.bulk_create(notifications)
+        
+        # Recompute gamification once per student with new approvals
+        if approved_student_ids:
+            current_season = Season.objects.filter(is_active=True).first()
+            EpisodeService.recompute_students(approved_student_ids, current_season)
+    
+    return Response({
+        'message': f'{len(results)} submissions reviewed successfully',
+        'reviewed': len(results),
+        'notifications_created': len(notifications),
+        'results': results,
+        'skipped': skipped
+    })
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_submission_detail(request, pillar, submission_type, submission_id):
@@ -687,34 +921,34 @@ def get_mentor_students(request):
             status=status.HTTP_403_FORBIDDEN
         )
     
-    # Get mentor's assigned students
+    # Get mentor's assigned students and their submission snapshots (one query for all)
     assigned_students = request.user.mentored_students.all().select_related('user')
+    snapshots = student_snapshot.student_snapshots([profile.user_id for profile in assigned_students])
     
     students_data = []
     for profile in assigned_students:
         student = profile.user
+        snapshot = snapshots[student.id]
         
-        # Get submission stats for each pillar
-        clt_submissions = CLTSubmission.objects.filter(user=student)
+        # CLT stats
+        clt_count, clt_statuses, clt_latest = student_snapshot.source_counts(snapshot, 'clt')
         clt_stats = {
-            'status': 'completed' if clt_submissions.filter(status='approved').exists() 
-                     else 'pending' if clt_submissions.filter(status__in=['draft', 'submitted', 'under_review']).exists()
+            'status': 'completed' if clt_statuses.get('approved')
+                     else 'pending' if any(clt_statuses.get(s) for s in report_engine.PENDING_STATUSES)
                      else 'not-started',
-            'count': clt_submissions.count(),
-            'lastSubmission': clt_submissions.order_by('-created_at').first().created_at if clt_submissions.exists() else None
+            'count': clt_count,
+            'lastSubmission': clt_latest
         }
         
         # CFC stats (all types combined)
-        hackathons = HackathonSubmission.objects.filter(user=student)
-        bmc_videos = BMCVideoSubmission.objects.filter(user=student)
-        internships = InternshipSubmission.objects.filter(user=student)
-        genai_projects = GenAIProjectSubmission.objects.filter(user=student)
-        
-        cfc_total = hackathons.count() + bmc_videos.count() + internships.count() + genai_projects.count()
-        cfc_approved = (hackathons.filter(status='approved').count() + 
-                       bmc_videos.filter(status='approved').count() +
-                       internships.filter(status='approved').count() +
-                       genai_projects.filter(status='approved').count())
+        cfc_total = cfc_approved = 0
+        cfc_latest = None
+        for source in student_snapshot.CFC_SOURCES:
+            total, statuses, latest = student_snapshot.source_counts(snapshot, source)
+            cfc_total += total
+            cfc_approved += statuses.get('approved', 0)
+            if latest and (cfc_latest is None or latest > cfc_latest):
+                cfc_latest = latest
         cfc_pending = cfc_total - cfc_approved
         
         cfc_stats = {
@@ -722,31 +956,28 @@ def get_mentor_students(request):
                      else 'pending' if cfc_pending > 0
                      else 'not-started',
             'count': cfc_total,
-            'lastSubmission': max(
-                [s.created_at for s in list(hackathons) + list(bmc_videos) + list(internships) + list(genai_projects)],
-                default=None
-            )
+            'lastSubmission': cfc_latest
         }
         
         # IIPC stats
-        iipc_posts = LinkedInPostVerification.objects.filter(user=student)
+        posts_count, posts_statuses, posts_latest = student_snapshot.source_counts(snapshot, 'posts')
         iipc_stats = {
-            'status': 'completed' if iipc_posts.filter(status='verified').exists()
-                     else 'pending' if iipc_posts.filter(status='pending').exists()
+            'status': 'completed' if posts_statuses.get('verified')
+                     else 'pending' if posts_statuses.get('pending')
                      else 'not-started',
-            'count': iipc_posts.count(),
-            'lastSubmission': iipc_posts.order_by('-created_at').first().created_at if iipc_posts.exists() else None
+            'count': posts_count,
+            'lastSubmission': posts_latest
         }
         
         # SCD stats
-        try:
-            leetcode_profile = LeetCodeProfile.objects.get(user=student)
+        leetcode = snapshot['leetcode']
+        if student_snapshot.source_counts(snapshot, 'leetcode')[0]:
             scd_stats = {
-                'status': 'completed' if leetcode_profile.monthly_problems_count >= 10 else 'pending',
-                'count': leetcode_profile.total_solved,
-                'lastSubmission': leetcode_profile.last_synced
+                'status': 'completed' if leetcode['monthly_problems'] >= 10 else 'pending',
+                'count': leetcode['best_solved'],
+                'lastSubmission': leetcode['last_synced']
             }
-        except LeetCodeProfile.DoesNotExist:
+        else:
             scd_stats = {
                 'status': 'not-started',
                 'count': 0,
@@ -806,7 +1037,7 @@ def get_notifications(request):
     
     return Response({
         'notifications': serializer.data,
-        'unread_count': Notification.objects.filter(recipient=request.user, is_read=False).count(),
+        'unread_count': UnreadCounter.get_counts(request.user.id)['notifications_unread'],
         'total': notifications.count()
     })
 
@@ -830,13 +1061,7 @@ def mark_notification_read(request, notification_id):
 @permission_classes([IsAuthenticated])
 def mark_all_notifications_read(request):
     """Mark all notifications as read for current user"""
-    updated = Notification.objects.filter(
-        recipient=request.user,
-        is_read=False
-    ).update(
-        is_read=True,
-        read_at=timezone.now()
-    )
+    updated = Notification.objects.filter(recipient=request.user).mark_read()
     
     return Response({
         'message': f'{updated} notifications marked as read',
@@ -861,19 +1086,29 @@ def delete_notification(request, notification_id):
 
 # ============= MESSAGING ENDPOINTS =============
 
+class ThreadMessagePagination(CursorPagination):
+    """Keyset pagination over (thread, created_at, id), newest first"""
+    page_size = 50
+    page_size_query_param = 'limit'
+    max_page_size = 200
+    ordering = ('-created_at', '-id')
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_message_threads(request):
     """Get all message threads for the current user"""
     threads = MessageThread.objects.filter(
         Q(participant1=request.user) | Q(participant2=request.user)
-    ).select_related('participant1', 'participant2', 'last_message')
+    ).select_related(
+        'participant1', 'participant2', 'last_message__sender', 'last_message__recipient'
+    )
     
     serializer = MessageThreadSerializer(threads, many=True, context={'request': request})
     
     return Response({
         'threads': serializer.data,
-        'total': threads.count()
+        'total': len(serializer.data)
     })
 
 
@@ -881,14 +1116,11 @@ def get_message_threads(request):
 @permission_classes([IsAuthenticated])
 def get_thread_messages(request, user_id):
     """
-    Get all messages in a thread with a specific user
+    Get messages in a thread with a specific user, newest first
     Query params:
-        - limit: number of messages to return (default: 50)
-        - offset: offset for pagination (default: 0)
+        - limit: number of messages to return (default: 50, max: 200)
+        - cursor: opaque cursor from a previous response's next/previous link
     """
-    limit = int(request.GET.get('limit', 50))
-    offset = int(request.GET.get('offset', 0))
-    
     try:
         other_user = User.objects.get(id=user_id)
     except User.DoesNotExist:
@@ -897,41 +1129,26 @@ def get_thread_messages(request, user_id):
             status=status.HTTP_404_NOT_FOUND
         )
     
-    # Get or create thread
-    thread = MessageThread.objects.filter(
-        (Q(participant1=request.user) & Q(participant2=other_user)) |
-        (Q(participant1=other_user) & Q(participant2=request.user))
-    ).first()
-    
-    if not thread:
-        # Create new thread
-        thread = MessageThread.objects.create(
-            participant1=request.user,
-            participant2=other_user
-        )
-    
-    # Get messages
-    messages = Message.objects.filter(
-        (Q(sender=request.user) & Q(recipient=other_user)) |
-        (Q(sender=other_user) & Q(recipient=request.user))
-    ).order_by('-created_at')[offset:offset+limit]
+    thread = MessageThread.get_or_create_between(request.user, other_user)
     
-    # Mark messages as read
-    Message.objects.filter(
-        sender=other_user,
-        recipient=request.user,
-        is_read=False
-    ).update(is_read=True, read_at=timezone.now(), status='read')
+    paginator = ThreadMessagePagination()
+    messages = paginator.paginate_queryset(
+        Message.objects.filter(thread=thread).select_related('sender', 'recipient'),
+        request
+    )
     
-    # Reset unread count for current user
-    thread.reset_unread(request.user)
+    # Only touch read state when there is something unread
+    if thread.get_unread_count(request.user):
+        thread.mark_read_by(request.user)
     
     serializer = MessageSerializer(messages, many=True)
     
     return Response({
         'messages': serializer.data,
         'thread_id': thread.id,
-        'total': messages.count()
+        'total': len(messages),
+        'next': paginator.get_next_link(),
+        'previous': paginator.get_previous_link()
     })
 
 
@@ -958,47 +1175,36 @@ def send_message(request):
         )
     
     data = serializer.validated_data
-    recipient = User.objects.get(id=data['recipient_id'])
-    
-    # Create message
-    message = Message.objects.create(
-        sender=request.user,
-        recipient=recipient,
-        subject=data.get('subject', ''),
-        message=data['message'],
-        related_pillar=data.get('related_pillar'),
-        related_submission_type=data.get('related_submission_type'),
-        related_submission_id=data.get('related_submission_id'),
-        parent_message=Message.objects.get(id=data['parent_message_id']) if data.get('parent_message_id') else None
-    )
-    
-    # Get or create thread
-    thread = MessageThread.objects.filter(
-        (Q(participant1=request.user) & Q(participant2=recipient)) |
-        (Q(participant1=recipient) & Q(participant2=request.user))
-    ).first()
+    recipient = data['recipient']
     
-    if not thread:
-        thread = MessageThread.objects.create(
-            participant1=request.user,
-            participant2=recipient
+    with transaction.atomic():
+        thread = MessageThread.get_or_create_between(request.user, recipient)
+        
+        # Create message
+        message = Message.objects.create(
+            sender=request.user,
+            recipient=recipient,
+            thread=thread,
+            subject=data.get('subject', ''),
+            message=data['message'],
+            related_pillar=data.get('related_pillar'),
+            related_submission_type=data.get('related_submission_type'),
+            related_submission_id=data.get('related_submission_id'),
+            parent_message=data['parent_message']
+        )
+        
+        # Update thread preview and recipient's unread count
+        thread.record_message(message)
+        
+        # Create notification for recipient
+        Notification.objects.create(
+            recipient=recipient,
+            sender=request.user,
+            notification_type='message',
+            title=f'💬 New Message from {request.user.get_full_name() or request.user.username}',
+            message=data['message'][:100] + ('...' if len(data['message']) > 100 else ''),
+            action_url='/messages'
         )
-    
-    # Update thread
-    thread.last_message = message
-    thread.last_message_at = timezone.now()
-    thread.increment_unread(recipient)  # Increment unread for recipient
-    thread.save()
-    
-    # Create notification for recipient
-    Notification.objects.create(
-        recipient=recipient,
-        sender=request.user,
-        notification_type='message',
-        title=f'💬 New Message from {request.user.get_full_name() or request.user.username}',
-        message=data['message'][:100] + ('...' if len(data['message']) > 100 else ''),
-        action_url='/messages'
-    )
     
     return Response({
         'message': 'Message sent successfully',
@@ -1010,26 +1216,23 @@ def send_message(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_unread_counts(request):
-    """Get unread counts for notifications and messages"""
-    notifications_count = Notification.objects.filter(
-        recipient=request.user,
-        is_read=False
-    ).count()
-    
-    messages_count = Message.objects.filter(
-        recipient=request.user,
-        is_read=False
-    ).count()
+    """Get unread counts for notifications, messages and announcements from the counter row"""
+    counts = UnreadCounter.get_counts(request.user.id)
+    notifications_count = counts['notifications_unread']
+    messages_count = counts['messages_unread']
     
     return Response({
         'notifications': notifications_count,
         'messages': messages_count,
+        'announcements': counts['announcements_unread'],
         'total': notifications_count + messages_count
     })
 
 
 # ============= ANNOUNCEMENT ENDPOINTS =============
 
+MAX_BULK_ANNOUNCEMENT_READS = 500
+
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
 def announcements(request):
@@ -1121,7 +1324,7 @@ def announcement_detail(request, announcement_id):
 @permission_classes([IsAuthenticated])
 def student_announcements(request):
     """Get all announcements for the current student from their mentor"""
-    from apps.dashboard.models import Announcement
+    from apps.dashboard.models import Announcement, AnnouncementRead
     from apps.profiles.models import UserProfile
     from apps.dashboard.notifications_serializers import AnnouncementSerializer
     
@@ -1134,7 +1337,13 @@ def student_announcements(request):
                 'unread_count': 0
             })
         
-        announcements_list = Announcement.objects.filter(mentor=student_profile.assigned_mentor).order_by('-created_at')
+        announcements_list = Announcement.objects.filter(
+            mentor=student_profile.assigned_mentor
+        ).select_related('mentor').annotate(
+            user_has_read=Exists(
+                AnnouncementRead.objects.filter(announcement=OuterRef('pk'), user=request.user)
+            )
+        ).order_by('-created_at')
         serializer = AnnouncementSerializer(announcements_list, many=True, context={'request': request})
         
         # Count unread announcements
@@ -1156,43 +1365,75 @@ def student_announcements(request):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def mark_announcement_read(request, announcement_id):
-    """Mark an announcement as read for the current student"""
-    from apps.dashboard.models import Announcement, AnnouncementRead
+    """Mark an announcement as read for the current student (only their own mentor's announcements)"""
+    from apps.dashboard.models import Announcement
+    from apps.profiles.models import UserProfile
     
-    try:
-        announcement = Announcement.objects.get(id=announcement_id)
-        
-        # Create or get the read record
-        read_record, created = AnnouncementRead.objects.get_or_create(
-            announcement=announcement,
-            user=request.user
-        )
-        
-        return Response({
-            'success': True,
-            'message': 'Announcement marked as read',
-            'already_read': not created
-        })
-    except Announcement.DoesNotExist:
+    mentor_id = UserProfile.objects.filter(user=request.user).values_list('assigned_mentor_id', flat=True).first()
+    if not mentor_id or not Announcement.objects.filter(id=announcement_id, mentor_id=mentor_id).exists():
         return Response(
             {'error': 'Announcement not found'},
             status=status.HTTP_404_NOT_FOUND
         )
-    except Exception as e:
-        return Response(
-            {'error': str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    
+    marked = Announcement.mark_read_for(request.user, [announcement_id])
+    return Response({
+        'success': True,
+        'message': 'Announcement marked as read',
+        'already_read': not marked
+    })
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def mark_announcements_read(request):
+    """
+    Mark many announcements as read in one call
+    Body: {"announcement_ids": [1, 2, ...]} or {"all": true} for every announcement from the student's mentor
+    """
+    from apps.dashboard.models import Announcement
+    from apps.profiles.models import UserProfile
+    
+    mentor_id = UserProfile.objects.filter(user=request.user).values_list('assigned_mentor_id', flat=True).first()
+    if not mentor_id:
+        return Response({'success': True, 'marked_count': 0, 'marked_ids': []})
+    
+    visible = Announcement.objects.filter(mentor_id=mentor_id)
+    if request.data.get('all') is True:
+        announcement_ids = list(visible.values_list('id', flat=True)[:MAX_BULK_ANNOUNCEMENT_READS])
+    else:
+        announcement_ids = request.data.get('announcement_ids')
+        if not isinstance(announcement_ids, list) or not announcement_ids:
+            return Response(
+                {'error': 'announcement_ids must be a non-empty list'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(announcement_ids) > MAX_BULK_ANNOUNCEMENT_READS:
+            return Response(
+                {'error': f'Cannot mark more than {MAX_BULK_ANNOUNCEMENT_READS} announcements at once'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            announcement_ids = [int(announcement_id) for announcement_id in announcement_ids]
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'announcement_ids must contain integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        announcement_ids = list(visible.filter(id__in=announcement_ids).values_list('id', flat=True))
+    
+    marked = Announcement.mark_read_for(request.user, announcement_ids)
+    return Response({
+        'success': True,
+        'marked_count': len(marked),
+        'marked_ids': marked
+    })
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_student_monthly_report(request, student_id):
     """Get monthly report for a specific student (Mentor view)"""
-    from datetime import datetime
-    from apps.clt.models import CLTSubmission
-    from apps.cfc.models import HackathonSubmission, BMCVideoSubmission, InternshipSubmission, GenAIProjectSubmission
-    from apps.iipc.models import LinkedInPostVerification, LinkedInConnectionVerification
     from apps.scd.models import LeetCodeProfile
     
     # Check if user is mentor
@@ -1216,13 +1457,6 @@ def get_student_monthly_report(request, student_id):
         year = int(year)
         student = User.objects.get(id=student_id)
         
-        # Create date range
-        start_date = datetime(year, month, 1)
-        if month == 12:
-            end_date = datetime(year + 1, 1, 1)
-        else:
-            end_date = datetime(year, month + 1, 1)
-        
         # Monthly task requirements
         MONTHLY_REQUIREMENTS = {
             'clt': 1,
@@ -1232,34 +1466,20 @@ def get_student_monthly_report(request, student_id):
             'scd': 1,
         }
         
+        # One grouped query per pillar table (or a cache hit), see report_engine
+        pillars = report_engine.monthly_reports(student, (year, month), (year, month))[0]['pillars']
+        
         # Calculate CLT stats
-        clt_submissions = CLTSubmission.objects.filter(
-            user=student,
-            created_at__gte=start_date,
-            created_at__lt=end_date
+        clt_completed = pillars['clt']['completed']
+        
+        # Calculate CFC stats (internships are optional)
+        cfc_breakdown = pillars['cfc']['breakdown']
+        cfc_completed = sum(
+            cfc_breakdown[source]['completed'] for source in ['hackathons', 'bmc_videos', 'genai_projects']
         )
-        clt_completed = clt_submissions.filter(status='approved').count()
-        
-        # Calculate CFC stats
-        cfc_hackathons = HackathonSubmission.objects.filter(
-            user=student, created_at__gte=start_date, created_at__lt=end_date, status='approved'
-        ).count()
-        cfc_bmc = BMCVideoSubmission.objects.filter(
-            user=student, created_at__gte=start_date, created_at__lt=end_date, status='approved'
-        ).count()
-        cfc_genai = GenAIProjectSubmission.objects.filter(
-            user=student, created_at__gte=start_date, created_at__lt=end_date, status='approved'
-        ).count()
-        cfc_completed = cfc_hackathons + cfc_bmc + cfc_genai
         
         # Calculate IIPC stats
-        iipc_posts = LinkedInPostVerification.objects.filter(
-            user=student, created_at__gte=start_date, created_at__lt=end_date, status='approved'
-        ).count()
-        iipc_connections = LinkedInConnectionVerification.objects.filter(
-            user=student, created_at__gte=start_date, created_at__lt=end_date, status='approved'
-        ).count()
-        iipc_completed = iipc_posts + iipc_connections
+        iipc_completed = pillars['iipc']['completed']
         
         # Calculate SCD stats
         scd_profile = LeetCodeProfile.objects.filter(user=student).first()
@@ -1320,7 +1540,6 @@ def get_student_monthly_report(request, student_id):
 def get_student_available_months(request, student_id):
     """Get available months for a student's monthly reports (Mentor view)"""
     from datetime import datetime
-    from apps.clt.models import CLTSubmission
     
     # Check if user is mentor
     if not is_mentor(request.user):
@@ -1332,10 +1551,10 @@ def get_student_available_months(request, student_id):
     try:
         student = User.objects.get(id=student_id)
         
-        # Get all months where student has any submissions
-        submissions = CLTSubmission.objects.filter(user=student).order_by('created_at')
+        # Get all months where student has any submissions (one UNION query)
+        months_sorted = report_engine.available_months(student)
         
-        if not submissions.exists():
+        if not months_sorted:
             # Default to current month if no submissions
             now = datetime.now()
             return Response({
@@ -1346,13 +1565,7 @@ def get_student_available_months(request, student_id):
                 }]
             })
         
-        # Get unique year-month combinations
-        months_set = set()
-        for sub in submissions:
-            months_set.add((sub.created_at.year, sub.created_at.month))
-        
-        # Sort and format
-        months_sorted = sorted(months_set, reverse=True)
+        # Format
         available_months = [
             {
                 'month': month,
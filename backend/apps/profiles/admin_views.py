@@ -1,15 +1,63 @@
+from collections import Counter
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from django.contrib.auth.models import User
-from django.db.models import Count, Q
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Lower
+from rest_framework.pagination import PageNumberPagination
 from apps.profiles.models import UserProfile
 from apps.profiles.permissions import IsAdmin
+from apps.dashboard.student_snapshot import pillar_progress, student_snapshot, submission_totals
 from apps.clt.models import CLTSubmission
 from apps.cfc.models import HackathonSubmission, BMCVideoSubmission, InternshipSubmission, GenAIProjectSubmission
 from apps.iipc.models import LinkedInPostVerification, LinkedInConnectionVerification
-from apps.scd.models import LeetCodeProfile
+
+
+# Submission tables counted in the admin campus/floor/student views
+SUBMISSION_MODELS = [
+    CLTSubmission,
+    HackathonSubmission,
+    BMCVideoSubmission,
+    InternshipSubmission,
+    GenAIProjectSubmission,
+    LinkedInPostVerification,
+    LinkedInConnectionVerification,
+]
+PENDING_STATUSES = ['draft', 'submitted', 'under_review']
+
+# ?ordering= values accepted by AdminFloorDetailView for its student list
+STUDENT_ORDERING = {
+    'id': ['id'],
+    'name': [Lower('user__first_name'), Lower('user__last_name'), 'id'],
+    '-name': [Lower('user__first_name').desc(), Lower('user__last_name').desc(), '-id'],
+    'submissions': ['submission_count', 'id'],
+    '-submissions': ['-submission_count', 'id'],
+}
+
+
+def submission_count_annotation():
+    """Total submissions of OuterRef('user') across SUBMISSION_MODELS, one correlated subquery per table"""
+    total = None
+    for model in SUBMISSION_MODELS:
+        count = Coalesce(
+            Subquery(
+                model.objects.filter(user=OuterRef('user')).order_by().values('user')
+                .annotate(c=Count('id')).values('c'),
+                output_field=IntegerField()
+            ),
+            0
+        )
+        total = count if total is None else total + count
+    return total
+
+
+class FloorStudentPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
 
 
 class AdminCampusOverviewView(APIView):
@@ -33,34 +81,29 @@ class AdminCampusOverviewView(APIView):
             floors = []
             campus_name = ''
         
+        # Students and mentors per floor in one grouped query
+        role_counts = Counter()
+        for row in UserProfile.objects.filter(
+            campus=campus, floor__in=floors, role__in=['STUDENT', 'MENTOR']
+        ).values('floor', 'role').annotate(total=Count('id')).order_by():
+            role_counts[(row['floor'], row['role'])] = row['total']
+        
+        # First floor wing per floor (same pick as .first() per floor)
+        floor_wings = {}
+        for floor_wing in UserProfile.objects.filter(
+            role='FLOOR_WING', campus=campus, floor__in=floors
+        ).select_related('user').order_by('id'):
+            floor_wings.setdefault(floor_wing.floor, floor_wing)
+        
+        submission_stats = self._get_floor_submission_stats(campus, floors)
+        
         floor_data = []
         for floor_num in floors:
-            # Get counts for this floor
-            students_count = UserProfile.objects.filter(
-                role='STUDENT',
-                campus=campus,
-                floor=floor_num
-            ).count()
-            
-            mentors_count = UserProfile.objects.filter(
-                role='MENTOR',
-                campus=campus,
-                floor=floor_num
-            ).count()
-            
-            floor_wing = UserProfile.objects.filter(
-                role='FLOOR_WING',
-                campus=campus,
-                floor=floor_num
-            ).select_related('user').first()
-            
+            floor_wing = floor_wings.get(floor_num)
             floor_wing_name = None
             if floor_wing:
                 floor_wing_name = f"{floor_wing.user.first_name} {floor_wing.user.last_name}"
             
-            # Calculate submission stats (placeholder - implement based on your models)
-            submission_stats = self._get_floor_submission_stats(campus, floor_num)
-            
             # Floor name logic: TECH = Floor X, ARTS = Xst/nd/rd Year
             if campus == 'TECH':
                 floor_name = f"Floor {floor_num}"
@@ -76,11 +119,11 @@ class AdminCampusOverviewView(APIView):
             floor_data.append({
                 'floor': floor_num,
                 'floor_name': floor_name,
-                'total_students': students_count,
-                'total_mentors': mentors_count,
+                'total_students': role_counts[(floor_num, 'STUDENT')],
+                'total_mentors': role_counts[(floor_num, 'MENTOR')],
                 'floor_wing': floor_wing_name,
                 'floor_wing_id': floor_wing.user.id if floor_wing else None,
-                'submissions': submission_stats
+                'submissions': submission_stats[floor_num]
             })
         
         return Response({
@@ -89,101 +132,33 @@ class AdminCampusOverviewView(APIView):
             'floors': floor_data
         }, status=status.HTTP_200_OK)
     
-    def _get_floor_submission_stats(self, campus, floor):
-        """Get submission statistics for a floor - real implementation"""
-        # Get all students on this floor
-        students = UserProfile.objects.filter(
-            role='STUDENT',
-            campus=campus,
-            floor=floor
-        ).select_related('user')
-        
-        user_ids = [s.user.id for s in students]
-        
-        total = pending = approved = rejected = 0
-        
-        # CLT
-        try:
-            clt_qs = CLTSubmission.objects.filter(user_id__in=user_ids)
-            total += clt_qs.count()
-            pending += clt_qs.filter(status__in=['draft', 'submitted', 'under_review']).count()
-            approved += clt_qs.filter(status='approved').count()
-            rejected += clt_qs.filter(status='rejected').count()
-        except Exception:
-            pass
-        
-        # CFC - Hackathon
-        try:
-            hack_qs = HackathonSubmission.objects.filter(user_id__in=user_ids)
-            total += hack_qs.count()
-            pending += hack_qs.filter(status__in=['draft', 'submitted', 'under_review']).count()
-            approved += hack_qs.filter(status='approved').count()
-            rejected += hack_qs.filter(status='rejected').count()
-        except Exception:
-            pass
-        
-        # CFC - BMC
-        try:
-            bmc_qs = BMCVideoSubmission.objects.filter(user_id__in=user_ids)
-            total += bmc_qs.count()
-            pending += bmc_qs.filter(status__in=['draft', 'submitted', 'under_review']).count()
-            approved += bmc_qs.filter(status='approved').count()
-            rejected += bmc_qs.filter(status='rejected').count()
-        except Exception:
-            pass
-        
-        # CFC - Internship
-        try:
-            intern_qs = InternshipSubmission.objects.filter(user_id__in=user_ids)
-            total += intern_qs.count()
-            pending += intern_qs.filter(status__in=['draft', 'submitted', 'under_review']).count()
-            approved += intern_qs.filter(status='approved').count()
-            rejected += intern_qs.filter(status='rejected').count()
-        except Exception:
-            pass
-        
-        # CFC - GenAI
-        try:
-            genai_qs = GenAIProjectSubmission.objects.filter(user_id__in=user_ids)
-            total += genai_qs.count()
-            pending += genai_qs.filter(status__in=['draft', 'submitted', 'under_review']).count()
-            approved += genai_qs.filter(status='approved').count()
-            rejected += genai_qs.filter(status='rejected').count()
-        except Exception:
-            pass
-        
-        # IIPC - LinkedIn Post
-        try:
-            post_qs = LinkedInPostVerification.objects.filter(user_id__in=user_ids)
-            total += post_qs.count()
-            pending += post_qs.filter(status__in=['draft', 'submitted', 'under_review']).count()
-            approved += post_qs.filter(status='approved').count()
-            rejected += post_qs.filter(status='rejected').count()
-        except Exception:
-            pass
-        
-        # IIPC - LinkedIn Connection
-        try:
-            conn_qs = LinkedInConnectionVerification.objects.filter(user_id__in=user_ids)
-            total += conn_qs.count()
-            pending += conn_qs.filter(status__in=['draft', 'submitted', 'under_review']).count()
-            approved += conn_qs.filter(status='approved').count()
-            rejected += conn_qs.filter(status='rejected').count()
-        except Exception:
-            pass
-        
-        # Calculate progress percentage
-        progress_percentage = 0
-        if total > 0:
-            progress_percentage = int((approved / total) * 100)
-        
-        return {
-            'total': total,
-            'pending': pending,
-            'approved': approved,
-            'rejected': rejected,
-            'progress_percentage': progress_percentage
-        }
+    def _get_floor_submission_stats(self, campus, floors):
+        """
+        Submission statistics per floor: one grouped (floor, status) query
+        per submission table, joined through the submitter's profile
+        """
+        counts = {floor: Counter() for floor in floors}
+        for model in SUBMISSION_MODELS:
+            rows = model.objects.filter(
+                user__profile__role='STUDENT',
+                user__profile__campus=campus,
+                user__profile__floor__in=floors
+            ).values('user__profile__floor', 'status').annotate(total=Count('id')).order_by()
+            for row in rows:
+                counts[row['user__profile__floor']][row['status']] += row['total']
+        
+        stats = {}
+        for floor, statuses in counts.items():
+            total = sum(statuses.values())
+            approved = statuses['approved']
+            stats[floor] = {
+                'total': total,
+                'pending': sum(statuses[s] for s in PENDING_STATUSES),
+                'approved': approved,
+                'rejected': statuses['rejected'],
+                'progress_percentage': int((approved / total) * 100) if total > 0 else 0
+            }
+        return stats
 
 
 class AdminFloorDetailView(APIView):
@@ -213,54 +188,72 @@ class AdminFloorDetailView(APIView):
             floor=floor
         ).select_related('user').first()
         
-        # Get mentors on this floor
+        # Get mentors on this floor with the number of this floor's students assigned to each
         mentors = UserProfile.objects.filter(
             role='MENTOR',
             campus=campus,
             floor=floor
-        ).select_related('user')
+        ).select_related('user').annotate(
+            student_count=Count(
+                'user__mentored_students',
+                filter=Q(
+                    user__mentored_students__role='STUDENT',
+                    user__mentored_students__campus=campus,
+                    user__mentored_students__floor=floor
+                )
+            )
+        ).order_by('id')
         
-        mentor_data = []
-        for mentor_profile in mentors:
-            # Count students assigned to this mentor on this floor
-            student_count = UserProfile.objects.filter(
-                role='STUDENT',
-                campus=campus,
-                floor=floor,
-                assigned_mentor=mentor_profile.user
-            ).count()
-            
-            mentor_data.append({
+        mentor_data = [
+            {
                 'id': mentor_profile.user.id,
                 'name': f"{mentor_profile.user.first_name} {mentor_profile.user.last_name}",
                 'email': mentor_profile.user.email,
-                'assigned_students': student_count
-            })
+                'assigned_students': mentor_profile.student_count
+            }
+            for mentor_profile in mentors
+        ]
         
-        # Get students
+        # Get students with their submission totals summed in SQL
         students = UserProfile.objects.filter(
             role='STUDENT',
             campus=campus,
             floor=floor
-        ).select_related('user', 'assigned_mentor')
+        )
+        student_stats = students.aggregate(
+            total=Count('id'),
+            unassigned=Count('id', filter=Q(assigned_mentor__isnull=True))
+        )
+        
+        ordering = request.query_params.get('ordering', 'id')
+        if ordering not in STUDENT_ORDERING:
+            return Response({
+                'error': f"ordering must be one of: {', '.join(STUDENT_ORDERING)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        students = students.select_related('user', 'assigned_mentor').annotate(
+            submission_count=submission_count_annotation()
+        ).order_by(*STUDENT_ORDERING[ordering])
+        
+        # Paginate only when asked to, so existing callers keep the full list
+        page = None
+        if request.query_params.get('page') or request.query_params.get('page_size'):
+            paginator = FloorStudentPagination()
+            page = paginator.paginate_queryset(students, request, view=self)
         
         student_data = []
-        for student_profile in students:
+        for student_profile in (page if page is not None else students):
             mentor_name = None
             if student_profile.assigned_mentor:
                 mentor = student_profile.assigned_mentor
                 mentor_name = f"{mentor.first_name} {mentor.last_name}"
             
-            # Get real submission count for this student
-            submission_count = self._get_student_submission_count(student_profile.user)
-            
             student_data.append({
                 'id': student_profile.user.id,
                 'name': f"{student_profile.user.first_name} {student_profile.user.last_name}",
                 'email': student_profile.user.email,
                 'mentor': mentor_name,
                 'mentor_id': student_profile.assigned_mentor.id if student_profile.assigned_mentor else None,
-                'submissions': submission_count
+                'submissions': student_profile.submission_count
             })
         
         floor_wing_data = None
@@ -271,59 +264,27 @@ class AdminFloorDetailView(APIView):
                 'email': floor_wing.user.email
             }
         
-        return Response({
+        data = {
             'campus': campus,
             'floor': floor,
             'floor_wing': floor_wing_data,
             'mentors': mentor_data,
             'students': student_data,
             'stats': {
-                'total_students': len(student_data),
+                'total_students': student_stats['total'],
                 'total_mentors': len(mentor_data),
-                'unassigned_students': sum(1 for s in student_data if not s['mentor_id'])
+                'unassigned_students': student_stats['unassigned']
             }
-        }, status=status.HTTP_200_OK)
-    
-    def _get_student_submission_count(self, user):
-        """Get total submission count for a student across all pillars"""
-        count = 0
-        
-        try:
-            count += CLTSubmission.objects.filter(user=user).count()
-        except Exception:
-            pass
-        
-        try:
-            count += HackathonSubmission.objects.filter(user=user).count()
-        except Exception:
-            pass
-        
-        try:
-            count += BMCVideoSubmission.objects.filter(user=user).count()
-        except Exception:
-            pass
-        
-        try:
-            count += InternshipSubmission.objects.filter(user=user).count()
-        except Exception:
-            pass
-        
-        try:
-            count += GenAIProjectSubmission.objects.filter(user=user).count()
-        except Exception:
-            pass
-        
-        try:
-            count += LinkedInPostVerification.objects.filter(user=user).count()
-        except Exception:
-            pass
-        
-        try:
-            count += LinkedInConnectionVerification.objects.filter(user=user).count()
-        except Exception:
-            pass
-        
-        return count
+        }
+        if page is not None:
+            data['pagination'] = {
+                'count': paginator.page.paginator.count,
+                'page': paginator.page.number,
+                'total_pages': paginator.page.paginator.num_pages,
+                'next': paginator.get_next_link(),
+                'previous': paginator.get_previous_link()
+            }
+        return Response(data, status=status.HTTP_200_OK)
 
 
 class AdminAssignFloorWingView(APIView):
@@ -414,7 +375,7 @@ class AdminStudentDetailView(APIView):
     
     def get(self, request, student_id):
         try:
-            user = User.objects.get(id=student_id)
+            user = User.objects.select_related('profile', 'profile__assigned_mentor').get(id=student_id)
             
             # Check if user has profile
             try:
@@ -437,19 +398,19 @@ class AdminStudentDetailView(APIView):
             except Exception as e:
                 print(f"Error getting mentor info: {e}")
             
-            # Get pillar progress
+            # Pillar progress and submission counts from one cached snapshot
             pillar_details = {'overall': 0, 'pillars': {}}
-            try:
-                pillar_details = self._get_pillar_progress(profile)
-            except Exception as e:
-                print(f"Error getting pillar progress: {e}")
-            
-            # Get submission counts
             submission_stats = {'total': 0, 'approved': 0, 'pending': 0, 'rejected': 0}
             try:
-                submission_stats = self._get_submission_stats(profile)
+                snapshot = student_snapshot(user)
+                progress = pillar_progress(snapshot)
+                pillar_details = {
+                    'overall': progress['overall'],
+                    'pillars': {pillar.upper(): value for pillar, value in progress['pillars'].items()}
+                }
+                submission_stats = submission_totals(snapshot)
             except Exception as e:
-                print(f"Error getting submission stats: {e}")
+                print(f"Error getting student snapshot: {e}")
             
             # Get campus name safely
             campus_name = 'N/A'
@@ -493,140 +454,6 @@ class AdminStudentDetailView(APIView):
                 'error': f'Error loading student details: {str(e)}'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
-    def _get_pillar_progress(self, profile):
-        """Calculate pillar progress - real implementation"""
-        user = profile.user
-        pillar_percentages = {}
-        
-        # CFC - 4 tasks (hackathon, BMC, internship, GenAI)
-        try:
-            cfc_completed = (
-                HackathonSubmission.objects.filter(user=user, status='approved').count() +
-                BMCVideoSubmission.objects.filter(user=user, status='approved').count() +
-                InternshipSubmission.objects.filter(user=user, status='approved').count() +
-                GenAIProjectSubmission.objects.filter(user=user, status='approved').count()
-            )
-            pillar_percentages['CFC'] = min(100, int((cfc_completed / 4) * 100))
-        except Exception:
-            pillar_percentages['CFC'] = 0
-        
-        # CLT - 1 certificate
-        try:
-            clt_completed = CLTSubmission.objects.filter(user=user, status='approved').count()
-            pillar_percentages['CLT'] = min(100, clt_completed * 100)
-        except Exception:
-            pillar_percentages['CLT'] = 0
-        
-        # IIPC - 2 tasks (LinkedIn post + connection)
-        try:
-            iipc_completed = (
-                LinkedInPostVerification.objects.filter(user=user, status='approved').count() +
-                LinkedInConnectionVerification.objects.filter(user=user, status='approved').count()
-            )
-            pillar_percentages['IIPC'] = min(100, int((iipc_completed / 2) * 100))
-        except Exception:
-            pillar_percentages['IIPC'] = 0
-        
-        # SCD - 1 LeetCode profile with 10+ problems
-        try:
-            scd_profile = LeetCodeProfile.objects.filter(user=user, total_solved__gte=10).exists()
-            pillar_percentages['SCD'] = 100 if scd_profile else 0
-        except Exception:
-            pillar_percentages['SCD'] = 0
-        
-        # SRI - not implemented yet
-        pillar_percentages['SRI'] = 0
-        
-        # Calculate overall progress
-        overall = int(sum(pillar_percentages.values()) / len(pillar_percentages)) if pillar_percentages else 0
-        
-        return {
-            'overall': overall,
-            'pillars': pillar_percentages
-        }
-    
-    def _get_submission_stats(self, profile):
-        """Get submission statistics - real implementation"""
-        user = profile.user
-        total = approved = pending = rejected = 0
-        
-        try:
-            # CLT
-            clt_qs = CLTSubmission.objects.filter(user=user)
-            total += clt_qs.count()
-            approved += clt_qs.filter(status='approved').count()
-            pending += clt_qs.filter(status__in=['draft', 'submitted', 'under_review']).count()
-            rejected += clt_qs.filter(status='rejected').count()
-        except Exception:
-            pass
-        
-        try:
-            # CFC - Hackathon
-            hack_qs = HackathonSubmission.objects.filter(user=user)
-            total += hack_qs.count()
-            approved += hack_qs.filter(status='approved').count()
-            pending += hack_qs.filter(status__in=['draft', 'submitted', 'under_review']).count()
-            rejected += hack_qs.filter(status='rejected').count()
-        except Exception:
-            pass
-        
-        try:
-            # CFC - BMC
-            bmc_qs = BMCVideoSubmission.objects.filter(user=user)
-            total += bmc_qs.count()
-            approved += bmc_qs.filter(status='approved').count()
-            pending += bmc_qs.filter(status__in=['draft', 'submitted', 'under_review']).count()
-            rejected += bmc_qs.filter(status='rejected').count()
-        except Exception:
-            pass
-        
-        try:
-            # CFC - Internship
-            intern_qs = InternshipSubmission.objects.filter(user=user)
-            total += intern_qs.count()
-            approved += intern_qs.filter(status='approved').count()
-            pending += intern_qs.filter(status__in=['draft', 'submitted', 'under_review']).count()
-            rejected += intern_qs.filter(status='rejected').count()
-        except Exception:
-            pass
-        
-        try:
-            # CFC - GenAI
-            genai_qs = GenAIProjectSubmission.objects.filter(user=user)
-            total += genai_qs.count()
-            approved += genai_qs.filter(status='approved').count()
-            pending += genai_qs.filter(status__in=['draft', 'submitted', 'under_review']).count()
-            rejected += genai_qs.filter(status='rejected').count()
-        except Exception:
-            pass
-        
-        try:
-            # IIPC - LinkedIn Post
-            post_qs = LinkedInPostVerification.objects.filter(user=user)
-            total += post_qs.count()
-            approved += post_qs.filter(status='approved').count()
-            pending += post_qs.filter(status__in=['draft', 'submitted', 'under_review']).count()
-            rejected += post_qs.filter(status='rejected').count()
-        except Exception:
-            pass
-        
-        try:
-            # IIPC - LinkedIn Connection
-            conn_qs = LinkedInConnectionVerification.objects.filter(user=user)
-            total += conn_qs.count()
-            approved += conn_qs.filter(status='approved').count()
-            pending += conn_qs.filter(status__in=['draft', 'submitted', 'under_review']).count()
-            rejected += conn_qs.filter(status='rejected').count()
-        except Exception:
-            pass
-        
-        return {
-            'total': total,
-            'approved': approved,
-            'pending': pending,
-            'rejected': rejected
-        }
-    
     def _get_student_status(self, progress):
         """Determine student status based on progress"""
         if progress >= 80:
@@ -0,0 +1,112 @@
+"""
+Floor announcement fan-out
+
+Publishing a FloorAnnouncement schedules exactly one fan-out (from the
+post_save signal). The task streams recipients with .iterator(), inserts
+notifications in FANOUT_CHUNK_SIZE bulk_create batches and is idempotent per
+(announcement, recipient): re-running it only notifies users who were not
+notified yet, backed by the unique_announcement_recipient constraint.
+
+With ANNOUNCEMENT_DELIVERY='read' no rows are copied at all: the signal only
+pushes realtime events (push_floor_announcement) and announcement_feed merges
+the announcement into each feed at read time.
+"""
+import logging
+
+from django.db import transaction
+
+from apps.dashboard import realtime
+from apps.dashboard.models import Notification
+from .models import FloorAnnouncement, UserProfile
+
+logger = logging.getLogger(__name__)
+
+
+FANOUT_CHUNK_SIZE = 500
+
+PRIORITY_EMOJI = {
+    'urgent': '🔴',
+    'important': '🟠',
+    'normal': '🔵'
+}
+
+# FloorAnnouncement priorities mapped onto Notification.PRIORITY_CHOICES
+NOTIFICATION_PRIORITY = {
+    'urgent': 'high',
+    'important': 'high',
+    'normal': 'normal',
+}
+
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def fan_out_floor_announcement(announcement_id):
+    """Create one notification per student and mentor on the announcement's floor"""
+    created = 0
+    with transaction.atomic():
+        # Row lock serializes concurrent fan-outs of the same announcement
+        announcement = FloorAnnouncement.objects.select_for_update().filter(
+            pk=announcement_id, status='published'
+        ).first()
+        if announcement is None:
+            return 0
+
+        emoji = PRIORITY_EMOJI.get(announcement.priority, '🔵')
+        title = f"{emoji} {announcement.title}"
+        message = announcement.message[:200] + ('...' if len(announcement.message) > 200 else '')
+        priority = NOTIFICATION_PRIORITY.get(announcement.priority, 'normal')
+
+        recipient_ids = UserProfile.objects.filter(
+            campus=announcement.campus,
+            floor=announcement.floor,
+            role__in=['STUDENT', 'MENTOR']
+        ).order_by('user_id').values_list('user_id', flat=True).iterator(chunk_size=FANOUT_CHUNK_SIZE)
+
+        for chunk in _chunked(recipient_ids, FANOUT_CHUNK_SIZE):
+            already_notified = set(
+                Notification.objects.filter(
+                    announcement_id=announcement.id, recipient_id__in=chunk
+                ).values_list('recipient_id', flat=True)
+            )
+            new_recipient_ids = [user_id for user_id in chunk if user_id not in already_notified]
+            if not new_recipient_ids:
+                continue
+            Notification.objects.bulk_create([
+                Notification(
+                    recipient_id=user_id,
+                    sender_id=announcement.floor_wing_id,
+                    notification_type='floor_announcement',
+                    priority=priority,
+                    title=title,
+                    message=message,
+                    announcement_id=announcement.id
+                )
+                for user_id in new_recipient_ids
+            ])
+            realtime.publish_announcement(new_recipient_ids, 'floor', announcement)
+            created += len(new_recipient_ids)
+
+    logger.info('Created %s notifications for announcement %s: %s', created, announcement.id, announcement.title)
+    return created
+
+
+def push_floor_announcement(announcement_id):
+    """Fan-out-on-read mode: realtime event only, no per-user rows written"""
+    announcement = FloorAnnouncement.objects.filter(pk=announcement_id, status='published').first()
+    if announcement is None:
+        return
+    recipient_ids = list(UserProfile.objects.filter(
+        campus=announcement.campus,
+        floor=announcement.floor,
+        role__in=['STUDENT', 'MENTOR']
+    ).values_list('user_id', flat=True))
+    realtime.publish_announcement(recipient_ids, 'floor', announcement)
@@ -0,0 +1,133 @@
+"""
+Fan-out-on-read floor announcements (ANNOUNCEMENT_DELIVERY='read')
+
+Announcements are stored once per (campus, floor) audience and merged into
+each user's notification feed at read time with an indexed range query
+(floor_ann_feed_idx), instead of copying a Notification row per floor member.
+An AnnouncementWatermark per user marks what they have already seen, so the
+bell's "new" count is a small range query rather than per-user rows.
+"""
+from django.conf import settings
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from apps.dashboard.models import Notification
+from apps.dashboard.serializers import NotificationSerializer
+from .announcement_fanout import PRIORITY_EMOJI, NOTIFICATION_PRIORITY
+from .models import AnnouncementWatermark, FloorAnnouncement
+
+
+FEED_ID_PREFIX = 'announcement-'
+AUDIENCE_ROLES = ('STUDENT', 'MENTOR')
+MAX_MERGED_PER_PAGE = 100
+
+
+def fanout_on_read_enabled():
+    return getattr(settings, 'ANNOUNCEMENT_DELIVERY', 'write') == 'read'
+
+
+def visible_announcements(user):
+    """Published, unexpired announcements for the user's floor audience"""
+    profile = getattr(user, 'profile', None)
+    if profile is None or profile.role not in AUDIENCE_ROLES or not profile.campus or not profile.floor:
+        return FloorAnnouncement.objects.none()
+    return FloorAnnouncement.objects.filter(
+        campus=profile.campus,
+        floor=profile.floor,
+        status='published'
+    ).filter(
+        Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now())
+    ).exclude(
+        # Announcements delivered as Notification rows before the switch to fan-out-on-read
+        Exists(Notification.objects.filter(announcement_id=OuterRef('pk'), recipient_id=user.id))
+    )
+
+
+def get_watermark(user):
+    return AnnouncementWatermark.objects.filter(pk=user.id).values_list('last_seen_at', flat=True).first()
+
+
+def advance_watermark(user, seen_at=None):
+    """Mark everything up to seen_at (default: now) as seen"""
+    AnnouncementWatermark.objects.update_or_create(
+        user_id=user.id, defaults={'last_seen_at': seen_at or timezone.now()}
+    )
+
+
+def unseen_count(user):
+    """Announcements newer than the user's watermark that they have not opened"""
+    queryset = visible_announcements(user).exclude(read_by=user)
+    watermark = get_watermark(user)
+    if watermark is not None:
+        queryset = queryset.filter(created_at__gt=watermark)
+    return queryset.count()
+
+
+def parse_feed_id(value):
+    """Return the announcement id for a merged feed item id, or None"""
+    if isinstance(value, str) and value.startswith(FEED_ID_PREFIX):
+        try:
+            return int(value[len(FEED_ID_PREFIX):])
+        except ValueError:
+            return None
+    return None
+
+
+def mark_feed_item_read(user, announcement_id):
+    """Record a read receipt for a merged announcement; False if not visible to the user"""
+    if not visible_announcements(user).filter(pk=announcement_id).exists():
+        return False
+    FloorAnnouncement.mark_read_for(user, [announcement_id])
+    return True
+
+
+def _serialize(announcement, watermark):
+    seen = watermark is not None and announcement.created_at <= watermark
+    return {
+        'id': f'{FEED_ID_PREFIX}{announcement.id}',
+        'title': f"{PRIORITY_EMOJI.get(announcement.priority, '🔵')} {announcement.title}",
+        'message': announcement.message[:200] + ('...' if len(announcement.message) > 200 else ''),
+        'notification_type': 'floor_announcement',
+        'priority': NOTIFICATION_PRIORITY.get(announcement.priority, 'normal'),
+        'is_read': announcement.user_has_read or seen,
+        'created_at': announcement.created_at.isoformat(),
+        'time_ago': NotificationSerializer().get_time_ago(announcement),
+        'announcement_id': announcement.id,
+        'action_url': None,
+    }
+
+
+def merge_into_page(user, notifications, page, has_next, results):
+    """
+    Merge floor announcements into one page of the cursor-paginated feed.
+
+    Each page owns the time window [oldest item on the page, the next newer
+    notification above the page), so consecutive pages never repeat or skip
+    an announcement whichever direction the cursor moves.
+    """
+    lower = page[-1].created_at if page and has_next else None
+    upper = None
+    if page:
+        newest = page[0]
+        upper = notifications.filter(
+            Q(created_at__gt=newest.created_at) | Q(created_at=newest.created_at, id__gt=newest.id)
+        ).order_by('created_at', 'id').values_list('created_at', flat=True).first()
+
+    announcements = visible_announcements(user)
+    if lower is not None:
+        announcements = announcements.filter(created_at__gte=lower)
+    if upper is not None:
+        announcements = announcements.filter(created_at__lt=upper)
+    announcements = announcements.annotate(
+        user_has_read=Exists(
+            FloorAnnouncement.read_by.through.objects.filter(
+                floorannouncement_id=OuterRef('pk'), user_id=user.id
+            )
+        )
+    ).order_by('-created_at')[:MAX_MERGED_PER_PAGE]
+
+    watermark = get_watermark(user)
+    merged = [(notification.created_at, item) for notification, item in zip(page, results)]
+    merged += [(announcement.created_at, _serialize(announcement, watermark)) for announcement in announcements]
+    merged.sort(key=lambda pair: pair[0], reverse=True)
+    return [item for _, item in merged]
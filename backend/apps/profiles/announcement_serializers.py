@@ -28,6 +28,8 @@ class FloorAnnouncementSerializer(serializers.ModelSerializer):
     
     def get_is_read(self, obj):
         """Check if current user has read this announcement"""
+        if hasattr(obj, 'user_has_read'):
+            return obj.user_has_read
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return obj.is_read_by(request.user)
@@ -68,6 +70,8 @@ class FloorAnnouncementListSerializer(serializers.ModelSerializer):
         return obj.floor_wing.get_full_name() or obj.floor_wing.username
     
     def get_is_read(self, obj):
+        if hasattr(obj, 'user_has_read'):
+            return obj.user_has_read
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return obj.is_read_by(request.user)
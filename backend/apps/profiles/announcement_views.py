@@ -3,19 +3,33 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
-from django.db.models import Q, Count, Avg
+from django.db.models import Q, Count, Avg, Sum, Exists, OuterRef
 from django.contrib.auth.models import User
 from .models import FloorAnnouncement, UserProfile
-from .notification_models import Notification
 from .announcement_serializers import FloorAnnouncementSerializer, FloorAnnouncementListSerializer
 from .permissions import IsFloorWing
 
 
+MAX_BULK_MARK_READ = 500
+
+
+def annotate_user_has_read(queryset, user):
+    """Annotate `user_has_read` so serializers don't query read_by per row"""
+    return queryset.annotate(
+        user_has_read=Exists(
+            FloorAnnouncement.read_by.through.objects.filter(
+                floorannouncement_id=OuterRef('pk'), user_id=user.id
+            )
+        )
+    )
+
+
 class FloorAnnouncementViewSet(viewsets.ModelViewSet):
     """
     Floor Wing Announcements CRUD
     - Create, update, delete announcements
     - Scoped to floor wing's campus + floor
+    - Publishing notifies the floor via the post_save signal (announcement_fanout)
     """
     permission_classes = [IsAuthenticated, IsFloorWing]
     serializer_class = FloorAnnouncementSerializer
@@ -23,11 +37,12 @@ class FloorAnnouncementViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Return announcements for floor wing's campus and floor only"""
         user = self.request.user
-        return FloorAnnouncement.objects.filter(
+        queryset = FloorAnnouncement.objects.filter(
             campus=user.profile.campus,
             floor=user.profile.floor,
             floor_wing=user
         ).select_related('floor_wing')
+        return annotate_user_has_read(queryset, user)
     
     def get_serializer_class(self):
         """Use lightweight serializer for list view"""
@@ -35,61 +50,26 @@ class FloorAnnouncementViewSet(viewsets.ModelViewSet):
             return FloorAnnouncementListSerializer
         return FloorAnnouncementSerializer
     
-    def perform_create(self, serializer):
-        """Save announcement with auto-set campus/floor and create notifications"""
-        announcement = serializer.save()
-        
-        # If announcement is published, create notifications for all students on the floor
-        if announcement.status == 'published':
-            self._create_notifications_for_floor(announcement)
-    
-    def perform_update(self, serializer):
-        """Update announcement and create notifications if status changed to published"""
-        old_status = self.get_object().status
-        announcement = serializer.save()
-        
-        # If announcement was just published, create notifications
-        if old_status != 'published' and announcement.status == 'published':
-            self._create_notifications_for_floor(announcement)
-    
-    def _create_notifications_for_floor(self, announcement):
-        """Create notifications for all students on the same campus and floor"""
-        # Get all students on the same campus and floor
-        students = UserProfile.objects.filter(
-            campus=announcement.campus,
-            floor=announcement.floor,
-            role='STUDENT'
-        ).select_related('user')
-        
-        # Create notifications for each student
-        notifications = []
-        for student_profile in students:
-            notifications.append(Notification(
-                recipient=student_profile.user,
-                notification_type='floor_announcement',
-                title=f"New Announcement: {announcement.title}",
-                message=announcement.message[:200],  # Truncate if too long
-                announcement_id=announcement.id
-            ))
-        
-        # Bulk create all notifications at once
-        if notifications:
-            Notification.objects.bulk_create(notifications)
-            print(f"Created {len(notifications)} notifications for announcement: {announcement.title}")
-    
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """Get announcement statistics for floor wing"""
         user = request.user
-        queryset = self.get_queryset()
-        
-        total = queryset.count()
-        published = queryset.filter(status='published').count()
-        drafts = queryset.filter(status='draft').count()
         
-        # Get read statistics
-        published_announcements = queryset.filter(status='published')
-        total_reads = sum(a.read_count for a in published_announcements)
+        # One aggregate over the denormalized read_count column
+        totals = FloorAnnouncement.objects.filter(
+            campus=user.profile.campus,
+            floor=user.profile.floor,
+            floor_wing=user
+        ).aggregate(
+            total=Count('id'),
+            published=Count('id', filter=Q(status='published')),
+            drafts=Count('id', filter=Q(status='draft')),
+            total_reads=Sum('read_count', filter=Q(status='published')),
+        )
+        total = totals['total']
+        published = totals['published']
+        drafts = totals['drafts']
+        total_reads = totals['total_reads'] or 0
         
         # Get student count on floor
         student_count = UserProfile.objects.filter(
@@ -123,13 +103,14 @@ class StudentAnnouncementViewSet(viewsets.ReadOnlyModelViewSet):
         
         # Students see announcements for their floor
         if user.profile.role == 'STUDENT':
-            return FloorAnnouncement.objects.filter(
+            queryset = FloorAnnouncement.objects.filter(
                 campus=user.profile.campus,
                 floor=user.profile.floor,
                 status='published'
             ).filter(
                 Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now())
             ).select_related('floor_wing').order_by('-created_at')
+            return annotate_user_has_read(queryset, user)
         
         return FloorAnnouncement.objects.none()
     
@@ -140,6 +121,44 @@ class StudentAnnouncementViewSet(viewsets.ReadOnlyModelViewSet):
         announcement.mark_as_read(request.user)
         return Response({'status': 'marked as read'})
     
+    @action(detail=False, methods=['post'])
+    def mark_read_bulk(self, request):
+        """
+        Mark many announcements as read in one call
+        Body: {"announcement_ids": [1, 2, ...]} or {"all": true} for every visible announcement
+        """
+        queryset = self.get_queryset()
+        if request.data.get('all') is True:
+            announcement_ids = list(queryset.values_list('id', flat=True)[:MAX_BULK_MARK_READ])
+        else:
+            announcement_ids = request.data.get('announcement_ids')
+            if not isinstance(announcement_ids, list) or not announcement_ids:
+                return Response(
+                    {'error': 'announcement_ids must be a non-empty list'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if len(announcement_ids) > MAX_BULK_MARK_READ:
+                return Response(
+                    {'error': f'Cannot mark more than {MAX_BULK_MARK_READ} announcements at once'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            try:
+                announcement_ids = [int(announcement_id) for announcement_id in announcement_ids]
+            except (TypeError, ValueError):
+                return Response(
+                    {'error': 'announcement_ids must contain integers'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            # Only announcements this student can actually see
+            announcement_ids = list(queryset.filter(id__in=announcement_ids).values_list('id', flat=True))
+        
+        marked = FloorAnnouncement.mark_read_for(request.user, announcement_ids)
+        return Response({
+            'status': 'marked as read',
+            'marked_count': len(marked),
+            'marked_ids': marked
+        })
+    
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
         """Get count of unread announcements"""
@@ -0,0 +1,175 @@
+"""
+Floor aggregation shared by the floor wing dashboard, students and mentors views
+
+floor_stats() reads the floor's students and mentors (two queries) and every
+student's submissions through student_snapshot (one UNION query on a miss),
+then derives per-student progress, per-mentor workload and per-pillar totals
+in Python, so the cost does not grow with the number of mentors or students.
+
+The result is cached in the 'dashboard' cache under a digest of the roster
+rows just read plus each student's stats_cache version. A submission or
+review bumps the student's version, and an assignment (or name) change alters
+the roster, so either yields a new key and the next load recomputes.
+"""
+import hashlib
+
+from django.conf import settings
+
+from apps.dashboard import stats_cache, student_snapshot
+from apps.dashboard.report_engine import SOURCES
+from .models import UserProfile
+
+
+PILLARS = ['cfc', 'clt', 'sri', 'iipc', 'scd']
+# Statuses still waiting on a mentor's decision
+REVIEW_STATUSES = ['submitted', 'under_review', 'pending']
+
+STUDENT_FIELDS = [
+    'user_id', 'user__username', 'user__first_name', 'user__last_name', 'user__email',
+    'assigned_mentor_id', 'assigned_mentor__first_name', 'assigned_mentor__last_name',
+    'leetcode_id', 'github_id', 'linkedin_id',
+]
+MENTOR_FIELDS = ['user_id', 'user__username', 'user__first_name', 'user__last_name', 'user__email']
+
+
+def student_status(completion):
+    if completion >= 80:
+        return 'on_track'
+    elif completion >= 50:
+        return 'moderate'
+    return 'at_risk'
+
+
+def workload_status(assigned_count):
+    if assigned_count == 0:
+        return 'low'
+    elif assigned_count <= 5:
+        return 'balanced'
+    return 'overloaded'
+
+
+def _floor_key(campus, floor, students, mentors):
+    versions = stats_cache.get_versions([student['user_id'] for student in students])
+    roster = (
+        [(sorted(student.items()), versions[student['user_id']]) for student in students],
+        [sorted(mentor.items()) for mentor in mentors],
+    )
+    digest = hashlib.md5(repr(roster).encode()).hexdigest()
+    return f'floor_stats_{campus}_{floor}_{digest}'
+
+
+def _review_counts(snapshot):
+    """(awaiting review, approved, rejected) across the snapshot's submission sources"""
+    waiting = approved = rejected = 0
+    for source in student_snapshot.SUBMISSION_SOURCES:
+        _, statuses, _ = student_snapshot.source_counts(snapshot, source)
+        waiting += sum(statuses.get(s, 0) for s in REVIEW_STATUSES)
+        approved += statuses.get('approved', 0)
+        rejected += statuses.get('rejected', 0)
+    return waiting, approved, rejected
+
+
+def _compute(students, mentors):
+    snapshots = student_snapshot.student_snapshots([student['user_id'] for student in students])
+
+    pillar_sources = {pillar: [source for source_pillar, source, _ in SOURCES if source_pillar == pillar] for pillar in PILLARS}
+    pillar_totals = {
+        pillar: {'submitted': 0, 'approved': 0, 'pending': 0, 'rejected': 0, 'completed_students': 0}
+        for pillar in PILLARS
+    }
+    mentor_totals = {mentor['user_id']: {'assigned': 0, 'waiting': 0, 'approved': 0, 'rejected': 0} for mentor in mentors}
+
+    student_rows = []
+    for student in students:
+        snapshot = snapshots[student['user_id']]
+        progress = student_snapshot.pillar_progress(snapshot)
+        waiting, approved, rejected = _review_counts(snapshot)
+
+        for pillar, sources in pillar_sources.items():
+            totals = pillar_totals[pillar]
+            for source in sources:
+                total, statuses, _ = student_snapshot.source_counts(snapshot, source)
+                totals['submitted'] += total
+                totals['approved'] += statuses.get('approved', 0)
+                totals['rejected'] += statuses.get('rejected', 0)
+                totals['pending'] += total - statuses.get('approved', 0) - statuses.get('rejected', 0)
+            if progress['pillars'][pillar] >= 100:
+                totals['completed_students'] += 1
+
+        mentor = mentor_totals.get(student['assigned_mentor_id'])
+        if mentor is not None:
+            mentor['assigned'] += 1
+            mentor['waiting'] += waiting
+            mentor['approved'] += approved
+            mentor['rejected'] += rejected
+
+        mentor_name = None
+        if student['assigned_mentor_id']:
+            mentor_name = f"{student['assigned_mentor__first_name']} {student['assigned_mentor__last_name']}"
+        student_rows.append({
+            'id': student['user_id'],
+            'username': student['user__username'],
+            'name': f"{student['user__first_name']} {student['user__last_name']}",
+            'email': student['user__email'],
+            'roll_no': student['user__username'],  # Assuming username is roll no
+            'assigned_mentor_id': student['assigned_mentor_id'],
+            'assigned_mentor_name': mentor_name,
+            'pillar_progress': progress['overall'],
+            'pending_submissions': student_snapshot.submission_totals(snapshot)['pending'],
+            'status': student_status(progress['overall']),
+            'leetcode_id': student['leetcode_id'],
+            'github_id': student['github_id'],
+            'linkedin_id': student['linkedin_id'],
+            'pillar_details': progress['pillars'],
+        })
+
+    mentor_rows = []
+    for mentor in mentors:
+        totals = mentor_totals[mentor['user_id']]
+        decided = totals['approved'] + totals['rejected']
+        mentor_rows.append({
+            'id': mentor['user_id'],
+            'username': mentor['user__username'],
+            'name': f"{mentor['user__first_name']} {mentor['user__last_name']}",
+            'email': mentor['user__email'],
+            'assigned_students_count': totals['assigned'],
+            'pending_reviews': totals['waiting'],
+            'approval_rate': int(totals['approved'] / decided * 100) if decided else 0,
+            'workload_status': workload_status(totals['assigned']),
+            'last_active': None  # Can be implemented with activity tracking
+        })
+
+    student_count = len(student_rows)
+    pillar_stats = {}
+    for pillar, totals in pillar_totals.items():
+        completed_students = totals.pop('completed_students')
+        totals['completion_rate'] = int(completed_students / student_count * 100) if student_count else 0
+        pillar_stats[pillar] = totals
+
+    return {
+        'students': student_rows,
+        'mentors': mentor_rows,
+        'pillar_stats': pillar_stats,
+        'avg_completion': int(sum(row['pillar_progress'] for row in student_rows) / student_count) if student_count else 0,
+        'pending_reviews': sum(row['pending_reviews'] for row in mentor_rows),
+    }
+
+
+def floor_stats(campus, floor):
+    """Students, mentors and pillar totals for one floor (see module docstring)"""
+    students = list(
+        UserProfile.objects.filter(role='STUDENT', campus=campus, floor=floor)
+        .order_by('id').values(*STUDENT_FIELDS)
+    )
+    mentors = list(
+        UserProfile.objects.filter(role='MENTOR', campus=campus, floor=floor)
+        .order_by('id').values(*MENTOR_FIELDS)
+    )
+
+    cache = stats_cache.get_cache()
+    key = _floor_key(campus, floor, students, mentors)
+    stats = cache.get(key)
+    if stats is None:
+        stats = _compute(students, mentors)
+        cache.set(key, stats, settings.STUDENT_SNAPSHOT_CACHE_TIMEOUT)
+    return stats
@@ -0,0 +1,219 @@
+"""
+Mentor auto-assignment engine
+
+Students are grouped by (campus, floor) and only ever given a mentor from
+their own floor. Each group is balanced with a min-heap keyed on mentor load:
+
+- fill (default): unassigned students go to the least-loaded floor mentor,
+  counting every student the mentor already has.
+- rebalance: the floor's students (including any assigned to a mentor from
+  another floor) are spread so mentor loads differ by at most one, keeping
+  existing assignments wherever the target allows, so the fewest students
+  move.
+
+plan_assignment() only reads (two queries) and returns the moves, which makes
+dry runs free; apply_assignment() locks the planned rows, drops moves whose
+student changed mentor in the meantime, writes the rest with bulk_update in a
+single transaction and then refreshes what post_save signals would have.
+
+reassign_students() is the manual counterpart used by the assign/reassign
+endpoints: one UPDATE for any number of students, one bulk insert of
+notifications and one round of counter/cache invalidation.
+"""
+import heapq
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.dashboard import stats_cache
+from apps.dashboard.models import Notification, UnreadCounter
+from .models import UserProfile
+
+
+BULK_UPDATE_BATCH_SIZE = 1000
+
+
+def _floor_filter(campus, floor):
+    filters = {}
+    if campus:
+        filters['campus'] = campus
+    if floor:
+        filters['floor'] = floor
+    return filters
+
+
+def _heap_assign(students, loads):
+    """Give each student to the least-loaded mentor (ties by mentor id); loads is updated"""
+    heap = [(load, mentor_id) for mentor_id, load in loads.items()]
+    heapq.heapify(heap)
+    moves = []
+    for student in students:
+        load, mentor_id = heapq.heappop(heap)
+        moves.append((student, mentor_id))
+        loads[mentor_id] = load + 1
+        heapq.heappush(heap, (load + 1, mentor_id))
+    return moves
+
+
+def _rebalance(students, mentor_ids):
+    """Even out a floor, keeping as many current assignments as the targets allow"""
+    current = defaultdict(list)
+    for student in students:
+        current[student['assigned_mentor_id']].append(student)
+
+    # Mentors that already carry the most students keep the spare (+1) slots
+    base, extra = divmod(len(students), len(mentor_ids))
+    by_load = sorted(mentor_ids, key=lambda mentor_id: (-len(current[mentor_id]), mentor_id))
+    capacity = {mentor_id: base + (1 if index < extra else 0) for index, mentor_id in enumerate(by_load)}
+
+    loads, pool = {}, []
+    for mentor_id in mentor_ids:
+        kept = current.pop(mentor_id, [])
+        loads[mentor_id] = min(len(kept), capacity[mentor_id])
+        pool.extend(kept[capacity[mentor_id]:])
+    for others in current.values():  # unassigned or assigned off-floor
+        pool.extend(others)
+
+    pool.sort(key=lambda student: student['user_id'])
+    return _heap_assign(pool, loads), loads
+
+
+def plan_assignment(campus=None, floor=None, rebalance=False):
+    """
+    Work out mentor assignments without writing anything.
+    Returns {'moves': [{'profile_id', 'student_id', 'from_mentor_id', 'to_mentor_id'}],
+             'groups': [...per (campus, floor) summary...],
+             'unassignable': [student_id, ...]}  (unassigned, no mentor on their floor)
+    """
+    filters = _floor_filter(campus, floor)
+    mentors = (
+        UserProfile.objects.filter(role='MENTOR', campus__isnull=False, floor__isnull=False, **filters)
+        .with_student_count().order_by('user_id').values('user_id', 'campus', 'floor', 'student_count')
+    )
+    mentors_by_floor = defaultdict(dict)
+    for mentor in mentors:
+        mentors_by_floor[(mentor['campus'], mentor['floor'])][mentor['user_id']] = mentor['student_count']
+
+    students_by_floor = defaultdict(list)
+    students = (
+        UserProfile.objects.filter(role='STUDENT', campus__isnull=False, floor__isnull=False, **filters)
+        .order_by('user_id').values('id', 'user_id', 'campus', 'floor', 'assigned_mentor_id')
+    )
+    for student in students:
+        students_by_floor[(student['campus'], student['floor'])].append(student)
+
+    moves, groups, unassignable = [], [], []
+    for key in sorted(students_by_floor):
+        floor_students = students_by_floor[key]
+        floor_mentors = mentors_by_floor.get(key)
+        if not floor_mentors:
+            unassignable.extend(student['user_id'] for student in floor_students if not student['assigned_mentor_id'])
+            continue
+
+        if rebalance:
+            assigned, loads = _rebalance(floor_students, sorted(floor_mentors))
+        else:
+            waiting = [student for student in floor_students if not student['assigned_mentor_id']]
+            loads = dict(floor_mentors)
+            assigned = _heap_assign(waiting, loads)
+
+        floor_moves = [
+            {
+                'profile_id': student['id'],
+                'student_id': student['user_id'],
+                'from_mentor_id': student['assigned_mentor_id'],
+                'to_mentor_id': mentor_id,
+            }
+            for student, mentor_id in assigned
+            if student['assigned_mentor_id'] != mentor_id
+        ]
+        moves.extend(floor_moves)
+        groups.append({
+            'campus': key[0],
+            'floor': key[1],
+            'students': len(floor_students),
+            'mentors': len(floor_mentors),
+            'students_moved': len(floor_moves),
+            'mentor_loads': loads,
+        })
+
+    return {'moves': moves, 'groups': groups, 'unassignable': unassignable}
+
+
+def apply_assignment(moves):
+    """
+    Write planned moves in one transaction; returns the number of students updated.
+    The planned rows are locked and re-read first: a student whose mentor changed
+    since plan_assignment() read it is left alone rather than overwritten.
+    """
+    if not moves:
+        return 0
+    with transaction.atomic():
+        current = dict(
+            UserProfile.objects.select_for_update()
+            .filter(id__in=[move['profile_id'] for move in moves])
+            .values_list('id', 'assigned_mentor_id')
+        )
+        profiles = [
+            UserProfile(id=move['profile_id'], user_id=move['student_id'], assigned_mentor_id=move['to_mentor_id'])
+            for move in moves
+            if move['profile_id'] in current and current[move['profile_id']] == move['from_mentor_id']
+        ]
+        if not profiles:
+            return 0
+        UserProfile.objects.bulk_update(profiles, ['assigned_mentor'], batch_size=BULK_UPDATE_BATCH_SIZE)
+        _after_mentor_change([profile.user_id for profile in profiles])
+    return len(profiles)
+
+
+def _after_mentor_change(user_ids):
+    """What the UserProfile post_save receiver does, for writes that bypass it"""
+    UnreadCounter.recount_announcements(user_ids)
+    stats_cache.invalidate(*user_ids)
+
+
+def reassign_students(current_mentors, mentor=None, sender=None):
+    """
+    Point students at mentor (a User, or None to unassign).
+
+    current_mentors is {student_user_id: assigned_mentor_id} as read by the
+    caller's validation query; students already on this mentor are skipped.
+    Returns the user ids that changed.
+    """
+    mentor_id = mentor.id if mentor else None
+    changed = [user_id for user_id, old_mentor_id in current_mentors.items() if old_mentor_id != mentor_id]
+    if not changed:
+        return []
+
+    if mentor:
+        mentor_name = mentor.get_full_name() or mentor.username
+        notifications = [
+            Notification(
+                recipient_id=user_id, sender=sender, notification_type='system',
+                title='Mentor assigned', message=f'{mentor_name} is now your mentor.'
+            )
+            for user_id in changed
+        ]
+        notifications.append(Notification(
+            recipient_id=mentor_id, sender=sender, notification_type='system',
+            title='New students assigned',
+            message=f"{len(changed)} student{'s' if len(changed) != 1 else ''} assigned to you."
+        ))
+    else:
+        notifications = [
+            Notification(
+                recipient_id=user_id, sender=sender, notification_type='system',
+                title='Mentor unassigned', message='You no longer have an assigned mentor.'
+            )
+            for user_id in changed
+        ]
+
+    with transaction.atomic():
+        # .update() skips auto_now and post_save, so set updated_at here and refresh counters below
+        UserProfile.objects.filter(user_id__in=changed).update(
+            assigned_mentor_id=mentor_id, updated_at=timezone.now()
+        )
+        Notification.objects.bulk_create(notifications)
+        _after_mentor_change(changed)
+    return changed
@@ -13,6 +13,23 @@ from rest_framework.response import Response
 from django.contrib.auth.models import User
 from django.db.models import Q
 from .models import UserProfile
+from .mentor_assignment import reassign_students
+
+
+def _as_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _profiles_by_user_id(*user_ids):
+    """{user_id: profile} with user and assigned mentor joined, for every id that exists"""
+    user_ids = {user_id for user_id in map(_as_id, user_ids) if user_id is not None}
+    return {
+        profile.user_id: profile
+        for profile in UserProfile.objects.filter(user_id__in=user_ids).select_related('user', 'assigned_mentor')
+    }
 
 
 @api_view(['GET'])
@@ -41,8 +58,7 @@ def get_mentor_students(request):
             'user__last_name',
             'user__username',
             'campus',
-            'floor',
-            'wing'
+            'floor'
         )
         
         return Response({
@@ -53,7 +69,7 @@ def get_mentor_students(request):
                 'floor': profile.floor
             },
             'students': list(students),
-            'total_count': students.count()
+            'total_count': len(students)
         })
     
     except UserProfile.DoesNotExist:
@@ -92,13 +108,12 @@ def get_available_students(request):
             'user__last_name',
             'user__username',
             'campus',
-            'floor',
-            'wing'
+            'floor'
         )
         
         return Response({
             'available_students': list(available_students),
-            'count': available_students.count(),
+            'count': len(available_students),
             'filter': {
                 'campus': profile.campus,
                 'floor': profile.floor
@@ -200,94 +215,91 @@ def reassign_student_to_mentor(request):
         "new_mentor_id": 456  // Must be a mentor on the same floor
     }
     """
-    try:
-        current_mentor_profile = UserProfile.objects.get(user=request.user)
-        
-        if current_mentor_profile.role != 'MENTOR':
-            return Response(
-                {'error': 'Only mentors can reassign students'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        student_id = request.data.get('student_id')
-        new_mentor_id = request.data.get('new_mentor_id')
-        
-        if not student_id or not new_mentor_id:
-            return Response(
-                {'error': 'student_id and new_mentor_id are required'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # Get the student
-        try:
-            student_user = User.objects.get(id=student_id)
-            student_profile = UserProfile.objects.get(user=student_user)
-        except (User.DoesNotExist, UserProfile.DoesNotExist):
-            return Response(
-                {'error': 'Student not found'},
-                status=status.HTTP_404_NOT_FOUND
-            )
-        
-        # Verify student is on the same floor as current mentor
-        if (student_profile.role != 'STUDENT' or 
-            student_profile.campus != current_mentor_profile.campus or 
-            student_profile.floor != current_mentor_profile.floor):
-            return Response(
-                {'error': 'Can only reassign students from your own floor'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        # Get the new mentor
-        try:
-            new_mentor_user = User.objects.get(id=new_mentor_id)
-            new_mentor_profile = UserProfile.objects.get(user=new_mentor_user)
-        except (User.DoesNotExist, UserProfile.DoesNotExist):
-            return Response(
-                {'error': 'New mentor not found'},
-                status=status.HTTP_404_NOT_FOUND
-            )
-        
-        # Verify new mentor is a mentor on the same floor
-        if (new_mentor_profile.role != 'MENTOR' or
-            new_mentor_profile.campus != current_mentor_profile.campus or
-            new_mentor_profile.floor != current_mentor_profile.floor):
-            return Response(
-                {'error': 'Can only reassign to mentors on your own floor'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        # Store old mentor for response
-        old_mentor = student_profile.assigned_mentor
-        
-        # Reassign student to new mentor
-        student_profile.assigned_mentor = new_mentor_user
-        student_profile.save()
-        
-        return Response({
-            'success': True,
-            'message': f'Successfully reassigned {student_user.email} to {new_mentor_user.email}',
-            'student': {
-                'id': student_user.id,
-                'email': student_user.email,
-                'name': student_user.get_full_name()
-            },
-            'old_mentor': {
-                'id': old_mentor.id if old_mentor else None,
-                'email': old_mentor.email if old_mentor else None,
-                'name': old_mentor.get_full_name() if old_mentor else None
-            },
-            'new_mentor': {
-                'id': new_mentor_user.id,
-                'email': new_mentor_user.email,
-                'name': new_mentor_user.get_full_name()
-            }
-        })
+    student_id = request.data.get('student_id')
+    new_mentor_id = request.data.get('new_mentor_id')
     
-    except UserProfile.DoesNotExist:
+    # Caller, student and new mentor in one query
+    profiles = _profiles_by_user_id(request.user.id, student_id, new_mentor_id)
+    current_mentor_profile = profiles.get(request.user.id)
+    if current_mentor_profile is None:
         return Response(
             {'error': 'User profile not found'},
             status=status.HTTP_404_NOT_FOUND
         )
+    
+    if current_mentor_profile.role != 'MENTOR':
+        return Response(
+            {'error': 'Only mentors can reassign students'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    if not student_id or not new_mentor_id:
+        return Response(
+            {'error': 'student_id and new_mentor_id are required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # Get the student
+    student_profile = profiles.get(_as_id(student_id))
+    if student_profile is None:
+        return Response(
+            {'error': 'Student not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    student_user = student_profile.user
+    
+    # Verify student is on the same floor as current mentor
+    if (student_profile.role != 'STUDENT' or 
+        student_profile.campus != current_mentor_profile.campus or 
+        student_profile.floor != current_mentor_profile.floor):
+        return Response(
+            {'error': 'Can only reassign students from your own floor'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    # Get the new mentor
+    new_mentor_profile = profiles.get(_as_id(new_mentor_id))
+    if new_mentor_profile is None:
+        return Response(
+            {'error': 'New mentor not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    new_mentor_user = new_mentor_profile.user
+    
+    # Verify new mentor is a mentor on the same floor
+    if (new_mentor_profile.role != 'MENTOR' or
+        new_mentor_profile.campus != current_mentor_profile.campus or
+        new_mentor_profile.floor != current_mentor_profile.floor):
+        return Response(
+            {'error': 'Can only reassign to mentors on your own floor'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    # Store old mentor for response
+    old_mentor = student_profile.assigned_mentor
+    
+    # Reassign student to new mentor
+    reassign_students({student_user.id: student_profile.assigned_mentor_id}, new_mentor_user, sender=request.user)
+    
+    return Response({
+        'success': True,
+        'message': f'Successfully reassigned {student_user.email} to {new_mentor_user.email}',
+        'student': {
+            'id': student_user.id,
+            'email': student_user.email,
+            'name': student_user.get_full_name()
+        },
+        'old_mentor': {
+            'id': old_mentor.id if old_mentor else None,
+            'email': old_mentor.email if old_mentor else None,
+            'name': old_mentor.get_full_name() if old_mentor else None
+        },
+        'new_mentor': {
+            'id': new_mentor_user.id,
+            'email': new_mentor_user.email,
+            'name': new_mentor_user.get_full_name()
+        }
+    })
 
 
 @api_view(['GET'])
@@ -306,16 +318,22 @@ def admin_get_all_assignments(request):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Get all mentors with their student count
-        mentors = UserProfile.objects.filter(role='MENTOR').select_related('user')
+        # Get all mentors with their students prefetched (one query for all mentees)
+        mentors = list(UserProfile.objects.filter(role='MENTOR').select_related('user').with_mentees())
+        
+        def student_data(s):
+            return {
+                'id': s.user.id,
+                'email': s.user.email,
+                'name': s.user.get_full_name(),
+                'username': s.user.username,
+                'campus': s.campus,
+                'floor': s.floor
+            }
         
         assignments = []
         for mentor_profile in mentors:
-            students = UserProfile.objects.filter(
-                role='STUDENT',
-                assigned_mentor=mentor_profile.user
-            ).select_related('user')
-            
+            students = [student_data(s) for s in mentor_profile.user.mentees]
             assignments.append({
                 'mentor': {
                     'id': mentor_profile.user.id,
@@ -324,43 +342,23 @@ def admin_get_all_assignments(request):
                     'campus': mentor_profile.campus,
                     'floor': mentor_profile.floor
                 },
-                'students': [
-                    {
-                        'id': s.user.id,
-                        'email': s.user.email,
-                        'name': s.user.get_full_name(),
-                        'username': s.user.username,
-                        'campus': s.campus,
-                        'floor': s.floor,
-                        'wing': s.wing
-                    }
-                    for s in students
-                ],
-                'student_count': students.count()
+                'students': students,
+                'student_count': len(students)
             })
         
-        # Get unassigned students
-        unassigned_students = UserProfile.objects.filter(
-            role='STUDENT',
-            assigned_mentor__isnull=True
-        ).select_related('user')
+        # Unassigned students (full dataset: see /api/admin/assignments/export/)
+        unassigned_students = [
+            student_data(s) for s in UserProfile.objects.filter(
+                role='STUDENT',
+                assigned_mentor__isnull=True
+            ).select_related('user')
+        ]
         
         return Response({
             'assignments': assignments,
-            'unassigned_students': [
-                {
-                    'id': s.user.id,
-                    'email': s.user.email,
-                    'name': s.user.get_full_name(),
-                    'username': s.user.username,
-                    'campus': s.campus,
-                    'floor': s.floor,
-                    'wing': s.wing
-                }
-                for s in unassigned_students
-            ],
-            'total_mentors': mentors.count(),
-            'total_unassigned': unassigned_students.count()
+            'unassigned_students': unassigned_students,
+            'total_mentors': len(mentors),
+            'total_unassigned': len(unassigned_students)
         })
     
     except UserProfile.DoesNotExist:
@@ -382,95 +380,91 @@ def admin_reassign_student(request):
         "mentor_id": 456  // or null to unassign
     }
     """
-    try:
-        profile = UserProfile.objects.get(user=request.user)
-        
-        # Check if user is admin or superuser
-        if profile.role != 'ADMIN' and not request.user.is_superuser:
-            return Response(
-                {'error': 'Only admins can reassign students'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        student_id = request.data.get('student_id')
-        mentor_id = request.data.get('mentor_id')
-        
-        if not student_id:
-            return Response(
-                {'error': 'student_id is required'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # Get the student
-        try:
-            student_user = User.objects.get(id=student_id)
-            student_profile = UserProfile.objects.get(user=student_user)
-        except (User.DoesNotExist, UserProfile.DoesNotExist):
-            return Response(
-                {'error': 'Student not found'},
-                status=status.HTTP_404_NOT_FOUND
-            )
-        
-        if student_profile.role != 'STUDENT':
-            return Response(
-                {'error': 'User is not a student'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # Handle unassignment
-        if mentor_id is None:
-            old_mentor = student_profile.assigned_mentor
-            student_profile.assigned_mentor = None
-            student_profile.save()
-            
-            return Response({
-                'success': True,
-                'message': f'Unassigned {student_user.email}',
-                'old_mentor': old_mentor.email if old_mentor else None
-            })
-        
-        # Get the mentor
-        try:
-            mentor_user = User.objects.get(id=mentor_id)
-            mentor_profile = UserProfile.objects.get(user=mentor_user)
-        except (User.DoesNotExist, UserProfile.DoesNotExist):
-            return Response(
-                {'error': 'Mentor not found'},
-                status=status.HTTP_404_NOT_FOUND
-            )
-        
-        if mentor_profile.role != 'MENTOR':
-            return Response(
-                {'error': 'User is not a mentor'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # Assign student to mentor
-        old_mentor = student_profile.assigned_mentor
-        student_profile.assigned_mentor = mentor_user
-        student_profile.save()
+    student_id = request.data.get('student_id')
+    mentor_id = request.data.get('mentor_id')
+    
+    # Caller, student and mentor in one query
+    profiles = _profiles_by_user_id(request.user.id, student_id, mentor_id)
+    profile = profiles.get(request.user.id)
+    if profile is None:
+        return Response(
+            {'error': 'User profile not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    # Check if user is admin or superuser
+    if profile.role != 'ADMIN' and not request.user.is_superuser:
+        return Response(
+            {'error': 'Only admins can reassign students'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    if not student_id:
+        return Response(
+            {'error': 'student_id is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # Get the student
+    student_profile = profiles.get(_as_id(student_id))
+    if student_profile is None:
+        return Response(
+            {'error': 'Student not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    student_user = student_profile.user
+    
+    if student_profile.role != 'STUDENT':
+        return Response(
+            {'error': 'User is not a student'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    old_mentor = student_profile.assigned_mentor
+    
+    # Handle unassignment
+    if mentor_id is None:
+        reassign_students({student_user.id: student_profile.assigned_mentor_id}, None, sender=request.user)
         
         return Response({
             'success': True,
-            'message': f'Reassigned {student_user.email} to {mentor_user.email}',
-            'student': {
-                'id': student_user.id,
-                'email': student_user.email,
-                'name': student_user.get_full_name()
-            },
-            'mentor': {
-                'id': mentor_user.id,
-                'email': mentor_user.email,
-                'name': mentor_user.get_full_name()
-            },
+            'message': f'Unassigned {student_user.email}',
             'old_mentor': old_mentor.email if old_mentor else None
         })
     
-    except UserProfile.DoesNotExist:
+    # Get the mentor
+    mentor_profile = profiles.get(_as_id(mentor_id))
+    if mentor_profile is None:
         return Response(
-            {'error': 'User profile not found'},
+            {'error': 'Mentor not found'},
             status=status.HTTP_404_NOT_FOUND
         )
+    mentor_user = mentor_profile.user
+    
+    if mentor_profile.role != 'MENTOR':
+        return Response(
+            {'error': 'User is not a mentor'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # Assign student to mentor
+    reassign_students({student_user.id: student_profile.assigned_mentor_id}, mentor_user, sender=request.user)
+    
+    return Response({
+        'success': True,
+        'message': f'Reassigned {student_user.email} to {mentor_user.email}',
+        'student': {
+            'id': student_user.id,
+            'email': student_user.email,
+            'name': student_user.get_full_name()
+        },
+        'mentor': {
+            'id': mentor_user.id,
+            'email': mentor_user.email,
+            'name': mentor_user.get_full_name()
+        },
+        'old_mentor': old_mentor.email if old_mentor else None
+    })
 
 
 @api_view(['GET'])
@@ -501,23 +495,19 @@ def get_floor_mentors(request):
         role='MENTOR',
         campus=campus,
         floor=floor
-    ).select_related('user')
+    ).select_related('user').with_student_count()
     
-    mentor_list = []
-    for mentor_profile in mentors:
-        student_count = UserProfile.objects.filter(
-            role='STUDENT',
-            assigned_mentor=mentor_profile.user
-        ).count()
-        
-        mentor_list.append({
+    mentor_list = [
+        {
             'id': mentor_profile.user.id,
             'email': mentor_profile.user.email,
             'name': mentor_profile.user.get_full_name(),
             'campus': mentor_profile.campus,
             'floor': mentor_profile.floor,
-            'student_count': student_count
-        })
+            'student_count': mentor_profile.student_count
+        }
+        for mentor_profile in mentors
+    ]
     
     return Response({
         'mentors': mentor_list,
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 06:52
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0010_alter_userprofile_campus'),
+        ('dashboard', '0008_unified_notifications'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='Notification',
+        ),
+    ]
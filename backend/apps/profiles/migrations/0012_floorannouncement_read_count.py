@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-19 06:57
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_read_count(apps, schema_editor):
+    """One UPDATE with a correlated COUNT subquery over the read_by table"""
+    FloorAnnouncement = apps.get_model('profiles', 'FloorAnnouncement')
+    through = FloorAnnouncement.read_by.through
+    reads = (
+        through.objects.filter(floorannouncement_id=OuterRef('pk')).order_by()
+        .values('floorannouncement_id').annotate(total=Count('id')).values('total')
+    )
+    FloorAnnouncement.objects.update(read_count=Coalesce(Subquery(reads), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0011_delete_profile_notification'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='floorannouncement',
+            name='read_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_read_count, migrations.RunPython.noop),
+    ]
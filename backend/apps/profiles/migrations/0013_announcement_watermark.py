@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-19 07:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('profiles', '0012_floorannouncement_read_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnnouncementWatermark',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='announcement_watermark', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('last_seen_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='floorannouncement',
+            index=models.Index(fields=['campus', 'floor', 'status', '-created_at'], name='floor_ann_feed_idx'),
+        ),
+    ]
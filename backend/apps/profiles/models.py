@@ -1,10 +1,55 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
 
+class UserProfileQuerySet(models.QuerySet):
+    """Mentor listings without a query per mentor"""
+
+    def reviewable_by(self, user):
+        """
+        Student profiles whose submissions user may review: a mentor's own
+        students, a floor wing's campus and floor, everyone for admins/staff
+        """
+        students = self.filter(role='STUDENT')
+        if user.is_staff or user.is_superuser:
+            return students
+        profile = getattr(user, 'profile', None)
+        if profile is None:
+            return self.none()
+        if profile.role == 'ADMIN':
+            return students
+        if profile.role == 'FLOOR_WING':
+            return students.filter(campus=profile.campus, floor=profile.floor)
+        if profile.role == 'MENTOR':
+            return students.filter(assigned_mentor=user)
+        return self.none()
+
+    def with_student_count(self):
+        """Annotate student_count: students assigned to each profile's user"""
+        return self.annotate(
+            student_count=Count(
+                'user__mentored_students',
+                filter=Q(user__mentored_students__role='STUDENT'),
+                distinct=True
+            )
+        )
+
+    def with_mentees(self):
+        """Prefetch each mentor's students (with users) into profile.user.mentees"""
+        return self.prefetch_related(
+            Prefetch(
+                'user__mentored_students',
+                queryset=UserProfile.objects.filter(role='STUDENT').select_related('user').order_by('user_id'),
+                to_attr='mentees'
+            )
+        )
+
+
 class UserProfile(models.Model):
     """Extended user profile with platform IDs"""
     
@@ -72,6 +117,8 @@ class UserProfile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = UserProfileQuerySet.as_manager()
+    
     class Meta:
         verbose_name = "User Profile"
         verbose_name_plural = "User Profiles"
@@ -87,6 +134,13 @@ class UserProfile(models.Model):
         floor_str = f" - Floor {self.floor}" if self.floor else ""
         return f"{self.user.username} ({self.get_role_display()}){campus_str}{floor_str}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so post_save receivers can tell when the mentor changed
+        instance._loaded_assigned_mentor_id = instance.__dict__.get('assigned_mentor_id')
+        return instance
+    
     def clean(self):
         """Validate campus and floor combinations"""
         from django.core.exceptions import ValidationError
@@ -171,17 +225,28 @@ class FloorAnnouncement(models.Model):
         related_name='read_floor_announcements', 
         blank=True
     )
+    # Denormalized len(read_by), kept in step by mark_read_for() and the m2m_changed signal
+    read_count = models.PositiveIntegerField(default=0)
     
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['campus', 'floor', 'status']),
             models.Index(fields=['created_at']),
+            # Fan-out-on-read feed: one audience, newest first
+            models.Index(fields=['campus', 'floor', 'status', '-created_at'], name='floor_ann_feed_idx'),
         ]
     
     def __str__(self):
         return f"{self.title} - {self.campus} Floor {self.floor}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets the post_save signal detect a draft -> published transition
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+    
     @property
     def is_expired(self):
         """Check if announcement has expired"""
@@ -189,16 +254,61 @@ class FloorAnnouncement(models.Model):
             return timezone.now() > self.expires_at
         return False
     
-    @property
-    def read_count(self):
-        """Count of users who have read this announcement"""
-        return self.read_by.count()
-    
     def mark_as_read(self, user):
         """Mark announcement as read by a user"""
-        if user not in self.read_by.all():
-            self.read_by.add(user)
+        FloorAnnouncement.mark_read_for(user, [self.pk])
+    
+    @classmethod
+    def mark_read_for(cls, user, announcement_ids):
+        """
+        Record read receipts for many announcements at once.
+        Returns the ids that were newly marked read.
+        """
+        through = cls.read_by.through
+        with transaction.atomic():
+            # Lock in id order so concurrent readers of the same announcements don't deadlock
+            ids = list(
+                cls.objects.select_for_update().filter(id__in=announcement_ids)
+                .order_by('id').values_list('id', flat=True)
+            )
+            already_read = set(
+                through.objects.filter(user_id=user.id, floorannouncement_id__in=ids)
+                .values_list('floorannouncement_id', flat=True)
+            )
+            new_ids = [announcement_id for announcement_id in ids if announcement_id not in already_read]
+            if new_ids:
+                through.objects.bulk_create(
+                    [through(floorannouncement_id=announcement_id, user_id=user.id) for announcement_id in new_ids],
+                    ignore_conflicts=True
+                )
+                cls.objects.filter(id__in=new_ids).update(read_count=F('read_count') + 1)
+        return new_ids
+    
+    @classmethod
+    def recount_reads(cls, announcement_ids):
+        """Recompute read_count from the read_by table"""
+        through = cls.read_by.through
+        reads = (
+            through.objects.filter(floorannouncement_id=OuterRef('pk')).order_by()
+            .values('floorannouncement_id').annotate(total=Count('id')).values('total')
+        )
+        cls.objects.filter(id__in=announcement_ids).update(
+            read_count=Coalesce(Subquery(reads), 0)
+        )
     
     def is_read_by(self, user):
         """Check if user has read this announcement"""
         return self.read_by.filter(id=user.id).exists()
+
+
+class AnnouncementWatermark(models.Model):
+    """
+    Per-user "last seen" marker for fan-out-on-read announcement delivery
+    (ANNOUNCEMENT_DELIVERY='read'): floor announcements created after
+    last_seen_at count as new in the notification bell.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='announcement_watermark')
+    last_seen_at = models.DateTimeField()
+    
+    def __str__(self):
+        return f"{self.user_id} saw announcements up to {self.last_seen_at}"
@@ -1,169 +1,97 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.utils import timezone
-from django.db.models import Q
-from django.core.cache import cache
-from django.conf import settings
-from apps.dashboard.models import Notification as DashboardNotification
-from .notification_models import Notification as ProfileNotification
+from apps.dashboard.models import Notification, UnreadCounter
 from apps.dashboard.serializers import NotificationSerializer
-from .notification_serializers import NotificationSerializer as ProfileNotificationSerializer
+from . import announcement_feed
+
+
+class NotificationCursorPagination(CursorPagination):
+    """Stable feed pagination that stays cheap however deep the user scrolls"""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
 
 
 class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     """
-    User notifications API - combines both dashboard and profile notifications
-    - Get all notifications
-    - Get unread count
+    User notifications API backed by the single dashboard Notification table
+    - Cursor-paginated feed (?cursor=...)
+    - Get unread count (counter row, no COUNT query)
     - Mark as read
     - Mark all as read
+    With ANNOUNCEMENT_DELIVERY='read', floor announcements are merged into the
+    feed at read time (see announcement_feed) instead of being stored per user.
     """
     permission_classes = [IsAuthenticated]
     serializer_class = NotificationSerializer
-    
+    pagination_class = NotificationCursorPagination
+    filter_backends = []  # ordering is fixed by the cursor paginator
+
     def get_queryset(self):
-        """Return notifications for current user from both sources"""
-        # Get dashboard notifications
-        dashboard_notifs = list(DashboardNotification.objects.filter(
-            recipient=self.request.user
-        )[:25])
-        
-        # Get profile notifications (announcements, etc.)
-        profile_notifs = list(ProfileNotification.objects.filter(
-            recipient=self.request.user
-        )[:25])
-        
-        # Combine and sort by created_at
-        all_notifs = dashboard_notifs + profile_notifs
-        all_notifs.sort(key=lambda x: x.created_at, reverse=True)
-        
-        return all_notifs[:50]  # Return top 50
-    
+        """Return notifications for current user"""
+        return Notification.objects.filter(recipient=self.request.user)
+
     def list(self, request, *args, **kwargs):
-        """Custom list to handle mixed notification types"""
-        queryset = self.get_queryset()
-        
-        # Serialize each notification with appropriate serializer
-        serialized = []
-        for notif in queryset:
-            if isinstance(notif, ProfileNotification):
-                serializer = ProfileNotificationSerializer(notif)
-            else:
-                serializer = NotificationSerializer(notif)
-            serialized.append(serializer.data)
-        
-        return Response({'results': serialized})
-    
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        results = self.get_serializer(page, many=True).data
+        if announcement_feed.fanout_on_read_enabled():
+            results = announcement_feed.merge_into_page(
+                request.user, queryset, page, self.paginator.has_next, results
+            )
+        return self.get_paginated_response(results)
+
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
-        """
-        Get count of unread notifications from both sources
-        
-        OPTIMIZED: Uses caching when USE_NOTIFICATION_CACHE=True
-        Cache TTL: 30 seconds (good balance between freshness and performance)
-        """
-        user_id = request.user.id
-        cache_key = f'notification_count_{user_id}'
-        
-        # Try cache first if enabled
-        if settings.USE_NOTIFICATION_CACHE:
-            cached_count = cache.get(cache_key)
-            if cached_count is not None:
-                return Response({
-                    'unread_count': cached_count,
-                    'cached': True
-                })
-        
-        # Compute from database (existing logic preserved)
-        dashboard_count = DashboardNotification.objects.filter(
-            recipient=request.user,
-            is_read=False
-        ).count()
-        
-        profile_count = ProfileNotification.objects.filter(
-            recipient=request.user,
-            is_read=False
-        ).count()
-        
-        total_count = dashboard_count + profile_count
-        
-        # Cache for 30 seconds if caching enabled
-        if settings.USE_NOTIFICATION_CACHE:
-            cache.set(cache_key, total_count, 30)
-        
+        """Get count of unread notifications from the per-user counter"""
+        unread = UnreadCounter.get_counts(request.user.id)['notifications_unread']
+        if announcement_feed.fanout_on_read_enabled():
+            unread += announcement_feed.unseen_count(request.user)
         return Response({
-            'unread_count': total_count,
-            'cached': False
+            'unread_count': unread
         })
-    
+
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
-        """
-        Mark a single notification as read
-        
-        OPTIMIZED: Invalidates cache when notifications change
-        """
+        """Mark a single notification as read"""
+        announcement_id = announcement_feed.parse_feed_id(pk)
+        if announcement_id is not None:
+            if not announcement_feed.mark_feed_item_read(request.user, announcement_id):
+                return Response({'error': 'Notification not found'}, status=status.HTTP_404_NOT_FOUND)
+            return Response({
+                'status': 'success',
+                'message': 'Notification marked as read'
+            })
         notification = self.get_object()
-        notification.is_read = True
-        notification.save()
-        
-        # Invalidate cache for this user
-        if settings.USE_NOTIFICATION_CACHE:
-            cache_key = f'notification_count_{request.user.id}'
-            cache.delete(cache_key)
-        
+        notification.mark_as_read()
+
         return Response({
             'status': 'success',
             'message': 'Notification marked as read'
         })
-    
+
     @action(detail=False, methods=['post'])
     def mark_all_read(self, request):
-        """
-        Mark all user's notifications as read
-        
-        OPTIMIZED: Invalidates cache after bulk update
-        """
-        dashboard_updated = DashboardNotification.objects.filter(
-            recipient=request.user,
-            is_read=False
-        ).update(is_read=True)
-        
-        profile_updated = ProfileNotification.objects.filter(
-            recipient=request.user,
-            is_read=False
-        ).update(is_read=True)
-        
-        total_updated = dashboard_updated + profile_updated
-        
-        # Invalidate cache for this user
-        if settings.USE_NOTIFICATION_CACHE:
-            cache_key = f'notification_count_{request.user.id}'
-            cache.delete(cache_key)
-        
+        """Mark all user's notifications as read"""
+        total_updated = self.get_queryset().mark_read()
+        if announcement_feed.fanout_on_read_enabled():
+            announcement_feed.advance_watermark(request.user)
+
         return Response({
             'status': 'success',
             'message': f'{total_updated} notifications marked as read',
             'updated_count': total_updated
         })
-    
+
     @action(detail=False, methods=['delete'])
     def clear_all(self, request):
         """Delete all read notifications"""
-        dashboard_deleted, _ = DashboardNotification.objects.filter(
-            recipient=request.user,
-            is_read=True
-        ).delete()
-        
-        profile_deleted, _ = ProfileNotification.objects.filter(
-            recipient=request.user,
-            is_read=True
-        ).delete()
-        
-        total_deleted = dashboard_deleted + profile_deleted
-        
+        total_deleted, _ = self.get_queryset().filter(is_read=True).delete()
+
         return Response({
             'status': 'success',
             'message': f'{total_deleted} notifications deleted',
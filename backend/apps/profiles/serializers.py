@@ -16,9 +16,12 @@ class UserProfileSerializer(serializers.ModelSerializer):
     students_count = serializers.SerializerMethodField()
     
     def get_students_count(self, obj):
-        """Get count of students assigned to this mentor"""
+        """Get count of students assigned to this mentor (annotated by with_student_count() when listing)"""
         if obj.role == 'MENTOR':
-            return UserProfile.objects.filter(assigned_mentor=obj.user, role='STUDENT').count()
+            student_count = getattr(obj, 'student_count', None)
+            if student_count is None:
+                student_count = UserProfile.objects.filter(assigned_mentor=obj.user, role='STUDENT').count()
+            return student_count
         return 0
     
     class Meta:
@@ -1,56 +1,42 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, m2m_changed
 from django.dispatch import receiver
-from .models import FloorAnnouncement, UserProfile
-from apps.dashboard.models import Notification
+from apps.background import run_after_commit
+from .models import FloorAnnouncement
+from .announcement_fanout import fan_out_floor_announcement, push_floor_announcement
+from .announcement_feed import fanout_on_read_enabled
 
 
 @receiver(post_save, sender=FloorAnnouncement)
 def create_announcement_notifications(sender, instance, created, **kwargs):
     """
-    Create notifications for all students and mentors on the floor
-    when a new announcement is published
+    Schedule the notification fan-out for all students and mentors on the
+    floor when an announcement is published (on create or on a later status
+    change). This is the only place announcement notifications are created;
+    in fan-out-on-read mode only the realtime push is scheduled.
     """
-    if created and instance.status == 'published':
-        # Get all students on this floor
-        students = UserProfile.objects.filter(
-            campus=instance.campus,
-            floor=instance.floor,
-            role='STUDENT'
-        ).select_related('user')
-        
-        # Get all mentors on this floor
-        mentors = UserProfile.objects.filter(
-            campus=instance.campus,
-            floor=instance.floor,
-            role='MENTOR'
-        ).select_related('user')
-        
-        # Combine students and mentors
-        recipients = list(students) + list(mentors)
-        
-        # Create notifications in bulk
-        notifications = []
-        priority_emoji = {
-            'urgent': '🔴',
-            'important': '🟠',
-            'normal': '🔵'
-        }
-        
-        emoji = priority_emoji.get(instance.priority, '🔵')
-        
-        for profile in recipients:
-            notifications.append(
-                Notification(
-                    recipient=profile.user,
-                    notification_type='announcement',
-                    priority=instance.priority,
-                    title=f"{emoji} {instance.title}",
-                    message=instance.message[:200] + ('...' if len(instance.message) > 200 else ''),
-                    related_submission_id=instance.id
-                )
-            )
-        
-        # Bulk create for performance
-        if notifications:
-            Notification.objects.bulk_create(notifications)
-            print(f"✅ Created {len(notifications)} notifications for announcement: {instance.title}")
+    was_published = getattr(instance, '_loaded_status', None) == 'published'
+    if instance.status == 'published' and (created or not was_published):
+        if fanout_on_read_enabled():
+            run_after_commit(push_floor_announcement, instance.id)
+        else:
+            run_after_commit(fan_out_floor_announcement, instance.id)
+    instance._loaded_status = instance.status
+
+
+@receiver(m2m_changed, sender=FloorAnnouncement.read_by.through)
+def sync_floor_announcement_read_count(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep read_count right when read_by is edited directly (e.g. from the admin)"""
+    if action == 'pre_clear' and reverse:
+        instance._cleared_floor_announcement_ids = list(
+            instance.read_floor_announcements.values_list('id', flat=True)
+        )
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        announcement_ids = [instance.pk]
+    elif action == 'post_clear':
+        announcement_ids = getattr(instance, '_cleared_floor_announcement_ids', [])
+    else:
+        announcement_ids = pk_set
+    FloorAnnouncement.recount_reads(announcement_ids)
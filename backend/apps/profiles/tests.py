@@ -0,0 +1,109 @@
+from collections import Counter
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from . import mentor_assignment
+from .models import UserProfile
+
+
+class MentorAssignmentTest(TestCase):
+    """plan_assignment balances each (campus, floor) with its own mentors; apply_assignment writes the plan"""
+
+    def setUp(self):
+        caches['dashboard'].clear()
+
+    def make_user(self, username, role='STUDENT', floor=1, mentor=None):
+        user = User.objects.create_user(username=username, password='x')
+        UserProfile.objects.filter(user=user).update(role=role, campus='TECH', floor=floor, assigned_mentor=mentor)
+        return user
+
+    def make_students(self, prefix, count, floor=1, mentor=None):
+        return [self.make_user(f'{prefix}{index}', floor=floor, mentor=mentor) for index in range(count)]
+
+    def loads(self, *mentors):
+        counts = Counter(
+            UserProfile.objects.filter(role='STUDENT', assigned_mentor__in=mentors)
+            .values_list('assigned_mentor_id', flat=True)
+        )
+        return [counts[mentor.id] for mentor in mentors]
+
+    def test_fill_assigns_only_unassigned_students_to_least_loaded(self):
+        busy, idle = self.make_user('busy', 'MENTOR'), self.make_user('idle', 'MENTOR')
+        kept = self.make_students('kept', 3, mentor=busy)
+        self.make_students('new', 4)
+
+        plan = mentor_assignment.plan_assignment()
+        self.assertEqual(len(plan['moves']), 4)
+        self.assertTrue(all(move['from_mentor_id'] is None for move in plan['moves']))
+
+        self.assertEqual(mentor_assignment.apply_assignment(plan['moves']), 4)
+        self.assertEqual(self.loads(busy, idle), [4, 3])
+        self.assertEqual(
+            set(UserProfile.objects.filter(user__in=kept).values_list('assigned_mentor_id', flat=True)),
+            {busy.id}
+        )
+
+    def test_rebalance_evens_loads_moving_fewest_students(self):
+        mentors = [self.make_user(f'mentor{index}', 'MENTOR') for index in range(3)]
+        self.make_students('a', 6, mentor=mentors[0])
+        self.make_students('b', 1, mentor=mentors[1])
+
+        plan = mentor_assignment.plan_assignment(rebalance=True)
+        # 7 students over 3 mentors: mentor0 keeps 3, mentor1 gets 1 more, mentor2 gets 2
+        self.assertEqual(len(plan['moves']), 3)
+        self.assertEqual({move['from_mentor_id'] for move in plan['moves']}, {mentors[0].id})
+
+        mentor_assignment.apply_assignment(plan['moves'])
+        loads = self.loads(*mentors)
+        self.assertEqual(sum(loads), 7)
+        self.assertLessEqual(max(loads) - min(loads), 1)
+        self.assertEqual(mentor_assignment.plan_assignment(rebalance=True)['moves'], [])
+
+    def test_off_floor_and_unassignable_students(self):
+        first_floor = self.make_user('first', 'MENTOR', floor=1)
+        second_floor = self.make_user('second', 'MENTOR', floor=2)
+        [misplaced] = self.make_students('misplaced', 1, floor=1, mentor=second_floor)
+        [stranded] = self.make_students('stranded', 1, floor=3)
+        self.make_students('kept', 1, floor=3, mentor=first_floor)
+
+        # Fill leaves existing assignments alone, even off-floor ones
+        fill = mentor_assignment.plan_assignment()
+        self.assertEqual(fill['moves'], [])
+        self.assertEqual(fill['unassignable'], [stranded.id])
+
+        rebalance = mentor_assignment.plan_assignment(rebalance=True)
+        self.assertEqual(
+            [(move['student_id'], move['to_mentor_id']) for move in rebalance['moves']],
+            [(misplaced.id, first_floor.id)]
+        )
+        self.assertEqual(rebalance['unassignable'], [stranded.id])
+
+    def test_dry_run_writes_nothing(self):
+        mentor = self.make_user('mentor', 'MENTOR')
+        self.make_students('student', 3)
+        admin = User.objects.create_superuser(username='admin', password='x')
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        with self.assertNumQueries(2):
+            response = client.post('/api/admin/auto-assign-mentors/', {'dry_run': True}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['students_assigned'], 3)
+        self.assertEqual(len(response.json()['moves']), 3)
+        self.assertEqual(self.loads(mentor), [0])
+
+    def test_apply_skips_students_changed_after_planning(self):
+        planned, other = self.make_user('planned', 'MENTOR'), self.make_user('other', 'MENTOR', floor=2)
+        students = self.make_students('student', 2)
+        plan = mentor_assignment.plan_assignment()
+
+        UserProfile.objects.filter(user=students[0]).update(assigned_mentor=other)
+
+        self.assertEqual(mentor_assignment.apply_assignment(plan['moves']), 1)
+        self.assertEqual(
+            dict(UserProfile.objects.filter(user__in=students).values_list('user_id', 'assigned_mentor_id')),
+            {students[0].id: other.id, students[1].id: planned.id}
+        )
@@ -1,4 +1,5 @@
 import os
+import tempfile
 import dj_database_url
 from pathlib import Path
 from dotenv import load_dotenv
@@ -248,8 +249,8 @@ USE_ANALYTICS_SUMMARY = os.getenv('USE_ANALYTICS_SUMMARY', 'False') == 'True'
 
 # Notification Optimization
 USE_NOTIFICATION_CACHE = os.getenv('USE_NOTIFICATION_CACHE', 'False') == 'True'
-# When True: Caches notification counts for 30 seconds
-# When False: Always computes counts live (current behavior)
+# When True: Mirrors the per-user unread counter row (dashboard.UnreadCounter) into the cache
+# When False: Unread counts are read from the counter row by primary key
 
 # File Storage
 USE_CLOUD_STORAGE = os.getenv('USE_CLOUD_STORAGE', 'False') == 'True'
@@ -261,6 +262,43 @@ USE_ASYNC_TASKS = os.getenv('USE_ASYNC_TASKS', 'False') == 'True'
 # When True: Uses Celery/Redis for background tasks (production)
 # When False: Tasks run synchronously (current behavior, development)
 
+# Realtime Push (SSE / long-poll)
+REALTIME_BROKER = os.getenv('REALTIME_BROKER', 'memory')
+REALTIME_REDIS_URL = os.getenv('REDIS_URL', None)
+# 'memory': In-process pub/sub (development, single worker)
+# 'redis': Redis pub/sub on REDIS_URL so every worker sees every event (requires `pip install redis`)
+REALTIME_POLL_TIMEOUT = int(os.getenv('REALTIME_POLL_TIMEOUT', '25'))
+REALTIME_STREAM_MAX_SECONDS = int(os.getenv('REALTIME_STREAM_MAX_SECONDS', '300'))
+REALTIME_STREAM_TICKET_SECONDS = int(os.getenv('REALTIME_STREAM_TICKET_SECONDS', '30'))
+# Long-poll requests wait at most REALTIME_POLL_TIMEOUT seconds; SSE streams close after
+# REALTIME_STREAM_MAX_SECONDS and the browser reconnects with a new one-time stream ticket.
+REALTIME_SSE_ENABLED = os.getenv('REALTIME_SSE_ENABLED', 'False') == 'True'
+# When True: Browsers hold an SSE stream open per tab
+# When False: The stream is refused and browsers long-poll instead (default)
+REALTIME_MAX_WAITERS = int(os.getenv('REALTIME_MAX_WAITERS', '8'))
+# Open streams and waiting long-polls each hold a gunicorn thread. Each process lets at most
+# this many wait at once (keep it below GUNICORN_THREADS, see gunicorn.conf.py); beyond that
+# streams are refused and long-polls answer immediately with retry_after.
+
+# Announcement Delivery
+ANNOUNCEMENT_DELIVERY = os.getenv('ANNOUNCEMENT_DELIVERY', 'write')
+# 'write': Publishing copies one Notification row per floor member (current behavior)
+# 'read': Floor announcements are stored once per (campus, floor) and merged into each
+#         notification feed at read time; publishing cost no longer grows with floor size
+
+# Notification Retention
+NOTIFICATION_RETENTION_DAYS = int(os.getenv('NOTIFICATION_RETENTION_DAYS', '90'))
+# Read notifications older than this are moved to NotificationArchive by
+# `python manage.py archive_notifications` (run it from cron)
+
+# Hackathon Discovery Feed
+HACKATHON_FEED_TTL = int(os.getenv('HACKATHON_FEED_TTL', '1800'))
+HACKATHON_FEED_MAX_AGE = int(os.getenv('HACKATHON_FEED_MAX_AGE', '86400'))
+# /api/hackathons/list/ serves a stored snapshot (apps/hackathons/feed.py) that is refreshed
+# on a background thread once older than HACKATHON_FEED_TTL seconds, or by
+# `python manage.py refresh_hackathons` from cron. A failing source keeps its last good
+# items for up to HACKATHON_FEED_MAX_AGE seconds.
+
 # Database Query Logging (Debug only)
 LOG_QUERY_TIMES = DEBUG and os.getenv('LOG_QUERY_TIMES', 'False') == 'True'
 # When True: Logs slow queries to console (helpful for optimization)
@@ -277,9 +315,6 @@ if USE_NOTIFICATION_CACHE or USE_ANALYTICS_SUMMARY:
             'default': {
                 'BACKEND': 'django.core.cache.backends.redis.RedisCache',
                 'LOCATION': REDIS_URL,
-                'OPTIONS': {
-                    'CLIENT_CLASS': 'django_redis.client.DefaultClient',
-                },
                 'KEY_PREFIX': 'cohort',
                 'TIMEOUT': 300,  # 5 minutes default
             }
@@ -301,6 +336,32 @@ else:
         }
     }
 
+# Dashboard stats cache: always a real cache, invalidated by submission/review signals
+# (apps/dashboard/stats_cache.py). Shares Redis when configured; otherwise a file-based
+# cache, which every worker process on the host sees, so invalidations reach all of them.
+# The file-based cache gets its own directory (never shared with another cache) and an
+# entry limit sized for a few dozen entries per user: versions, stats, snapshots and
+# closed report months. Past the limit it culls a third of the files at random.
+DASHBOARD_STATS_CACHE_TIMEOUT = int(os.getenv('DASHBOARD_STATS_CACHE_TIMEOUT', '3600'))
+DASHBOARD_CACHE_MAX_ENTRIES = int(os.getenv('DASHBOARD_CACHE_MAX_ENTRIES', '20000'))
+# Past (closed) months of monthly reports (apps/dashboard/report_engine.py). Finite, because
+# every version bump orphans up to 24 of them per user
+MONTHLY_REPORT_CLOSED_TIMEOUT = int(os.getenv('MONTHLY_REPORT_CLOSED_TIMEOUT', str(7 * 24 * 3600)))
+# Per-student snapshots for admin/floor-wing/mentor views (apps/dashboard/student_snapshot.py)
+STUDENT_SNAPSHOT_CACHE_TIMEOUT = int(os.getenv('STUDENT_SNAPSHOT_CACHE_TIMEOUT', '300'))
+if CACHES['default']['BACKEND'] == 'django.core.cache.backends.redis.RedisCache':
+    CACHES['dashboard'] = dict(CACHES['default'], KEY_PREFIX='cohort-dashboard')
+else:
+    CACHES['dashboard'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv(
+            'DASHBOARD_CACHE_DIR',
+            os.path.join(tempfile.gettempdir(), 'cohort-dashboard-cache')
+        ),
+        'TIMEOUT': DASHBOARD_STATS_CACHE_TIMEOUT,
+        'OPTIONS': {'MAX_ENTRIES': DASHBOARD_CACHE_MAX_ENTRIES, 'CULL_FREQUENCY': 3},
+    }
+
 # ============================================================================
 # AWS/CLOUD STORAGE CONFIGURATION (OPTIONAL)
 # ============================================================================
@@ -0,0 +1,24 @@
+"""
+Gunicorn settings, loaded automatically when gunicorn starts in backend/.
+Flags on the command line (Procfile, railway.json, the Dockerfile) override them.
+
+Realtime streams and long-polls park a thread each, so workers are threaded and
+REALTIME_MAX_WAITERS (config/settings.py) should stay below GUNICORN_THREADS.
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', '1'))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '16'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+
+
+def on_starting(server):
+    """Warn when realtime events would stay inside the worker that published them"""
+    if server.cfg.workers > 1 and os.getenv('REALTIME_BROKER', 'memory') == 'memory':
+        server.log.warning(
+            "REALTIME_BROKER='memory' with %s workers: events only reach clients of the worker "
+            "that published them. Set REALTIME_BROKER=redis and REDIS_URL.",
+            server.cfg.workers,
+        )
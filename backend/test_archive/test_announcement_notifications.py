@@ -99,7 +99,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 django.setup()
 
 from apps.profiles.models import UserProfile
-from apps.profiles.notification_models import Notification
+from apps.dashboard.models import Notification
 
 students = UserProfile.objects.filter(
     campus='TECH',
@@ -14,11 +14,149 @@ const NotificationBell = () => {
     const dropdownRef = useRef(null);
 
     useEffect(() => {
-        fetchUnreadCount();
-        
-        // Poll for new notifications every 30 seconds
-        const interval = setInterval(fetchUnreadCount, 30000);
-        return () => clearInterval(interval);
+        let source = null;
+        let retryTimer = null;
+        let lastEventId = null;
+        let failures = 0;
+        let polling = false;
+        let stopped = false;
+        const controller = new AbortController();
+        const wait = (ms) => new Promise(resolve => {
+            retryTimer = setTimeout(resolve, ms);
+        });
+
+        const prependNotification = (notification) => {
+            setNotifications(prev => prev.length
+                ? [{ ...notification, is_read: false, time_ago: 'Just now' }, ...prev]
+                : prev
+            );
+        };
+
+        const token = localStorage.getItem('accessToken');
+        if (!token) {
+            return undefined;
+        }
+
+        // Long-poll: the server answers as soon as an event arrives, or straight away with
+        // retry_after when it is too busy to hold the request open.
+        const startPolling = async () => {
+            if (polling || stopped) {
+                return;
+            }
+            polling = true;
+            while (!stopped) {
+                try {
+                    const params = new URLSearchParams();
+                    if (lastEventId) {
+                        params.set('last_event_id', lastEventId);
+                    }
+                    const response = await fetch(`${API_BASE_URL}/dashboard/events/poll/?${params}`, {
+                        headers: {
+                            'Authorization': `Bearer ${token}`,
+                        },
+                        signal: controller.signal
+                    });
+                    if (!response.ok) {
+                        throw new Error(`Event poll failed (${response.status})`);
+                    }
+                    const data = await response.json();
+                    data.events
+                        .filter(event => event.type === 'notification')
+                        .forEach(event => prependNotification(event.data));
+                    if (data.counts) {
+                        setUnreadCount(data.counts.notifications_unread || 0);
+                    }
+                    lastEventId = String(data.last_event_id);
+                    if (data.retry_after) {
+                        await wait(data.retry_after * 1000);
+                    }
+                } catch (error) {
+                    if (stopped) {
+                        return;
+                    }
+                    console.error('Failed to poll notification events:', error);
+                    await wait(30000);
+                }
+            }
+        };
+
+        if (typeof EventSource === 'undefined') {
+            startPolling();
+            return () => {
+                stopped = true;
+                controller.abort();
+                clearTimeout(retryTimer);
+            };
+        }
+
+        // Server pushes counts and new notifications; fall back to long-polling if the stream is
+        // refused (disabled, or the server is at its stream limit).
+        // The stream takes a one-time ticket instead of the JWT, so every (re)connect asks for a new one.
+        const openStream = async () => {
+            try {
+                const response = await fetch(`${API_BASE_URL}/dashboard/events/ticket/`, {
+                    method: 'POST',
+                    headers: {
+                        'Authorization': `Bearer ${token}`,
+                    },
+                    signal: controller.signal
+                });
+                if (!response.ok) {
+                    throw new Error(`Stream ticket refused (${response.status})`);
+                }
+                const { ticket } = await response.json();
+                if (stopped) {
+                    return;
+                }
+
+                const params = new URLSearchParams({ ticket });
+                if (lastEventId) {
+                    params.set('last_event_id', lastEventId);
+                }
+                source = new EventSource(`${API_BASE_URL}/dashboard/events/stream/?${params}`);
+                source.onopen = () => {
+                    failures = 0;
+                };
+                source.addEventListener('counts', (event) => {
+                    const counts = JSON.parse(event.data);
+                    setUnreadCount(counts.notifications_unread || 0);
+                });
+                source.addEventListener('notification', (event) => {
+                    lastEventId = event.lastEventId || lastEventId;
+                    setUnreadCount(prev => prev + 1);
+                    prependNotification(JSON.parse(event.data));
+                });
+                source.onerror = () => {
+                    // The browser's own retry would reuse the spent ticket
+                    source.close();
+                    failures += 1;
+                    if (stopped) {
+                        return;
+                    }
+                    if (failures > 3) {
+                        startPolling();
+                    } else {
+                        retryTimer = setTimeout(openStream, 3000 * failures);
+                    }
+                };
+            } catch (error) {
+                if (stopped) {
+                    return;
+                }
+                console.warn('Notification stream unavailable, long-polling instead:', error.message);
+                startPolling();
+            }
+        };
+        openStream();
+
+        return () => {
+            stopped = true;
+            controller.abort();
+            if (source) {
+                source.close();
+            }
+            clearTimeout(retryTimer);
+        };
     }, []);
 
     useEffect(() => {
@@ -33,21 +171,6 @@ const NotificationBell = () => {
         return () => document.removeEventListener('mousedown', handleClickOutside);
     }, []);
 
-    const fetchUnreadCount = async () => {
-        try {
-            const token = localStorage.getItem('accessToken');
-            const response = await fetch(`${API_BASE_URL}/profiles/notifications/unread_count/`, {
-                headers: {
-                    'Authorization': `Bearer ${token}`,
-                }
-            });
-            const data = await response.json();
-            setUnreadCount(data.unread_count || 0);
-        } catch (error) {
-            console.error('Failed to fetch unread count:', error);
-        }
-    };
-
     const fetchNotifications = async () => {
         setLoading(true);
         try {